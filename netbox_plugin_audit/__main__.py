@@ -2,4 +2,5 @@
 
 from netbox_plugin_audit.cli import main
 
-main()
+if __name__ == "__main__":
+    main()
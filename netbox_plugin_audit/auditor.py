@@ -1,94 +1,124 @@
 """Main auditor - clones repo, discovers plugin, runs all checks."""
 
+import contextlib
+import hashlib
+import json
 import os
+import re
 import shutil
 import subprocess
+import tarfile
 import tempfile
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 
-from .checks import CategoryResult
-from .checks.certification import check_certification
+from . import __version__
+from .checks import CACHE_DIR, NO_CACHE, CategoryResult, CheckResult, PluginContext, Severity, find_changelog
+from .checks.certification import LICENSE_FILES, check_certification
 from .checks.changelog import check_changelog
 from .checks.django_app import check_django_app
-from .checks.github import check_github
+from .checks.github import GITHUB_CACHE_TTL, check_github
 from .checks.linting import check_linting
-from .checks.packaging import check_packaging
+from .checks.packaging import PYPI_CACHE_TTL, check_packaging
 from .checks.pluginconfig import check_pluginconfig
 from .checks.pyproject import check_pyproject
 from .checks.readme import check_readme
 from .checks.security import check_security
 from .checks.structure import check_structure
-from .checks.versioning import check_versioning
+from .checks.versioning import check_versioning, get_init_version
 from .checks.workflows import check_workflows
 
+# Plugins that read their version through importlib.metadata report the pyproject.toml version
+METADATA_RE = re.compile(rb"importlib\.metadata|importlib\s+import\s+metadata")
 
-def _detect_plugin_package(plugin_path: str) -> str | None:
-    """Auto-detect the netbox_* package directory."""
-    for entry in sorted(os.listdir(plugin_path)):
-        full = os.path.join(plugin_path, entry)
-        if os.path.isdir(full) and entry.startswith("netbox_") and os.path.isfile(os.path.join(full, "__init__.py")):
-            return entry
-    return None
+# Seconds to wait for `git clone` before giving up
+CLONE_TIMEOUT = int(os.environ.get("NBAUDIT_CLONE_TIMEOUT", "60"))
 
+# GitHub HTTPS URLs can be fetched as a tarball snapshot instead of cloned
+GITHUB_HTTPS_RE = re.compile(r"^https?://github\.com/([^/]+)/([^/]+?)(?:\.git)?/?$")
 
-def _get_plugin_version(plugin_path: str, pkg_dir: str) -> str | None:
-    """Extract version from __init__.py, version.py, or pyproject.toml."""
-    import ast
+# Cloned repos live in CACHE_DIR keyed by URL + remote HEAD commit; API caches use named subdirectories
+CACHE_TTL = int(os.environ.get("NBAUDIT_CACHE_TTL", "3600"))
+API_CACHE_DIRS = ("github", "pypi", "results")
+# Seconds since last use after which an API cache entry is pruned. A GitHub entry stays useful past its
+# freshness window (its ETag still saves a full response), and a 304 refreshes its mtime.
+API_CACHE_TTLS = {
+    "github": max(CACHE_TTL, GITHUB_CACHE_TTL),
+    "pypi": max(CACHE_TTL, PYPI_CACHE_TTL),
+    "results": CACHE_TTL,
+}
 
-    init_path = os.path.join(plugin_path, pkg_dir, "__init__.py")
-    if not os.path.isfile(init_path):
-        return None
-    try:
-        with open(init_path) as f:
-            source = f.read()
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "__version__":
-                        if isinstance(node.value, ast.Constant):
-                            return str(node.value.value)
-
-        # Check for `from .version import __version__` pattern
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom) and node.module == "version":
-                for alias in node.names:
-                    if alias.name == "__version__":
-                        ver = _get_version_from_file(plugin_path, pkg_dir, "version.py")
-                        if ver:
-                            return ver
-
-        # Fallback: if importlib.metadata is used, get version from pyproject.toml
-        if "importlib.metadata" in source or "importlib import metadata" in source:
-            return _get_pyproject_version(plugin_path)
-    except Exception:
-        pass
+# Results of the checks that only read the plugin tree, cached per tree fingerprint for CACHE_TTL seconds
+# (changelog, GitHub and packaging query the network, and linting depends on the installed tool versions,
+# so they always run)
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "results")
+CACHEABLE_CHECKS = {
+    check_structure,
+    check_pluginconfig,
+    check_pyproject,
+    check_versioning,
+    check_readme,
+    check_django_app,
+    check_workflows,
+    check_security,
+    check_certification,
+}
+# Top-level directories left out of the fingerprint: VCS metadata, caches, build output the checks themselves
+# create, and local virtualenvs/tool environments (thousands of files no check reads). Deeper down only
+# __pycache__ is skipped, since a subpackage may well be called build or dist.
+FINGERPRINT_SKIP_DIRS = {
+    ".git",
+    "__pycache__",
+    ".ruff_cache",
+    ".mypy_cache",
+    ".pytest_cache",
+    "build",
+    "dist",
+    ".venv",
+    "venv",
+    "node_modules",
+    ".tox",
+    ".eggs",
+}
+
+
+def _detect_plugin_package(plugin_path: str) -> str | None:
+    """Auto-detect the netbox_* package directory."""
+    with os.scandir(plugin_path) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if (
+            entry.name.startswith("netbox_")
+            and entry.is_dir(follow_symlinks=False)
+            and os.path.isfile(os.path.join(entry.path, "__init__.py"))
+        ):
+            return entry.name
     return None
 
 
-def _get_version_from_file(plugin_path: str, pkg_dir: str, filename: str) -> str | None:
-    """Extract __version__ from a specific file (e.g. version.py)."""
-    import ast
+def _get_plugin_version(plugin_path: str, pkg_dir: str, pyproject: dict | None = None) -> str | None:
+    """Extract version from __init__.py, version.py, or pyproject.toml."""
+    ver = get_init_version(plugin_path, pkg_dir)
+    if isinstance(ver, tuple):
+        # ("dynamic", "importlib.metadata"): the version is read from pyproject.toml at runtime
+        return _get_pyproject_version(plugin_path, pyproject)
+    if ver is not None:
+        return ver
 
-    ver_path = os.path.join(plugin_path, pkg_dir, filename)
-    if not os.path.isfile(ver_path):
-        return None
+    # importlib.metadata can also be used without the `metadata.version(` call the versioning check looks for
     try:
-        with open(ver_path) as f:
+        with open(os.path.join(plugin_path, pkg_dir, "__init__.py"), "rb") as f:
             source = f.read()
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "__version__":
-                        if isinstance(node.value, ast.Constant):
-                            return str(node.value.value)
-        return None
-    except Exception:
+    except OSError:
         return None
+    if METADATA_RE.search(source):
+        return _get_pyproject_version(plugin_path, pyproject)
+    return None
 
 
-def _get_pyproject_version(plugin_path: str) -> str | None:
-    """Extract version from pyproject.toml."""
+def _load_pyproject(plugin_path: str) -> dict | None:
+    """Parse pyproject.toml once so the checks can share it."""
     try:
         import tomllib
     except ImportError:
@@ -96,28 +126,293 @@ def _get_pyproject_version(plugin_path: str) -> str | None:
             import tomli as tomllib  # type: ignore[no-redef]
         except ImportError:
             return None
-    toml_path = os.path.join(plugin_path, "pyproject.toml")
-    if not os.path.isfile(toml_path):
-        return None
+    # A missing file surfaces as OSError from open(), so no separate existence check is needed
     try:
-        with open(toml_path, "rb") as f:
-            data = tomllib.load(f)
-        return data.get("project", {}).get("version")
+        with open(os.path.join(plugin_path, "pyproject.toml"), "rb") as f:
+            return tomllib.load(f)
     except Exception:
         return None
 
 
-def _clone_repo(url: str, dest: str) -> bool:
-    """Clone a git repository."""
-    result = subprocess.run(
-        ["git", "clone", "--depth", "1", url, dest],
-        capture_output=True,
-        text=True,
-        timeout=60,
-    )
+def _read_text(path: str) -> str | None:
+    """Read a text file, returning None if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            return f.read()
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _read_changelog(plugin_path: str) -> tuple[str | None, bytes | None]:
+    """Find the changelog and read it as raw bytes (the changelog checks scan it with byte patterns)."""
+    path = find_changelog(plugin_path)
+    if not path:
+        return None, None
+    try:
+        with open(path, "rb") as f:
+            return path, f.read()
+    except OSError:
+        return path, None
+
+
+def _read_license(plugin_path: str) -> tuple[str | None, str | None]:
+    """Find the first LICENSE_FILES variant and read it."""
+    for name in LICENSE_FILES:
+        license_path = os.path.join(plugin_path, name)
+        if os.path.isfile(license_path):
+            return license_path, _read_text(license_path)
+    return None, None
+
+
+def _load_context(plugin_path: str, pkg_dir: str | None) -> PluginContext:
+    """Read README, CHANGELOG, LICENSE and pyproject.toml once for all checks."""
+    # The four reads are independent; overlap them (this matters on network filesystems and cold caches)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        pyproject = executor.submit(_load_pyproject, plugin_path)
+        readme = executor.submit(_read_text, os.path.join(plugin_path, "README.md"))
+        changelog = executor.submit(_read_changelog, plugin_path)
+        license_file = executor.submit(_read_license, plugin_path)
+
+    ctx = PluginContext(plugin_path=plugin_path, pkg_dir=pkg_dir, pyproject=pyproject.result())
+    ctx.readme = readme.result()
+    ctx.changelog_path, ctx.changelog = changelog.result()
+    ctx.license_path, ctx.license_text = license_file.result()
+    return ctx
+
+
+def _get_pyproject_version(plugin_path: str, pyproject: dict | None = None) -> str | None:
+    """Extract version from pyproject.toml."""
+    if pyproject is None:
+        pyproject = _load_pyproject(plugin_path)
+    if pyproject is None:
+        return None
+    return pyproject.get("project", {}).get("version")
+
+
+def _clone_repo(url: str, dest: str, timeout: int = CLONE_TIMEOUT) -> bool:
+    """Clone a git repository (shallow, blobless, default branch only)."""
+    try:
+        result = subprocess.run(
+            [
+                "git",
+                "-c",
+                "protocol.version=2",
+                "clone",
+                "--filter=blob:none",
+                "--depth",
+                "1",
+                "--single-branch",
+                "--no-tags",
+                url,
+                dest,
+            ],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            check=False,
+            # Never block on a credential prompt for private/missing repos
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return False
     return result.returncode == 0
 
 
+def _extract_tarball(tar: tarfile.TarFile, dest: str) -> None:
+    """Extract a GitHub tarball into dest, dropping its `<repo>-<ref>/` top-level directory."""
+    for member in tar:
+        _top, _sep, name = member.name.partition("/")
+        if not name:
+            continue
+        member.name = name
+        if member.islnk():
+            member.linkname = member.linkname.partition("/")[2]
+        if hasattr(tarfile, "data_filter"):
+            tar.extract(member, dest, filter="data")
+        elif (member.isfile() or member.isdir()) and not name.startswith("/") and ".." not in name.split("/"):
+            tar.extract(member, dest)
+
+
+def _download_tarball(url: str, dest: str, ref: str | None = None) -> bool:
+    """Fetch a GitHub repository's tree from codeload.github.com instead of cloning.
+
+    Fetches `ref` if given, otherwise HEAD, which codeload resolves to the default branch whatever
+    its name. Only https GitHub URLs are supported. An `origin` remote is recorded so the git-based
+    checks still see the repo.
+    """
+    m = GITHUB_HTTPS_RE.match(url)
+    if not m:
+        return False
+    owner, repo = m.groups()
+    tar_url = f"https://codeload.github.com/{owner}/{repo}/tar.gz/{ref or 'HEAD'}"
+    try:
+        with urllib.request.urlopen(tar_url, timeout=CLONE_TIMEOUT) as resp:
+            with tarfile.open(fileobj=resp, mode="r|gz") as tar:
+                _extract_tarball(tar, dest)
+    except (OSError, tarfile.TarError):
+        return False
+
+    try:
+        subprocess.run(["git", "init", "-q", dest], capture_output=True, timeout=10, check=True)
+        subprocess.run(["git", "-C", dest, "remote", "add", "origin", url], capture_output=True, timeout=10, check=True)
+    except (OSError, subprocess.SubprocessError):
+        pass
+    return True
+
+
+def _fetch_repo(url: str, dest: str, ref: str | None = None) -> bool:
+    """Populate dest with the plugin source: GitHub tarball when possible, else git clone."""
+    if _download_tarball(url, dest, ref):
+        return True
+    # A failed download can leave a partial tree behind, and git clone needs an empty directory
+    shutil.rmtree(dest, ignore_errors=True)
+    os.makedirs(dest, exist_ok=True)
+    return _clone_repo(url, dest)
+
+
+def _remote_head(url: str) -> str | None:
+    """Return the commit SHA of the remote HEAD, or None if it can't be resolved."""
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", "--exit-code", url, "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=CLONE_TIMEOUT,
+            check=False,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+    except (FileNotFoundError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0 or not result.stdout.strip():
+        return None
+    return result.stdout.split()[0]
+
+
+def _prune_cache(now: float) -> None:
+    """Remove cached clones older than CACHE_TTL, and GitHub/PyPI/results entries unused for their API_CACHE_TTLS."""
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            expired = [
+                e.path
+                for e in it
+                if e.is_dir() and e.name not in API_CACHE_DIRS and now - e.stat().st_mtime > CACHE_TTL
+            ]
+    except OSError:
+        return
+    for path in expired:
+        shutil.rmtree(path, ignore_errors=True)
+    for name, ttl in API_CACHE_TTLS.items():
+        try:
+            with os.scandir(os.path.join(CACHE_DIR, name)) as it:
+                stale = [e.path for e in it if now - e.stat().st_mtime > ttl]
+        except OSError:
+            continue
+        for path in stale:
+            with contextlib.suppress(OSError):
+                os.remove(path)
+
+
+def _remote_fingerprint(url: str, sha: str) -> str:
+    """Key a remote plugin's results by repo URL and commit, which pin its tree whatever directory it lands in."""
+    return hashlib.blake2b(f"{__version__}\0{url}@{sha}".encode(), digest_size=20).hexdigest()
+
+
+def _plugin_fingerprint(plugin_path: str) -> str:
+    """Digest a local plugin tree's directory names and file paths, sizes and mtimes, plus the auditor version."""
+    seed = f"{__version__}\0{os.path.abspath(plugin_path)}"
+    digest = hashlib.blake2b(seed.encode(), digest_size=20)
+    stack = [plugin_path]
+    while stack:
+        dir_path = stack.pop()
+        top_level = dir_path == plugin_path
+        try:
+            with os.scandir(dir_path) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == "__pycache__" or (
+                    top_level and (entry.name in FINGERPRINT_SKIP_DIRS or entry.name.endswith(".egg-info"))
+                ):
+                    continue
+                # Empty directories count too (structure and django_app report on docs/, templates/, ...)
+                digest.update(f"{entry.path}/\n".encode())
+                stack.append(entry.path)
+                continue
+            st = entry.stat(follow_symlinks=False)
+            digest.update(f"{entry.path}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+def _read_cached_results(fingerprint: str) -> dict[str, CategoryResult]:
+    """Load cached check results for a fingerprint, keyed by check function name."""
+    cache_path = os.path.join(RESULT_CACHE_DIR, fingerprint + ".json")
+    try:
+        if time.time() - os.path.getmtime(cache_path) > CACHE_TTL:
+            return {}
+        with open(cache_path, "rb") as f:
+            data = json.load(f)
+        return {
+            name: CategoryResult(
+                name=cat["name"],
+                icon=cat["icon"],
+                results=[CheckResult(r[0], Severity(r[1]), r[2], r[3]) for r in cat["results"]],
+            )
+            for name, cat in data.items()
+        }
+    except (OSError, ValueError, KeyError, IndexError, TypeError):
+        return {}
+
+
+def _write_cached_results(fingerprint: str, results: dict[str, CategoryResult]) -> None:
+    """Store check results for a fingerprint (_prune_cache drops them after CACHE_TTL)."""
+    data = {
+        name: {
+            "name": cat.name,
+            "icon": cat.icon,
+            "results": [[r.name, int(r.severity), r.message, r.category] for r in cat.results],
+        }
+        for name, cat in results.items()
+    }
+    try:
+        os.makedirs(RESULT_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=RESULT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, os.path.join(RESULT_CACHE_DIR, fingerprint + ".json"))
+    except OSError:
+        pass
+
+
+def _cached_clone(url: str, sha: str) -> str | None:
+    """Return a cached clone of `url` at commit `sha` (its remote HEAD), cloning into the cache on a miss.
+
+    Returns None if the cache can't be used (fetch failed, cache dir not writable),
+    in which case the caller falls back to a throwaway clone.
+    """
+    cache_path = os.path.join(CACHE_DIR, hashlib.sha1(f"{url}@{sha}".encode()).hexdigest())
+    if os.path.isdir(cache_path):
+        return cache_path
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmpdir = tempfile.mkdtemp(prefix="nbaudit_", dir=CACHE_DIR)
+    except OSError:
+        return None
+    if not _fetch_repo(url, tmpdir, sha):
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        return None
+    try:
+        # Atomic publish; if a concurrent audit won the race, use its copy
+        os.rename(tmpdir, cache_path)
+    except OSError:
+        shutil.rmtree(tmpdir, ignore_errors=True)
+        if not os.path.isdir(cache_path):
+            return None
+    return cache_path
+
+
 def audit_plugin(source: str, skip_lint: bool = False, skip_build: bool = False) -> dict:
     """
     Audit a NetBox plugin.
@@ -132,49 +427,81 @@ def audit_plugin(source: str, skip_lint: bool = False, skip_build: bool = False)
     """
     cleanup = False
     plugin_path = source
+    if not NO_CACHE:
+        _prune_cache(time.time())
 
     # Clone if URL
-    if source.startswith("http://") or source.startswith("https://") or source.startswith("git@"):
-        tmpdir = tempfile.mkdtemp(prefix="nbaudit_")
-        cleanup = True
-        if not _clone_repo(source, tmpdir):
-            return {
-                "plugin_name": source,
-                "version": None,
-                "categories": [],
-                "summary": {"total": 0, "passed": 0, "errors": 1, "warnings": 0, "infos": 0},
-                "error": f"Failed to clone {source}",
-            }
-        plugin_path = tmpdir
+    remote = source.startswith("http://") or source.startswith("https://") or source.startswith("git@")
+    sha = _remote_head(source) if remote and not NO_CACHE else None
+    if remote:
+        cached = _cached_clone(source, sha) if sha else None
+        if cached:
+            plugin_path = cached
+        else:
+            tmpdir = tempfile.mkdtemp(prefix="nbaudit_")
+            if not _fetch_repo(source, tmpdir, sha):
+                shutil.rmtree(tmpdir, ignore_errors=True)
+                return {
+                    "plugin_name": source,
+                    "version": None,
+                    "categories": [],
+                    "summary": {"total": 0, "passed": 0, "errors": 1, "warnings": 0, "infos": 0},
+                    "error": f"Failed to clone {source}",
+                }
+            cleanup = True
+            plugin_path = tmpdir
 
     try:
         # Detect plugin package
         pkg_dir = _detect_plugin_package(plugin_path)
+        ctx = _load_context(plugin_path, pkg_dir)
 
         # Get plugin info
         plugin_name = pkg_dir or os.path.basename(plugin_path.rstrip("/"))
-        version = _get_plugin_version(plugin_path, pkg_dir) if pkg_dir else None
-
-        # Run all checks
-        categories: list[CategoryResult] = []
-
-        categories.append(check_structure(plugin_path, pkg_dir))
-        categories.append(check_pluginconfig(plugin_path, pkg_dir))
-        categories.append(check_pyproject(plugin_path, pkg_dir))
-        categories.append(check_versioning(plugin_path, pkg_dir))
-        categories.append(check_changelog(plugin_path))
-        categories.append(check_readme(plugin_path))
-        categories.append(check_django_app(plugin_path, pkg_dir))
-        categories.append(check_workflows(plugin_path, pkg_dir))
-        categories.append(check_security(plugin_path, pkg_dir))
-        categories.append(check_certification(plugin_path, pkg_dir))
-        categories.append(check_github(plugin_path, pkg_dir))
+        version = _get_plugin_version(plugin_path, pkg_dir, ctx.pyproject) if pkg_dir else None
+
+        # Run all checks - they share no state, so run them concurrently
+        tasks = [
+            (check_structure, (plugin_path, pkg_dir)),
+            (check_pluginconfig, (plugin_path, pkg_dir)),
+            (check_pyproject, (plugin_path, pkg_dir, ctx)),
+            (check_versioning, (plugin_path, pkg_dir, ctx)),
+            (check_changelog, (plugin_path, ctx)),
+            (check_readme, (plugin_path, ctx)),
+            (check_django_app, (plugin_path, pkg_dir)),
+            (check_workflows, (plugin_path, pkg_dir)),
+            (check_security, (plugin_path, pkg_dir)),
+            (check_certification, (plugin_path, pkg_dir, ctx)),
+            (check_github, (plugin_path, pkg_dir)),
+        ]
 
         if not skip_lint:
-            categories.append(check_linting(plugin_path, pkg_dir))
+            tasks.append((check_linting, (plugin_path, pkg_dir)))
 
         if not skip_build:
-            categories.append(check_packaging(plugin_path))
+            tasks.append((check_packaging, (plugin_path, ctx)))
+
+        # Reuse results for an unchanged tree; only the checks that miss are run. Remote trees are keyed by
+        # URL and commit, since a throwaway clone's path and mtimes differ on every audit.
+        if NO_CACHE:
+            fingerprint = None
+        elif remote:
+            fingerprint = _remote_fingerprint(source, sha) if sha else None
+        else:
+            fingerprint = _plugin_fingerprint(plugin_path)
+        cached = _read_cached_results(fingerprint) if fingerprint else {}
+        pending = [(fn, args) for fn, args in tasks if fn.__name__ not in cached]
+
+        with ThreadPoolExecutor(max_workers=max(1, min(16, len(pending)))) as executor:
+            futures = {fn.__name__: executor.submit(fn, *args) for fn, args in pending}
+            fresh = {name: future.result() for name, future in futures.items()}
+        # Collect in task order so the report layout stays deterministic
+        categories: list[CategoryResult] = [cached.get(fn.__name__) or fresh[fn.__name__] for fn, _args in tasks]
+        if fingerprint and any(fn in CACHEABLE_CHECKS for fn, _args in pending):
+            cacheable = {fn.__name__ for fn in CACHEABLE_CHECKS}
+            _write_cached_results(
+                fingerprint, {name: cat for name, cat in {**cached, **fresh}.items() if name in cacheable}
+            )
 
         # Build summary
         total = sum(c.total for c in categories)
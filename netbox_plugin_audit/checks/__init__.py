@@ -1,17 +1,72 @@
-"""Check result types and severity levels."""
+"""Check result types and severity levels, and helpers shared by the checks."""
 
+import ast
+import base64
+import http.client
+import os
+import re
+import urllib.parse
+import urllib.request
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
 
+# On-disk cache shared by cloned repos and GitHub/PyPI API responses
+CACHE_DIR = os.environ.get("NBAUDIT_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "nbaudit"))
+NO_CACHE = os.environ.get("NBAUDIT_NO_CACHE", "") not in ("", "0")
+# Never contact GitHub or PyPI (cached responses are still used), for air-gapped CI
+OFFLINE = os.environ.get("NBAUDIT_OFFLINE", "") not in ("", "0")
 
-class Severity(Enum):
-    PASS = "pass"
-    INFO = "info"
-    WARNING = "warning"
-    ERROR = "error"
+# Redirects followed for API GETs (GitHub answers renamed or transferred repos with a 301)
+REDIRECT_STATUSES = (301, 302, 307, 308)
+
+# Top-level class whose bases mention "Widget"; lets widget scans skip ast.parse for plain modules
+WIDGET_CLASS_RE = re.compile(r"^class\s+\w+\s*\([^:]*?Widget", re.MULTILINE)
+
+# Common changelog file variants
+CHANGELOG_VARIANTS = [
+    "CHANGELOG.md",
+    "CHANGELOG.rst",
+    "CHANGELOG.txt",
+    "CHANGELOG",
+    "CHANGES.md",
+    "CHANGES.rst",
+    "CHANGES.txt",
+    "HISTORY.md",
+    "HISTORY.rst",
+]
+
+
+class Severity(IntEnum):
+    PASS = 0
+    INFO = 1
+    WARNING = 2
+    ERROR = 3
+
+    @property
+    def label(self) -> str:
+        """Lowercase name used in JSON output ("pass", "info", "warning", "error")."""
+        return self.name.lower()
 
 
 @dataclass
+class PluginContext:
+    """File contents loaded once per audit and shared by the checks.
+
+    A ``None`` content field means the file is missing or unreadable; checks
+    then fall back to their own lookup.
+    """
+
+    plugin_path: str
+    pkg_dir: str | None = None
+    readme: str | None = None
+    changelog_path: str | None = None
+    changelog: bytes | None = None
+    license_path: str | None = None
+    license_text: str | None = None
+    pyproject: dict | None = None
+
+
+@dataclass(slots=True)
 class CheckResult:
     name: str
     severity: Severity
@@ -24,10 +79,20 @@ class CategoryResult:
     name: str
     icon: str
     results: list[CheckResult] = field(default_factory=list)
+    _counts: dict[Severity, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for r in self.results:
+            self._counts[r.severity] = self._counts.get(r.severity, 0) + 1
+
+    def add(self, result: CheckResult) -> None:
+        """Append a result and update the per-severity counters."""
+        self.results.append(result)
+        self._counts[result.severity] = self._counts.get(result.severity, 0) + 1
 
     @property
     def passed(self) -> int:
-        return sum(1 for r in self.results if r.severity == Severity.PASS)
+        return self._counts.get(Severity.PASS, 0)
 
     @property
     def total(self) -> int:
@@ -35,12 +100,63 @@ class CategoryResult:
 
     @property
     def errors(self) -> int:
-        return sum(1 for r in self.results if r.severity == Severity.ERROR)
+        return self._counts.get(Severity.ERROR, 0)
 
     @property
     def warnings(self) -> int:
-        return sum(1 for r in self.results if r.severity == Severity.WARNING)
+        return self._counts.get(Severity.WARNING, 0)
 
     @property
     def infos(self) -> int:
-        return sum(1 for r in self.results if r.severity == Severity.INFO)
+        return self._counts.get(Severity.INFO, 0)
+
+
+def module_level_statements(body):
+    """Yield module-level statements, descending into if/try/with/for blocks but not into defs or classes."""
+    for node in body:
+        yield node
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            continue
+        for attr in ("body", "orelse", "finalbody"):
+            yield from module_level_statements(getattr(node, attr, ()))
+        for handler in getattr(node, "handlers", ()):
+            yield from module_level_statements(handler.body)
+
+
+def list_entries(path: str) -> tuple[set[str], set[str]]:
+    """Return the names of (files, directories) in a directory from one scandir pass."""
+    files, dirs = set(), set()
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                if entry.is_file():
+                    files.add(entry.name)
+                elif entry.is_dir():
+                    dirs.add(entry.name)
+    except OSError:
+        pass
+    return files, dirs
+
+
+def find_changelog(plugin_path: str) -> str | None:
+    """Find changelog file, trying common variants."""
+    # One directory scan instead of an isfile() per variant (a plugin without a changelog costs nine)
+    files, _dirs = list_entries(plugin_path)
+    found = next((variant for variant in CHANGELOG_VARIANTS if variant in files), None)
+    return os.path.join(plugin_path, found) if found else None
+
+
+def https_connection(host: str, timeout: float) -> http.client.HTTPSConnection:
+    """Open a keep-alive HTTPS connection to host, tunnelled through the HTTPS_PROXY that urllib would use."""
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return http.client.HTTPSConnection(host, timeout=timeout)
+    parts = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    headers = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    # TCP to the proxy, CONNECT to host, then TLS with host as the server name
+    conn = http.client.HTTPSConnection(parts.hostname, parts.port or 80, timeout=timeout)
+    conn.set_tunnel(host, 443, headers)
+    return conn
@@ -6,7 +6,12 @@ Based on: https://github.com/netbox-community/netbox/wiki/Plugin-Certification-P
 import os
 import re
 
-from . import CategoryResult, CheckResult, Severity
+try:
+    import ahocorasick_rs
+except ImportError:
+    ahocorasick_rs = None
+
+from . import CategoryResult, CheckResult, PluginContext, Severity, find_changelog
 
 # OSI-approved licenses compatible with Apache 2.0
 COMPATIBLE_LICENSES = [
@@ -20,57 +25,121 @@ COMPATIBLE_LICENSES = [
     "epl",
     "isc",
 ]
+# One case-insensitive pass over the license text for all keywords
+LICENSE_RE = re.compile("|".join(map(re.escape, COMPATIBLE_LICENSES)), re.IGNORECASE)
+
+# License file names accepted for certification
+LICENSE_FILES = ["LICENSE", "LICENSE.md", "LICENSE.txt"]
+
+# README / CHANGELOG patterns, compiled once at import and searched independently. Headings use MULTILINE `^`
+# rather than a `(?:^|\n)` alternation, as in readme.py.
+COMPAT_RE = re.compile(r"compat|version.*matrix|version.*range|netbox.*version|supported.*version", re.IGNORECASE)
+DEPS_RE = re.compile(r"^#{1,3}\s*depend|requirements|prerequisites", re.IGNORECASE | re.MULTILINE)
+IMG_RE = re.compile(
+    r"!\[.*\]\(.*\.(?:png|jpg|jpeg|gif|svg|webp)"
+    r"|<img.*src="
+    r"|!\[.*\]\(.*recording"
+    r"|!\[.*\]\(.*demo"
+    r"|!\[.*\]\(.*screenshot",
+    re.IGNORECASE,
+)
+INSTALL_RE = re.compile(r"^#{1,3}\s*install|pip install", re.IGNORECASE | re.MULTILINE)
+SUPPORT_RE = re.compile(r"support|contact|issues|bug.*report|contribute|community", re.IGNORECASE)
+BREAKING_KEYWORDS = (b"breaking", b"backward", b"incompatible", b"migration")
+
+README_PATTERNS = {
+    "compat": COMPAT_RE,
+    "deps": DEPS_RE,
+    "img": IMG_RE,
+    "install": INSTALL_RE,
+    "support": SUPPORT_RE,
+}
+# Plain substrings (lowercase) that settle a README pattern without running the regex engine
+README_LITERALS = {
+    "compat": ("compat",),
+    "deps": ("requirements", "prerequisites"),
+    "install": ("pip install",),
+    "support": ("support", "contact", "issues", "contribute", "community"),
+}
+# With ahocorasick-rs installed, all README literals are found in one automaton pass
+README_LITERAL_KEYS = [key for key, literals in README_LITERALS.items() for _lit in literals]
+README_AC = (
+    ahocorasick_rs.AhoCorasick([lit for literals in README_LITERALS.values() for lit in literals])
+    if ahocorasick_rs is not None
+    else None
+)
+
+
+def _scan_readme(readme: str) -> dict[str, bool]:
+    """Return which README_PATTERNS occur in the README, settling what the literals can before any regex runs."""
+    readme_lower = readme.lower()
+    found = dict.fromkeys(README_PATTERNS, False)
+    if README_AC is not None:
+        for idx, _start, _end in README_AC.find_matches_as_indexes(readme_lower, overlapping=True):
+            found[README_LITERAL_KEYS[idx]] = True
+    else:
+        for key, literals in README_LITERALS.items():
+            found[key] = any(lit in readme_lower for lit in literals)
+    # Whatever the literals left open gets its own precompiled search
+    for key, hit in found.items():
+        if not hit:
+            found[key] = bool(README_PATTERNS[key].search(readme))
+    return found
+
 
+def check_certification(plugin_path: str, pkg_dir: str | None, ctx: PluginContext | None = None) -> CategoryResult:
+    """Check requirements for the NetBox Plugin Certification Program.
 
-def check_certification(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
-    """Check requirements for the NetBox Plugin Certification Program."""
+    If ``ctx`` is given, its preloaded LICENSE/README/CHANGELOG/pyproject.toml are used instead of re-reading.
+    """
     cat = CategoryResult(name="Certification", icon="T")
-    results = cat.results
 
     # --- License checks ---
-    license_path = None
-    for name in ["LICENSE", "LICENSE.md", "LICENSE.txt"]:
-        p = os.path.join(plugin_path, name)
-        if os.path.isfile(p):
-            license_path = p
-            break
+    if ctx is not None:
+        license_path = ctx.license_path
+    else:
+        license_path = None
+        for name in LICENSE_FILES:
+            p = os.path.join(plugin_path, name)
+            if os.path.isfile(p):
+                license_path = p
+                break
 
     if license_path:
-        results.append(
-            CheckResult("license_file", Severity.PASS, f"License file found: {os.path.basename(license_path)}")
-        )
-        with open(license_path) as f:
-            license_text = f.read().lower()
-        is_compatible = any(lic in license_text for lic in COMPATIBLE_LICENSES)
+        cat.add(CheckResult("license_file", Severity.PASS, f"License file found: {os.path.basename(license_path)}"))
+        if ctx is not None and ctx.license_text is not None:
+            license_text = ctx.license_text
+        else:
+            with open(license_path) as f:
+                license_text = f.read()
+        is_compatible = bool(LICENSE_RE.search(license_text))
         if is_compatible:
-            results.append(
-                CheckResult("license_osi", Severity.PASS, "License appears OSI-approved and Apache 2.0 compatible")
-            )
+            cat.add(CheckResult("license_osi", Severity.PASS, "License appears OSI-approved and Apache 2.0 compatible"))
         else:
-            results.append(
+            cat.add(
                 CheckResult("license_osi", Severity.WARNING, "License may not be OSI-approved or Apache 2.0 compatible")
             )
     else:
-        results.append(
-            CheckResult("license_file", Severity.ERROR, "No LICENSE file found (required for certification)")
-        )
+        cat.add(CheckResult("license_file", Severity.ERROR, "No LICENSE file found (required for certification)"))
 
     # --- README checks specific to certification ---
     readme_path = os.path.join(plugin_path, "README.md")
-    if os.path.isfile(readme_path):
+    if ctx is not None and ctx.readme is not None:
+        readme = ctx.readme
+    elif os.path.isfile(readme_path):
         with open(readme_path) as f:
             readme = f.read()
+    else:
+        readme = None
+    if readme is not None:
+        found = _scan_readme(readme)
 
         # Version compatibility matrix
-        has_compat = bool(
-            re.search(
-                r"compat|version.*matrix|version.*range|netbox.*version|supported.*version", readme, re.IGNORECASE
-            )
-        )
+        has_compat = found["compat"]
         if has_compat:
-            results.append(CheckResult("compat_matrix", Severity.PASS, "Version compatibility info found in README"))
+            cat.add(CheckResult("compat_matrix", Severity.PASS, "Version compatibility info found in README"))
         else:
-            results.append(
+            cat.add(
                 CheckResult(
                     "compat_matrix",
                     Severity.WARNING,
@@ -79,25 +148,18 @@ def check_certification(plugin_path: str, pkg_dir: str | None) -> CategoryResult
             )
 
         # Dependencies section
-        has_deps = bool(re.search(r"(?:^|\n)#{1,3}\s*depend|requirements|prerequisites", readme, re.IGNORECASE))
+        has_deps = found["deps"]
         if has_deps:
-            results.append(CheckResult("deps_documented", Severity.PASS, "Dependencies documented in README"))
+            cat.add(CheckResult("deps_documented", Severity.PASS, "Dependencies documented in README"))
         else:
-            results.append(CheckResult("deps_documented", Severity.INFO, "No dependencies section in README"))
+            cat.add(CheckResult("deps_documented", Severity.INFO, "No dependencies section in README"))
 
         # Screenshots or screen recordings
-        img_patterns = [
-            r"!\[.*\]\(.*\.(png|jpg|jpeg|gif|svg|webp)",
-            r"<img.*src=",
-            r"!\[.*\]\(.*recording",
-            r"!\[.*\]\(.*demo",
-            r"!\[.*\]\(.*screenshot",
-        ]
-        has_screenshots = any(re.search(p, readme, re.IGNORECASE) for p in img_patterns)
+        has_screenshots = found["img"]
         if has_screenshots:
-            results.append(CheckResult("screenshots", Severity.PASS, "Screenshots/recordings found in README"))
+            cat.add(CheckResult("screenshots", Severity.PASS, "Screenshots/recordings found in README"))
         else:
-            results.append(
+            cat.add(
                 CheckResult(
                     "screenshots",
                     Severity.WARNING,
@@ -106,40 +168,38 @@ def check_certification(plugin_path: str, pkg_dir: str | None) -> CategoryResult
             )
 
         # Installation instructions
-        has_install = bool(re.search(r"(?:^|\n)#{1,3}\s*install|pip install", readme, re.IGNORECASE))
+        has_install = found["install"]
         if has_install:
-            results.append(CheckResult("install_docs", Severity.PASS, "Installation instructions found"))
+            cat.add(CheckResult("install_docs", Severity.PASS, "Installation instructions found"))
         else:
-            results.append(CheckResult("install_docs", Severity.WARNING, "No installation instructions in README"))
+            cat.add(CheckResult("install_docs", Severity.WARNING, "No installation instructions in README"))
 
         # Support / contact info
-        has_support = bool(re.search(r"support|contact|issues|bug.*report|contribute|community", readme, re.IGNORECASE))
+        has_support = found["support"]
         if has_support:
-            results.append(CheckResult("support_info", Severity.PASS, "Support/contact info found in README"))
+            cat.add(CheckResult("support_info", Severity.PASS, "Support/contact info found in README"))
         else:
-            results.append(CheckResult("support_info", Severity.INFO, "No support/contact section in README"))
+            cat.add(CheckResult("support_info", Severity.INFO, "No support/contact section in README"))
     else:
-        results.append(CheckResult("readme_cert", Severity.ERROR, "README.md missing (required for certification)"))
+        cat.add(CheckResult("readme_cert", Severity.ERROR, "README.md missing (required for certification)"))
+
+    # Directory listings (file names only), shared by the icon and CONTRIBUTING lookups
+    files_by_dir: dict[str, set[str]] = {}
+
+    def files_in(subdir: str) -> set[str]:
+        if subdir not in files_by_dir:
+            files_by_dir[subdir] = _list_files(os.path.join(plugin_path, subdir))
+        return files_by_dir[subdir]
 
     # --- Icon ---
-    icon_patterns = ["icon.png", "icon.svg", "logo.png", "logo.svg"]
-    has_icon = False
-    for pattern in icon_patterns:
-        # Check root and docs/ directories
-        for search_dir in ["", "docs", "images", "assets", "static"]:
-            check_path = (
-                os.path.join(plugin_path, search_dir, pattern) if search_dir else os.path.join(plugin_path, pattern)
-            )
-            if os.path.isfile(check_path):
-                has_icon = True
-                break
-        if has_icon:
-            break
+    icon_patterns = {"icon.png", "icon.svg", "logo.png", "logo.svg"}
+    # Check root and docs/ directories, one listing per directory
+    has_icon = any(not icon_patterns.isdisjoint(files_in(d)) for d in ("", "docs", "images", "assets", "static"))
 
     if has_icon:
-        results.append(CheckResult("icon", Severity.PASS, "Plugin icon found"))
+        cat.add(CheckResult("icon", Severity.PASS, "Plugin icon found"))
     else:
-        results.append(CheckResult("icon", Severity.INFO, "No plugin icon found (recommended for certification)"))
+        cat.add(CheckResult("icon", Severity.INFO, "No plugin icon found (recommended for certification)"))
 
     # --- Test coverage ---
     test_dirs = ["tests", "test"]
@@ -159,131 +219,131 @@ def check_certification(plugin_path: str, pkg_dir: str | None) -> CategoryResult
             break
 
     if has_tests and test_count > 0:
-        results.append(CheckResult("tests_exist", Severity.PASS, f"Test directory found ({test_count} test files)"))
+        cat.add(CheckResult("tests_exist", Severity.PASS, f"Test directory found ({test_count} test files)"))
     elif has_tests:
-        results.append(CheckResult("tests_exist", Severity.WARNING, "Test directory found but no test files"))
+        cat.add(CheckResult("tests_exist", Severity.WARNING, "Test directory found but no test files"))
     else:
-        results.append(
-            CheckResult("tests_exist", Severity.WARNING, "No test directory found (required for certification)")
-        )
+        cat.add(CheckResult("tests_exist", Severity.WARNING, "No test directory found (required for certification)"))
 
     # --- CI/CD running tests ---
     wf_dir = os.path.join(plugin_path, ".github", "workflows")
     ci_runs_tests = False
     test_patterns = [
-        "pytest",
-        "python -m test",
-        "manage.py test",
-        "test.sh",
-        "./test.sh",
-        "tox",
-        "nox",
-        "unittest",
-        "nose",
-        "coverage run",
+        b"pytest",
+        b"python -m test",
+        b"manage.py test",
+        b"test.sh",
+        b"./test.sh",
+        b"tox",
+        b"nox",
+        b"unittest",
+        b"nose",
+        b"coverage run",
     ]
-    if os.path.isdir(wf_dir):
-        for wf_file in os.listdir(wf_dir):
-            wf_path = os.path.join(wf_dir, wf_file)
-            if os.path.isfile(wf_path) and wf_file.endswith((".yml", ".yaml")):
-                with open(wf_path) as f:
+    try:
+        with os.scandir(wf_dir) as it:
+            for entry in it:
+                if not entry.name.endswith((".yml", ".yaml")) or not entry.is_file():
+                    continue
+                with open(entry.path, "rb") as f:
                     wf_content = f.read().lower()
                 if any(pat in wf_content for pat in test_patterns):
                     ci_runs_tests = True
                     break
+    except OSError:
+        pass
 
     if ci_runs_tests:
-        results.append(CheckResult("ci_tests", Severity.PASS, "CI workflow runs tests"))
+        cat.add(CheckResult("ci_tests", Severity.PASS, "CI workflow runs tests"))
     else:
-        results.append(
-            CheckResult("ci_tests", Severity.WARNING, "No CI workflow running tests (required for certification)")
-        )
+        cat.add(CheckResult("ci_tests", Severity.WARNING, "No CI workflow running tests (required for certification)"))
 
     # --- Release notes / CHANGELOG ---
-    changelog_variants = [
-        "CHANGELOG.md",
-        "CHANGELOG.rst",
-        "CHANGELOG.txt",
-        "CHANGELOG",
-        "CHANGES.md",
-        "CHANGES.rst",
-        "CHANGES.txt",
-        "HISTORY.md",
-        "HISTORY.rst",
-    ]
-    changelog_path = None
-    for variant in changelog_variants:
-        p = os.path.join(plugin_path, variant)
-        if os.path.isfile(p):
-            changelog_path = p
-            break
+    changelog_path = ctx.changelog_path if ctx is not None else find_changelog(plugin_path)
 
     if changelog_path:
-        with open(changelog_path) as f:
-            cl_content = f.read()
+        if ctx is not None and ctx.changelog is not None:
+            cl_lower = ctx.changelog.lower()
+        else:
+            with open(changelog_path, "rb") as f:
+                cl_lower = f.read().lower()
 
         # Check for breaking changes documentation pattern
-        has_breaking = bool(re.search(r"breaking|backward|incompatible|migration", cl_content, re.IGNORECASE))
+        has_breaking = any(kw in cl_lower for kw in BREAKING_KEYWORDS)
         if has_breaking:
-            results.append(CheckResult("breaking_changes", Severity.PASS, "Breaking changes documented in CHANGELOG"))
+            cat.add(CheckResult("breaking_changes", Severity.PASS, "Breaking changes documented in CHANGELOG"))
         else:
-            results.append(
-                CheckResult("breaking_changes", Severity.INFO, "No breaking changes noted (OK if none exist)")
-            )
+            cat.add(CheckResult("breaking_changes", Severity.INFO, "No breaking changes noted (OK if none exist)"))
     else:
-        results.append(
-            CheckResult("changelog_cert", Severity.WARNING, "CHANGELOG.md missing (required for certification)")
-        )
+        cat.add(CheckResult("changelog_cert", Severity.WARNING, "CHANGELOG.md missing (required for certification)"))
 
     # --- Contributing guide ---
-    contrib_files = ["CONTRIBUTING.md", "CONTRIBUTING.rst", ".github/CONTRIBUTING.md"]
-    has_contrib = any(os.path.isfile(os.path.join(plugin_path, f)) for f in contrib_files)
+    contrib_files = [("", "CONTRIBUTING.md"), ("", "CONTRIBUTING.rst"), (".github", "CONTRIBUTING.md")]
+    has_contrib = any(fname in files_in(d) for d, fname in contrib_files)
     if has_contrib:
-        results.append(CheckResult("contributing", Severity.PASS, "CONTRIBUTING guide found"))
+        cat.add(CheckResult("contributing", Severity.PASS, "CONTRIBUTING guide found"))
     else:
-        results.append(
-            CheckResult("contributing", Severity.INFO, "No CONTRIBUTING guide (recommended for certification)")
-        )
+        cat.add(CheckResult("contributing", Severity.INFO, "No CONTRIBUTING guide (recommended for certification)"))
 
     # --- PyPI package metadata ---
     pyproject_path = os.path.join(plugin_path, "pyproject.toml")
     if os.path.isfile(pyproject_path):
-        try:
-            import tomllib
-        except ImportError:
-            import tomli as tomllib  # type: ignore[no-redef]
+        if ctx is not None and ctx.pyproject is not None:
+            data = ctx.pyproject
+        else:
+            try:
+                import tomllib
+            except ImportError:
+                import tomli as tomllib  # type: ignore[no-redef]
 
-        with open(pyproject_path, "rb") as f:
-            data = tomllib.load(f)
+            with open(pyproject_path, "rb") as f:
+                data = tomllib.load(f)
 
         project = data.get("project", {})
 
         # Check license in pyproject matches LICENSE file
         license_val = project.get("license", {})
         if license_val:
-            results.append(CheckResult("pypi_license", Severity.PASS, "License declared in pyproject.toml"))
+            cat.add(CheckResult("pypi_license", Severity.PASS, "License declared in pyproject.toml"))
         else:
-            results.append(
+            cat.add(
                 CheckResult("pypi_license", Severity.WARNING, "No license in pyproject.toml (must match PyPI listing)")
             )
 
         # Check for project URLs (needed for PyPI listing)
         urls = project.get("urls", {})
         if urls:
-            results.append(CheckResult("pypi_urls", Severity.PASS, f"Project URLs configured ({len(urls)} URLs)"))
+            cat.add(CheckResult("pypi_urls", Severity.PASS, f"Project URLs configured ({len(urls)} URLs)"))
         else:
-            results.append(CheckResult("pypi_urls", Severity.WARNING, "No project URLs in pyproject.toml"))
+            cat.add(CheckResult("pypi_urls", Severity.WARNING, "No project URLs in pyproject.toml"))
 
     return cat
 
 
+def _list_files(path: str) -> set[str]:
+    """Return the names of regular files in a directory (empty if it doesn't exist)."""
+    try:
+        with os.scandir(path) as it:
+            return {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        return set()
+
+
 def _count_test_files(test_dir: str) -> int:
     """Count test_*.py and *_test.py files in a directory tree."""
     count = 0
-    for root, _dirs, files in os.walk(test_dir):
-        for f in files:
-            if f.startswith("test_") and f.endswith(".py"):
-                count += 1
-            elif f.endswith("_test.py"):
-                count += 1
+    try:
+        with os.scandir(test_dir) as it:
+            for entry in it:
+                # Like os.walk: symlinked files count, symlinked directories are not descended into
+                if entry.is_dir(follow_symlinks=False):
+                    count += _count_test_files(entry.path)
+                elif entry.is_file():
+                    name = entry.name
+                    if name.startswith("test_") and name.endswith(".py"):
+                        count += 1
+                    elif name.endswith("_test.py"):
+                        count += 1
+    except OSError:
+        pass
     return count
@@ -1,76 +1,42 @@
 """Check changelog format and content."""
 
-import json
 import os
 import re
-import subprocess
-import urllib.error
-import urllib.request
-
-from . import CategoryResult, CheckResult, Severity
-
-# Common changelog file variants
-CHANGELOG_VARIANTS = [
-    "CHANGELOG.md",
-    "CHANGELOG.rst",
-    "CHANGELOG.txt",
-    "CHANGELOG",
-    "CHANGES.md",
-    "CHANGES.rst",
-    "CHANGES.txt",
-    "HISTORY.md",
-    "HISTORY.rst",
-]
-
-
-def _find_changelog(plugin_path: str) -> str | None:
-    """Find changelog file, trying common variants."""
-    for variant in CHANGELOG_VARIANTS:
-        path = os.path.join(plugin_path, variant)
-        if os.path.isfile(path):
-            return path
-    return None
-
-
-def _get_github_repo(plugin_path: str) -> str | None:
-    """Extract GitHub owner/repo from git remote URL."""
-    try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True,
-            text=True,
-            cwd=plugin_path,
-            timeout=5,
-        )
-        if result.returncode != 0:
-            return None
-        url = result.stdout.strip()
-        m = re.search(r"github\.com[/:]([^/]+/[^/.]+?)(?:\.git)?$", url)
-        return m.group(1) if m else None
-    except Exception:
-        return None
+from datetime import date
+
+from . import CategoryResult, CheckResult, PluginContext, Severity, find_changelog
+from .github import get_github_repo, github_api
 
+# Keep a Changelog patterns, compiled once at import. They run on the raw bytes,
+# so the changelog never has to be decoded as a whole.
+FIRST_LINE_RE = re.compile(rb"\s*([^\n]*)")
+# Everything else is collected in a single finditer pass over the file
+CHANGELOG_RE = re.compile(
+    rb"(?P<unreleased>(?i:##\s*\[?Unreleased\]?))"
+    rb"|##\s*\[(?P<version>\d+\.\d+\.\d+)\](?:\s*-\s*(?P<date>\d{4}-\d{2}-\d{2}))?"
+    rb"|###\s*(?P<subsection>Added|Fixed|Changed|Removed|Deprecated|Security)"
+    rb"|(?P<format_ref>(?i:keepachangelog|keep a changelog))"
+)
 
-def _check_github_releases(plugin_path: str, results: list) -> bool:
+
+def _check_github_releases(plugin_path: str, cat: CategoryResult) -> bool:
     """Check if the repo has GitHub releases. Returns True if releases found."""
-    repo = _get_github_repo(plugin_path)
+    repo = get_github_repo(plugin_path)
     if not repo:
         return False
 
     try:
-        url = f"https://api.github.com/repos/{repo}/releases?per_page=5"
-        req = urllib.request.Request(url, headers={"Accept": "application/vnd.github.v3+json"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            releases = json.loads(resp.read().decode())
+        releases = github_api(f"https://api.github.com/repos/{repo}/releases?per_page=5")
 
-        if not releases:
+        if not releases or not isinstance(releases, list):
             return False
 
         count = len(releases)
         latest = releases[0].get("tag_name", "unknown")
-        has_body = any(r.get("body", "").strip() for r in releases)
+        # "body" is null for releases published without notes
+        has_body = any((r.get("body") or "").strip() for r in releases)
 
-        results.append(
+        cat.add(
             CheckResult(
                 "github_releases",
                 Severity.PASS,
@@ -79,11 +45,11 @@ def _check_github_releases(plugin_path: str, results: list) -> bool:
         )
 
         if has_body:
-            results.append(CheckResult("release_notes", Severity.PASS, "GitHub Releases include release notes"))
+            cat.add(CheckResult("release_notes", Severity.PASS, "GitHub Releases include release notes"))
         else:
-            results.append(CheckResult("release_notes", Severity.INFO, "GitHub Releases have no release notes body"))
+            cat.add(CheckResult("release_notes", Severity.INFO, "GitHub Releases have no release notes body"))
 
-        results.append(
+        cat.add(
             CheckResult(
                 "changelog_suggestion",
                 Severity.INFO,
@@ -92,76 +58,104 @@ def _check_github_releases(plugin_path: str, results: list) -> bool:
         )
         return True
 
-    except urllib.error.HTTPError:
-        return False
-    except Exception:
+    except (AttributeError, TypeError):
         return False
 
 
-def check_changelog(plugin_path: str) -> CategoryResult:
-    """Validate changelog format and content."""
+def _read_changelog_markers(cl_path: str) -> tuple[bytes, bytes]:
+    """Stream a changelog, returning its first non-blank line and only the lines CHANGELOG_RE can match."""
+    first_line = None
+    kept = []
+    with open(cl_path, "rb") as f:
+        for line in f:
+            if first_line is None and line.strip():
+                first_line = line.strip()
+            # Every marker contains "#" except the Keep a Changelog reference
+            if b"#" in line or b"changelog" in line.lower():
+                kept.append(line)
+    return first_line or b"", b"".join(kept)
+
+
+def check_changelog(plugin_path: str, ctx: PluginContext | None = None) -> CategoryResult:
+    """Validate changelog format and content.
+
+    If ``ctx`` is given, its changelog path and contents are used instead of searching and re-reading.
+    """
     cat = CategoryResult(name="CHANGELOG", icon="L")
-    results = cat.results
 
-    cl_path = _find_changelog(plugin_path)
+    cl_path = ctx.changelog_path if ctx is not None else find_changelog(plugin_path)
     if not cl_path:
         # No changelog file — check GitHub Releases as alternative
-        if _check_github_releases(plugin_path, results):
+        if _check_github_releases(plugin_path, cat):
             return cat
-        results.append(CheckResult("exists", Severity.WARNING, "No changelog file found"))
+        cat.add(CheckResult("exists", Severity.WARNING, "No changelog file found"))
         return cat
 
     fname = os.path.basename(cl_path)
-    results.append(CheckResult("exists", Severity.PASS, f"{fname} exists"))
+    cat.add(CheckResult("exists", Severity.PASS, f"{fname} exists"))
 
     # Only do detailed format checks on markdown changelogs
     if not cl_path.endswith(".md"):
-        results.append(CheckResult("format", Severity.INFO, f"{fname} found (detailed checks only for .md)"))
+        cat.add(CheckResult("format", Severity.INFO, f"{fname} found (detailed checks only for .md)"))
         return cat
 
-    with open(cl_path) as f:
-        content = f.read()
-    lines = content.strip().split("\n")
+    if ctx is not None and ctx.changelog is not None:
+        content = ctx.changelog
+        # Only the first non-blank line is needed; match it in place instead of copying the rest
+        first_line = FIRST_LINE_RE.match(content).group(1).strip()
+    else:
+        first_line, content = _read_changelog_markers(cl_path)
 
     # Check header
-    if lines and lines[0].strip().startswith("# Changelog"):
-        results.append(CheckResult("header", Severity.PASS, "Starts with # Changelog"))
-    elif lines and lines[0].strip().startswith("# "):
-        results.append(CheckResult("header", Severity.INFO, f"Header: {lines[0].strip()} (expected # Changelog)"))
+    if first_line.startswith(b"# Changelog"):
+        cat.add(CheckResult("header", Severity.PASS, "Starts with # Changelog"))
+    elif first_line.startswith(b"# "):
+        header = first_line.decode(errors="replace")
+        cat.add(CheckResult("header", Severity.INFO, f"Header: {header} (expected # Changelog)"))
     else:
-        results.append(CheckResult("header", Severity.WARNING, "Missing # Changelog header"))
+        cat.add(CheckResult("header", Severity.WARNING, "Missing # Changelog header"))
+
+    has_unreleased = False
+    has_format_ref = False
+    version_matches = []  # (version, date) for dated entries
+    ver_only = []  # every version header, dated or not
+    subsections = set()
+    for m in CHANGELOG_RE.finditer(content):
+        if m.group("version"):
+            ver_only.append(m.group("version"))
+            if m.group("date"):
+                version_matches.append((m.group("version"), m.group("date")))
+        elif m.group("subsection"):
+            subsections.add(m.group("subsection").decode())
+        elif m.group("unreleased"):
+            has_unreleased = True
+        else:
+            has_format_ref = True
 
     # Check for Unreleased section
-    if re.search(r"##\s*\[?Unreleased\]?", content, re.IGNORECASE):
-        results.append(CheckResult("unreleased", Severity.PASS, "[Unreleased] section found"))
+    if has_unreleased:
+        cat.add(CheckResult("unreleased", Severity.PASS, "[Unreleased] section found"))
     else:
-        results.append(CheckResult("unreleased", Severity.INFO, "No [Unreleased] section"))
+        cat.add(CheckResult("unreleased", Severity.INFO, "No [Unreleased] section"))
 
     # Check version sections
-    version_matches = re.findall(r"##\s*\[(\d+\.\d+\.\d+)\]\s*-\s*(\d{4}-\d{2}-\d{2})", content)
     if version_matches:
-        results.append(CheckResult("versions", Severity.PASS, f"{len(version_matches)} version entries found"))
-
-        # Check date validity
-        valid_dates = True
-        for ver, date in version_matches:
-            parts = date.split("-")
-            try:
-                y, m, d = int(parts[0]), int(parts[1]), int(parts[2])
-                if not (2020 <= y <= 2030 and 1 <= m <= 12 and 1 <= d <= 31):
-                    valid_dates = False
-            except (ValueError, IndexError):
-                valid_dates = False
+        cat.add(CheckResult("versions", Severity.PASS, f"{len(version_matches)} version entries found"))
+
+        # Check date validity (fromisoformat also rejects e.g. Feb 30)
+        try:
+            valid_dates = all(2020 <= date.fromisoformat(dt.decode()).year <= 2030 for _ver, dt in version_matches)
+        except ValueError:
+            valid_dates = False
 
         if valid_dates:
-            results.append(CheckResult("dates", Severity.PASS, "All dates are valid YYYY-MM-DD"))
+            cat.add(CheckResult("dates", Severity.PASS, "All dates are valid YYYY-MM-DD"))
         else:
-            results.append(CheckResult("dates", Severity.WARNING, "Some dates may be invalid"))
+            cat.add(CheckResult("dates", Severity.WARNING, "Some dates may be invalid"))
     else:
         # Check for versions without dates
-        ver_only = re.findall(r"##\s*\[(\d+\.\d+\.\d+)\]", content)
         if ver_only:
-            results.append(
+            cat.add(
                 CheckResult(
                     "versions",
                     Severity.WARNING,
@@ -169,22 +163,18 @@ def check_changelog(plugin_path: str) -> CategoryResult:
                 )
             )
         else:
-            results.append(CheckResult("versions", Severity.WARNING, "No version entries found"))
+            cat.add(CheckResult("versions", Severity.WARNING, "No version entries found"))
 
     # Check for subsections (Added, Fixed, Changed, etc.)
-    subsections = re.findall(r"###\s*(Added|Fixed|Changed|Removed|Deprecated|Security)", content)
     if subsections:
-        unique = set(subsections)
-        results.append(CheckResult("subsections", Severity.PASS, f"Subsections used: {', '.join(sorted(unique))}"))
+        cat.add(CheckResult("subsections", Severity.PASS, f"Subsections used: {', '.join(sorted(subsections))}"))
     else:
-        results.append(
-            CheckResult("subsections", Severity.INFO, "No standard subsections (Added, Fixed, Changed, etc.)")
-        )
+        cat.add(CheckResult("subsections", Severity.INFO, "No standard subsections (Added, Fixed, Changed, etc.)"))
 
     # Check Keep a Changelog reference
-    if "keepachangelog" in content.lower() or "keep a changelog" in content.lower():
-        results.append(CheckResult("format_ref", Severity.PASS, "References Keep a Changelog format"))
+    if has_format_ref:
+        cat.add(CheckResult("format_ref", Severity.PASS, "References Keep a Changelog format"))
     else:
-        results.append(CheckResult("format_ref", Severity.INFO, "No reference to Keep a Changelog format"))
+        cat.add(CheckResult("format_ref", Severity.INFO, "No reference to Keep a Changelog format"))
 
     return cat
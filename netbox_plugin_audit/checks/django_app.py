@@ -4,14 +4,23 @@ import ast
 import os
 import re
 
-from . import CategoryResult, CheckResult, Severity
+from . import WIDGET_CLASS_RE, CategoryResult, CheckResult, Severity, list_entries
+
+# Top-level class whose bases mention "Model"; a cheap prefilter before ast.parse
+MODEL_CLASS_RE = re.compile(r"^class\s+\w+\s*\([^:]*?Model", re.MULTILINE)
+# Top-level class or function definition
+VIEW_DEF_RE = re.compile(r"^(?:class|def)\s+\w+", re.MULTILINE)
 
 
 def _has_django_models(filepath: str) -> bool:
     """Check if models.py defines any Django model classes."""
     try:
         with open(filepath) as f:
-            tree = ast.parse(f.read())
+            source = f.read()
+        if not MODEL_CLASS_RE.search(source):
+            return False
+        # Confirm with the AST to rule out matches inside strings
+        tree = ast.parse(source)
         for node in ast.iter_child_nodes(tree):
             if isinstance(node, ast.ClassDef):
                 for base in node.bases:
@@ -23,7 +32,7 @@ def _has_django_models(filepath: str) -> bool:
                     if name and "Model" in name:
                         return True
         return False
-    except Exception:
+    except (OSError, SyntaxError, ValueError):
         return False
 
 
@@ -31,12 +40,8 @@ def _has_django_views(filepath: str) -> bool:
     """Check if views.py defines any view classes or functions."""
     try:
         with open(filepath) as f:
-            tree = ast.parse(f.read())
-        for node in ast.iter_child_nodes(tree):
-            if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
-                return True
-        return False
-    except Exception:
+            return VIEW_DEF_RE.search(f.read()) is not None
+    except (OSError, ValueError):
         return False
 
 
@@ -48,7 +53,10 @@ def _get_widget_info(filepath: str) -> dict:
     result = {"classes": [], "has_register_decorator": False}
     try:
         with open(filepath) as f:
-            tree = ast.parse(f.read())
+            source = f.read()
+        if not WIDGET_CLASS_RE.search(source):
+            return result
+        tree = ast.parse(source)
         for node in ast.iter_child_nodes(tree):
             if isinstance(node, ast.ClassDef):
                 # Check if it inherits from DashboardWidget (or *Widget)
@@ -73,138 +81,119 @@ def _get_widget_info(filepath: str) -> dict:
                         if deco_name == "register_widget":
                             result["has_register_decorator"] = True
         return result
-    except Exception:
+    except (OSError, SyntaxError, ValueError):
         return result
 
 
 def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Validate Django app structure follows NetBox plugin conventions."""
     cat = CategoryResult(name="Django Structure", icon="D")
-    results = cat.results
 
     if not pkg_dir:
-        results.append(CheckResult("package", Severity.ERROR, "No package directory to check"))
+        cat.add(CheckResult("package", Severity.ERROR, "No package directory to check"))
         return cat
 
     pkg_path = os.path.join(plugin_path, pkg_dir)
+    files, dirs = list_entries(pkg_path)
 
     # --- Core Django files ---
     # urls.py
-    urls_path = os.path.join(pkg_path, "urls.py")
-    has_urls = os.path.isfile(urls_path)
+    has_urls = "urls.py" in files
     if has_urls:
-        results.append(CheckResult("urls_py", Severity.PASS, "urls.py exists"))
+        cat.add(CheckResult("urls_py", Severity.PASS, "urls.py exists"))
     else:
-        results.append(CheckResult("urls_py", Severity.INFO, "urls.py not found (OK if no custom views)"))
+        cat.add(CheckResult("urls_py", Severity.INFO, "urls.py not found (OK if no custom views)"))
 
     # views.py or views/ directory
-    views_path = os.path.join(pkg_path, "views.py")
-    views_dir = os.path.join(pkg_path, "views")
-    has_views = os.path.isfile(views_path) or os.path.isdir(views_dir)
+    has_views = "views.py" in files or "views" in dirs
     if has_views:
-        results.append(CheckResult("views_py", Severity.PASS, "views.py exists"))
+        cat.add(CheckResult("views_py", Severity.PASS, "views.py exists"))
     else:
-        results.append(CheckResult("views_py", Severity.INFO, "views.py not found (OK if no custom views)"))
+        cat.add(CheckResult("views_py", Severity.INFO, "views.py not found (OK if no custom views)"))
 
     # models.py or models/ directory
     models_path = os.path.join(pkg_path, "models.py")
-    models_dir = os.path.join(pkg_path, "models")
-    has_models_file = os.path.isfile(models_path) or os.path.isdir(models_dir)
+    has_models_file = "models.py" in files or "models" in dirs
     has_models = False
-    if os.path.isfile(models_path):
+    if "models.py" in files:
         has_models = _has_django_models(models_path)
-    elif os.path.isdir(models_dir):
-        # Check any .py file in models/ for model classes
-        for f in os.listdir(models_dir):
-            if f.endswith(".py") and f != "__init__.py":
-                if _has_django_models(os.path.join(models_dir, f)):
-                    has_models = True
-                    break
+    elif "models" in dirs:
+        # Check any .py file in models/ for model classes, stopping at the first hit
+        with os.scandir(os.path.join(pkg_path, "models")) as it:
+            has_models = any(
+                e.name.endswith(".py") and e.name != "__init__.py" and _has_django_models(e.path) for e in it
+            )
 
     if has_models_file:
-        results.append(CheckResult("models_py", Severity.PASS, "models.py exists"))
+        cat.add(CheckResult("models_py", Severity.PASS, "models.py exists"))
     else:
-        results.append(CheckResult("models_py", Severity.INFO, "models.py not found (OK if no custom models)"))
+        cat.add(CheckResult("models_py", Severity.INFO, "models.py not found (OK if no custom models)"))
 
     # --- Migrations ---
-    migrations_dir = os.path.join(pkg_path, "migrations")
     if has_models:
-        if os.path.isdir(migrations_dir):
-            init_path = os.path.join(migrations_dir, "__init__.py")
-            if os.path.isfile(init_path):
-                results.append(CheckResult("migrations_init", Severity.PASS, "migrations/__init__.py exists"))
+        if "migrations" in dirs:
+            migration_files, _ = list_entries(os.path.join(pkg_path, "migrations"))
+            if "__init__.py" in migration_files:
+                cat.add(CheckResult("migrations_init", Severity.PASS, "migrations/__init__.py exists"))
             else:
-                results.append(
-                    CheckResult("migrations_init", Severity.ERROR, "migrations/__init__.py missing (required)")
-                )
+                cat.add(CheckResult("migrations_init", Severity.ERROR, "migrations/__init__.py missing (required)"))
             # Count migration files
-            migration_files = [f for f in os.listdir(migrations_dir) if f.endswith(".py") and f != "__init__.py"]
-            if migration_files:
-                results.append(
-                    CheckResult("migrations_count", Severity.PASS, f"{len(migration_files)} migration file(s) found")
-                )
+            migration_count = sum(1 for f in migration_files if f.endswith(".py") and f != "__init__.py")
+            if migration_count:
+                cat.add(CheckResult("migrations_count", Severity.PASS, f"{migration_count} migration file(s) found"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "migrations_count", Severity.WARNING, "No migration files (models defined but no migrations)"
                     )
                 )
         else:
-            results.append(
+            cat.add(
                 CheckResult(
                     "migrations_dir", Severity.WARNING, "migrations/ not found (models defined but no migrations)"
                 )
             )
-    elif os.path.isdir(migrations_dir):
-        results.append(CheckResult("migrations_dir", Severity.PASS, "migrations/ directory exists"))
+    elif "migrations" in dirs:
+        cat.add(CheckResult("migrations_dir", Severity.PASS, "migrations/ directory exists"))
 
     # --- NetBox plugin files ---
     # navigation.py
-    nav_path = os.path.join(pkg_path, "navigation.py")
-    if os.path.isfile(nav_path):
-        results.append(CheckResult("navigation_py", Severity.PASS, "navigation.py exists"))
+    if "navigation.py" in files:
+        cat.add(CheckResult("navigation_py", Severity.PASS, "navigation.py exists"))
     else:
         if has_views:
-            results.append(
+            cat.add(
                 CheckResult("navigation_py", Severity.INFO, "navigation.py not found (views exist, consider adding)")
             )
         else:
-            results.append(CheckResult("navigation_py", Severity.INFO, "navigation.py not found"))
+            cat.add(CheckResult("navigation_py", Severity.INFO, "navigation.py not found"))
 
     # tables.py
-    tables_path = os.path.join(pkg_path, "tables.py")
-    if os.path.isfile(tables_path):
-        results.append(CheckResult("tables_py", Severity.PASS, "tables.py exists"))
+    if "tables.py" in files:
+        cat.add(CheckResult("tables_py", Severity.PASS, "tables.py exists"))
     elif has_models:
-        results.append(CheckResult("tables_py", Severity.INFO, "tables.py not found (models exist, consider adding)"))
+        cat.add(CheckResult("tables_py", Severity.INFO, "tables.py not found (models exist, consider adding)"))
 
     # filtersets.py
-    filtersets_path = os.path.join(pkg_path, "filtersets.py")
-    if os.path.isfile(filtersets_path):
-        results.append(CheckResult("filtersets_py", Severity.PASS, "filtersets.py exists"))
+    if "filtersets.py" in files:
+        cat.add(CheckResult("filtersets_py", Severity.PASS, "filtersets.py exists"))
     elif has_models:
-        results.append(
-            CheckResult("filtersets_py", Severity.INFO, "filtersets.py not found (models exist, consider adding)")
-        )
+        cat.add(CheckResult("filtersets_py", Severity.INFO, "filtersets.py not found (models exist, consider adding)"))
 
     # forms.py
-    forms_path = os.path.join(pkg_path, "forms.py")
-    if os.path.isfile(forms_path):
-        results.append(CheckResult("forms_py", Severity.PASS, "forms.py exists"))
+    if "forms.py" in files:
+        cat.add(CheckResult("forms_py", Severity.PASS, "forms.py exists"))
     elif has_models and has_views:
-        results.append(
-            CheckResult("forms_py", Severity.INFO, "forms.py not found (models+views exist, consider adding)")
-        )
+        cat.add(CheckResult("forms_py", Severity.INFO, "forms.py not found (models+views exist, consider adding)"))
 
     # template_content.py
-    tc_path = os.path.join(pkg_path, "template_content.py")
-    if os.path.isfile(tc_path):
-        results.append(CheckResult("template_content_py", Severity.PASS, "template_content.py exists"))
+    if "template_content.py" in files:
+        cat.add(CheckResult("template_content_py", Severity.PASS, "template_content.py exists"))
 
     # graphql.py
-    gql_path = os.path.join(pkg_path, "graphql.py")
-    if os.path.isfile(gql_path):
-        results.append(CheckResult("graphql_py", Severity.PASS, "graphql.py exists"))
+    if "graphql.py" in files:
+        gql_path = os.path.join(pkg_path, "graphql.py")
+        cat.add(CheckResult("graphql_py", Severity.PASS, "graphql.py exists"))
 
         # Check for deprecated FilterLookup[str] usage (NetBox 4.5.4+)
         # In 4.5.4, the graphql library upgrade means FilterLookup[str] triggers
@@ -219,7 +208,7 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
             has_str_filter_import = "StrFilterLookup" in gql_source
 
             if deprecated_pattern and not has_str_filter_import:
-                results.append(
+                cat.add(
                     CheckResult(
                         "graphql_filterlookup",
                         Severity.WARNING,
@@ -230,7 +219,7 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                     )
                 )
             elif deprecated_pattern and has_str_filter_import:
-                results.append(
+                cat.add(
                     CheckResult(
                         "graphql_filterlookup",
                         Severity.WARNING,
@@ -239,23 +228,22 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                     )
                 )
             elif has_str_filter_import:
-                results.append(
+                cat.add(
                     CheckResult(
                         "graphql_filterlookup",
                         Severity.PASS,
                         "Uses StrFilterLookup[str] (compatible with NetBox 4.5.4+)",
                     )
                 )
-        except Exception:
+        except (OSError, ValueError):
             pass
 
     # --- Dashboard widgets ---
-    widgets_path = os.path.join(pkg_path, "widgets.py")
-    if os.path.isfile(widgets_path):
-        widget_info = _get_widget_info(widgets_path)
+    if "widgets.py" in files:
+        widget_info = _get_widget_info(os.path.join(pkg_path, "widgets.py"))
         if widget_info["classes"]:
             names = ", ".join(widget_info["classes"])
-            results.append(
+            cat.add(
                 CheckResult(
                     "widgets_py",
                     Severity.PASS,
@@ -263,9 +251,9 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                 )
             )
             if widget_info["has_register_decorator"]:
-                results.append(CheckResult("widget_registration", Severity.PASS, "@register_widget decorator found"))
+                cat.add(CheckResult("widget_registration", Severity.PASS, "@register_widget decorator found"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "widget_registration",
                         Severity.WARNING,
@@ -273,16 +261,15 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                     )
                 )
         else:
-            results.append(
+            cat.add(
                 CheckResult("widgets_py", Severity.INFO, "widgets.py exists but no DashboardWidget subclasses found")
             )
     else:
-        results.append(CheckResult("widgets_py", Severity.INFO, "No dashboard widgets (widgets.py not found)"))
+        cat.add(CheckResult("widgets_py", Severity.INFO, "No dashboard widgets (widgets.py not found)"))
 
     # --- API structure ---
-    api_dir = os.path.join(pkg_path, "api")
-    if os.path.isdir(api_dir):
-        results.append(CheckResult("api_dir", Severity.PASS, "api/ directory exists"))
+    if "api" in dirs:
+        cat.add(CheckResult("api_dir", Severity.PASS, "api/ directory exists"))
 
         api_files = {
             "__init__.py": ("api_init", Severity.WARNING),
@@ -290,15 +277,13 @@ def check_django_app(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
             "urls.py": ("api_urls", Severity.WARNING),
             "views.py": ("api_views", Severity.WARNING),
         }
+        present, _ = list_entries(os.path.join(pkg_path, "api"))
         for fname, (check_name, sev) in api_files.items():
-            fpath = os.path.join(api_dir, fname)
-            if os.path.isfile(fpath):
-                results.append(CheckResult(check_name, Severity.PASS, f"api/{fname} exists"))
+            if fname in present:
+                cat.add(CheckResult(check_name, Severity.PASS, f"api/{fname} exists"))
             else:
-                results.append(CheckResult(check_name, sev, f"api/{fname} missing"))
+                cat.add(CheckResult(check_name, sev, f"api/{fname} missing"))
     elif has_models:
-        results.append(
-            CheckResult("api_dir", Severity.INFO, "api/ directory not found (models exist, consider adding)")
-        )
+        cat.add(CheckResult("api_dir", Severity.INFO, "api/ directory not found (models exist, consider adding)"))
 
     return cat
@@ -1,118 +1,396 @@
 """Check GitHub repository health and activity."""
 
+import functools
+import hashlib
+import http.client
 import json
+import os
 import re
 import subprocess
-import urllib.error
-import urllib.request
+import sys
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 
-from . import CategoryResult, CheckResult, Severity
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
+from . import CACHE_DIR, NO_CACHE, OFFLINE, REDIRECT_STATUSES, CategoryResult, CheckResult, Severity, https_connection
 
-def _get_github_repo(plugin_path: str) -> str | None:
-    """Extract GitHub owner/repo from git remote URL."""
+GITHUB_REPO_RE = re.compile(r"github\.com[/:]([^/]+/[^/.]+?)(?:\.git)?$")
+GITHUB_API_HOST = "api.github.com"
+LINK_LAST_RE = re.compile(r'[?&]page=(\d+)>;\s*rel="last"')
+GITHUB_HEADERS = {"Accept": "application/vnd.github.v3+json", "User-Agent": "netbox-plugin-audit"}
+
+# API responses are cached with their ETag beside the clone cache and revalidated with If-None-Match
+GITHUB_CACHE_DIR = os.path.join(CACHE_DIR, "github")
+GITHUB_CACHE_TTL = int(os.environ.get("NBAUDIT_GITHUB_CACHE_TTL", "300"))
+
+# orjson parses the (bytes) API responses several times faster when installed
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# Repo health in one request, used when GITHUB_TOKEN is set (GraphQL requires authentication)
+GITHUB_GRAPHQL_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    pushedAt isArchived stargazerCount forkCount hasIssuesEnabled
+    defaultBranchRef { name }
+    issues(states: OPEN, first: 1, orderBy: {field: UPDATED_AT, direction: ASC}) { totalCount nodes { updatedAt } }
+    pullRequests(states: OPEN) { totalCount }
+  }
+}
+"""
+
+# Redirect hops followed before the response is returned as-is
+MAX_REDIRECTS = 3
+
+# One kept-alive HTTPS connection per thread; http.client connections are not thread-safe
+_local = threading.local()
+
+
+def _git_config_path(plugin_path: str) -> str:
+    """Locate the git config for a checkout, following .git files used by worktrees and submodules."""
+    git_path = os.path.join(plugin_path, ".git")
+    if not os.path.isfile(git_path):
+        return os.path.join(git_path, "config")
     try:
-        result = subprocess.run(
-            ["git", "remote", "get-url", "origin"],
-            capture_output=True,
-            text=True,
-            cwd=plugin_path,
-            timeout=5,
-        )
+        with open(git_path, encoding="utf-8") as f:
+            gitdir = f.read().strip().removeprefix("gitdir:").strip()
+        gitdir = os.path.join(plugin_path, gitdir)
+        # Worktrees keep their config in the main repository's git dir
+        with open(os.path.join(gitdir, "commondir"), encoding="utf-8") as f:
+            gitdir = os.path.join(gitdir, f.read().strip())
+    except (OSError, UnicodeDecodeError):
+        pass
+    return os.path.join(gitdir, "config")
+
+
+def _origin_url_from_config(plugin_path: str) -> str | None:
+    """Read the origin remote URL straight from the git config.
+
+    Returns None, leaving the lookup to git, when the config uses what this parser doesn't apply:
+    url.<base>.insteadOf rewrites and [include]/[includeIf] files.
+    """
+    url = None
+    try:
+        with open(_git_config_path(plugin_path), encoding="utf-8") as f:
+            in_origin = False
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    if line.lower().startswith(("[include", "[url ")):
+                        return None
+                    in_origin = line == '[remote "origin"]'
+                elif in_origin and url is None:
+                    key, sep, value = line.partition("=")
+                    if sep and key.strip() == "url":
+                        url = value.strip()
+    except (OSError, UnicodeDecodeError):
+        pass
+    return url
+
+
+@functools.lru_cache(maxsize=32)
+def _github_repo_for(plugin_path: str) -> str | None:
+    """Resolve owner/repo for an absolute plugin path (memoized)."""
+    url = _origin_url_from_config(plugin_path)
+    if url is None or not GITHUB_REPO_RE.search(url):
+        # Subdirectories of a checkout, unusual layouts and URL aliases (insteadOf rewrites in the global
+        # config) need git itself to resolve the remote
+        try:
+            result = subprocess.run(
+                ["git", "remote", "get-url", "origin"],
+                capture_output=True,
+                text=True,
+                cwd=plugin_path,
+                timeout=5,
+            )
+        except (OSError, subprocess.SubprocessError):
+            return None
         if result.returncode != 0:
             return None
         url = result.stdout.strip()
-        m = re.search(r"github\.com[/:]([^/]+/[^/.]+?)(?:\.git)?$", url)
-        return m.group(1) if m else None
-    except Exception:
+    m = GITHUB_REPO_RE.search(url)
+    return m.group(1) if m else None
+
+
+def get_github_repo(plugin_path: str) -> str | None:
+    """Extract GitHub owner/repo from git remote URL."""
+    return _github_repo_for(os.path.abspath(plugin_path))
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a GitHub ISO 8601 timestamp such as 2024-01-02T03:04:05Z."""
+    if sys.version_info >= (3, 11):
+        # fromisoformat understands the trailing Z natively
+        return datetime.fromisoformat(value)
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _github_connection() -> http.client.HTTPSConnection:
+    """Return this thread's pooled connection to the GitHub API."""
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = https_connection(GITHUB_API_HOST, timeout=10)
+    return conn
+
+
+def _read_cached(cache_path: str) -> dict | None:
+    """Load a cached API response entry."""
+    try:
+        with open(cache_path, encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
         return None
+    return entry if isinstance(entry, dict) else None
+
 
+def _write_cached(cache_path: str, entry: dict) -> None:
+    """Atomically store an API response entry."""
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        os.makedirs(GITHUB_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
 
-def _github_api(url: str) -> dict | list | None:
+
+def _github_send(
+    method: str, path: str, headers: dict, body: bytes | None = None
+) -> tuple[http.client.HTTPResponse, bytes] | None:
+    """Send one request over the shared keep-alive connection, returning (response, body)."""
+    # Retry once on a fresh connection in case the server dropped the idle one
+    for _ in range(2):
+        conn = _github_connection()
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            return resp, resp.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            _local.conn = None
+    return None
+
+
+def _github_request(
+    method: str, path: str, headers: dict, body: bytes | None = None
+) -> tuple[http.client.HTTPResponse, bytes] | None:
+    """Send a request to the GitHub API, following redirects for GETs, returning (response, body)."""
+    if OFFLINE:
+        return None
+    response = _github_send(method, path, headers, body)
+    for _ in range(MAX_REDIRECTS):
+        if response is None or method != "GET" or response[0].status not in REDIRECT_STATUSES:
+            break
+        # Renamed and transferred repos redirect to /repositories/<id>/...
+        location = urllib.parse.urlsplit(
+            urllib.parse.urljoin(f"https://{GITHUB_API_HOST}{path}", response[0].getheader("Location", ""))
+        )
+        if location.hostname != GITHUB_API_HOST:
+            break
+        path = f"{location.path}?{location.query}" if location.query else location.path
+        response = _github_send(method, path, headers, body)
+    return response
+
+
+def _github_get(url: str) -> tuple[dict | list | None, str]:
+    """GET a GitHub API URL over the shared keep-alive connection, returning (data, Link header)."""
+    cache_path = os.path.join(GITHUB_CACHE_DIR, hashlib.sha1(url.encode()).hexdigest() + ".json")
+    cached = None if NO_CACHE else _read_cached(cache_path)
+    headers = GITHUB_HEADERS
+    if cached:
+        if OFFLINE:
+            # Offline, any cached response beats none, however old
+            return cached.get("data"), cached.get("link", "")
+        try:
+            if time.time() - os.path.getmtime(cache_path) < GITHUB_CACHE_TTL:
+                return cached.get("data"), cached.get("link", "")
+        except OSError:
+            pass
+        headers = {**GITHUB_HEADERS, "If-None-Match": cached.get("etag", "")}
+
+    parts = urllib.parse.urlsplit(url)
+    path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+    response = _github_request("GET", path, headers)
+    if response is None:
+        return None, ""
+    resp, body = response
+    if resp.status == 304 and cached:
+        # Not modified: no body and no rate-limit cost; restart the freshness window
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return cached.get("data"), cached.get("link", "")
+    link = resp.getheader("Link", "")
+    if resp.status != 200:
+        return None, link
+    try:
+        data = _json_loads(body)
+    except ValueError:
+        return None, link
+    etag = resp.getheader("ETag")
+    if etag and not NO_CACHE:
+        _write_cached(cache_path, {"etag": etag, "link": link, "data": data})
+    return data, link
+
+
+def github_api(url: str) -> dict | list | None:
     """Make a GitHub API request."""
+    return _github_get(url)[0]
+
+
+def _github_count(url: str) -> int | None:
+    """Count the items of a per_page=1 listing from its Link rel="last" page number."""
+    data, link = _github_get(url)
+    if not isinstance(data, list):
+        return None
+    m = LINK_LAST_RE.search(link)
+    return int(m.group(1)) if m else len(data)
+
+
+def _fetch_rest(repo: str) -> tuple[dict, list | None, int | None] | None:
+    """Fetch (repo data, oldest-updated open issues, open PR count) from the REST API."""
+    api = f"https://api.github.com/repos/{repo}"
+    repo_data = github_api(api)
+    if not repo_data or isinstance(repo_data, list):
+        return None
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        # The remaining calls are independent, so overlap their round-trips
+        issues_future = (
+            pool.submit(github_api, f"{api}/issues?state=open&sort=updated&direction=asc&per_page=5")
+            if repo_data.get("has_issues", True)
+            else None
+        )
+        pr_count_future = pool.submit(_github_count, f"{api}/pulls?state=open&per_page=1")
+        issues_data = issues_future.result() if issues_future else None
+        return repo_data, issues_data if isinstance(issues_data, list) else None, pr_count_future.result()
+
+
+def _fetch_graphql(repo: str, token: str) -> tuple[dict, list | None, int | None] | None:
+    """Fetch the same data as _fetch_rest with a single GraphQL query, mapped to REST field names."""
+    owner, name = repo.split("/", 1)
+    payload = json.dumps({"query": GITHUB_GRAPHQL_QUERY, "variables": {"owner": owner, "name": name}}).encode()
+    headers = {**GITHUB_HEADERS, "Authorization": f"bearer {token}", "Content-Type": "application/json"}
+    response = _github_request("POST", "/graphql", headers, payload)
+    if response is None or response[0].status != 200:
+        return None
     try:
-        req = urllib.request.Request(url, headers={"Accept": "application/vnd.github.v3+json"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            return json.loads(resp.read().decode())
-    except Exception:
+        data = (_json_loads(response[1]).get("data") or {}).get("repository")
+    except (AttributeError, ValueError):
         return None
+    if not isinstance(data, dict):
+        return None
+
+    issues = data.get("issues") or {}
+    pr_count = (data.get("pullRequests") or {}).get("totalCount", 0)
+    repo_data = {
+        "archived": data.get("isArchived", False),
+        "pushed_at": data.get("pushedAt") or "",
+        "stargazers_count": data.get("stargazerCount", 0),
+        "forks_count": data.get("forkCount", 0),
+        "has_issues": data.get("hasIssuesEnabled", True),
+        # REST's open_issues_count includes pull requests
+        "open_issues_count": issues.get("totalCount", 0) + pr_count,
+        "default_branch": (data.get("defaultBranchRef") or {}).get("name", ""),
+    }
+    issues_data = [{"updated_at": node.get("updatedAt", "")} for node in issues.get("nodes") or []]
+    return repo_data, issues_data if repo_data["has_issues"] else None, pr_count
 
 
 def check_github(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Check GitHub repository health indicators."""
     cat = CategoryResult(name="GitHub Health", icon="G")
-    results = cat.results
 
-    repo = _get_github_repo(plugin_path)
+    repo = get_github_repo(plugin_path)
     if not repo:
-        results.append(CheckResult("github_repo", Severity.INFO, "Not a GitHub repository (skipped)"))
+        cat.add(CheckResult("github_repo", Severity.INFO, "Not a GitHub repository (skipped)"))
         return cat
 
-    # Fetch repo metadata
-    repo_data = _github_api(f"https://api.github.com/repos/{repo}")
-    if not repo_data or isinstance(repo_data, list):
-        results.append(CheckResult("github_api", Severity.INFO, "Could not fetch GitHub repo data"))
+    # With a token, one GraphQL query replaces the REST round-trips
+    token = os.environ.get("GITHUB_TOKEN")
+    fetched = (_fetch_graphql(repo, token) if token else None) or _fetch_rest(repo)
+    if fetched is None:
+        cat.add(CheckResult("github_api", Severity.INFO, "Could not fetch GitHub repo data"))
         return cat
 
+    repo_data, issues_data, pr_count = fetched
+    now = datetime.now(timezone.utc)
+    _add_repo_results(cat, repo_data, issues_data, pr_count, now)
+    _add_pr_results(cat, pr_count)
+
+    # --- Default branch ---
+    default_branch = repo_data.get("default_branch", "")
+    if default_branch in ("main", "master", "develop", "dev"):
+        cat.add(CheckResult("default_branch", Severity.PASS, f"Default branch: {default_branch}"))
+    elif default_branch:
+        cat.add(CheckResult("default_branch", Severity.INFO, f"Default branch: {default_branch} (non-standard)"))
+
+    return cat
+
+
+def _add_repo_results(
+    cat: CategoryResult, repo_data: dict, issues_data: dict | list | None, pr_count: int | None, now: datetime
+) -> None:
+    """Add archive, activity, community and issue results."""
     # --- Archived check ---
     if repo_data.get("archived", False):
-        results.append(CheckResult("archived", Severity.ERROR, "Repository is archived (no longer maintained)"))
+        cat.add(CheckResult("archived", Severity.ERROR, "Repository is archived (no longer maintained)"))
     else:
-        results.append(CheckResult("archived", Severity.PASS, "Repository is not archived"))
+        cat.add(CheckResult("archived", Severity.PASS, "Repository is not archived"))
 
     # --- Last activity ---
     pushed_at = repo_data.get("pushed_at", "")
     if pushed_at:
         try:
-            pushed_dt = datetime.fromisoformat(pushed_at.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
+            pushed_dt = _parse_timestamp(pushed_at)
             days_ago = (now - pushed_dt).days
 
             if days_ago <= 90:
-                results.append(CheckResult("last_push", Severity.PASS, f"Last push: {days_ago} days ago (active)"))
+                cat.add(CheckResult("last_push", Severity.PASS, f"Last push: {days_ago} days ago (active)"))
             elif days_ago <= 365:
-                results.append(
-                    CheckResult("last_push", Severity.WARNING, f"Last push: {days_ago} days ago (may be stale)")
-                )
+                cat.add(CheckResult("last_push", Severity.WARNING, f"Last push: {days_ago} days ago (may be stale)"))
             else:
-                results.append(
+                cat.add(
                     CheckResult("last_push", Severity.ERROR, f"Last push: {days_ago} days ago (likely unmaintained)")
                 )
-        except Exception:
+        except (AttributeError, TypeError, ValueError):
             pass
 
     # --- Stars and forks (community health) ---
     stars = repo_data.get("stargazers_count", 0)
     forks = repo_data.get("forks_count", 0)
-    results.append(CheckResult("community", Severity.PASS, f"Stars: {stars}, Forks: {forks}"))
+    cat.add(CheckResult("community", Severity.PASS, f"Stars: {stars}, Forks: {forks}"))
 
     # --- Open issues ---
     has_issues = repo_data.get("has_issues", True)
     open_issues = repo_data.get("open_issues_count", 0)
+    if pr_count is not None:
+        # open_issues_count includes pull requests
+        open_issues = max(open_issues - pr_count, 0)
 
     if not has_issues:
-        results.append(CheckResult("issues_enabled", Severity.INFO, "Issues are disabled on this repository"))
+        cat.add(CheckResult("issues_enabled", Severity.INFO, "Issues are disabled on this repository"))
     else:
-        results.append(CheckResult("issues_enabled", Severity.PASS, "Issues are enabled"))
+        cat.add(CheckResult("issues_enabled", Severity.PASS, "Issues are enabled"))
 
         if open_issues == 0:
-            results.append(CheckResult("open_issues", Severity.PASS, "No open issues"))
+            cat.add(CheckResult("open_issues", Severity.PASS, "No open issues"))
         elif open_issues <= 20:
-            results.append(CheckResult("open_issues", Severity.PASS, f"{open_issues} open issues"))
+            cat.add(CheckResult("open_issues", Severity.PASS, f"{open_issues} open issues"))
         elif open_issues <= 50:
-            results.append(
-                CheckResult("open_issues", Severity.WARNING, f"{open_issues} open issues (consider triaging)")
-            )
+            cat.add(CheckResult("open_issues", Severity.WARNING, f"{open_issues} open issues (consider triaging)"))
         else:
-            results.append(
-                CheckResult("open_issues", Severity.WARNING, f"{open_issues} open issues (significant backlog)")
-            )
+            cat.add(CheckResult("open_issues", Severity.WARNING, f"{open_issues} open issues (significant backlog)"))
 
-        # Check for stale issues (fetch open issues sorted by updated)
-        issues_data = _github_api(
-            f"https://api.github.com/repos/{repo}/issues?state=open&sort=updated&direction=asc&per_page=5"
-        )
+        # Check for stale issues (open issues sorted by updated)
         if issues_data and isinstance(issues_data, list):
             # Filter out pull requests (GitHub API includes PRs in issues endpoint)
             real_issues = [i for i in issues_data if "pull_request" not in i]
@@ -120,11 +398,10 @@ def check_github(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                 oldest = real_issues[0]
                 updated_at = oldest.get("updated_at", "")
                 try:
-                    updated_dt = datetime.fromisoformat(updated_at.replace("Z", "+00:00"))
-                    now = datetime.now(timezone.utc)
+                    updated_dt = _parse_timestamp(updated_at)
                     stale_days = (now - updated_dt).days
                     if stale_days > 365:
-                        results.append(
+                        cat.add(
                             CheckResult(
                                 "stale_issues",
                                 Severity.WARNING,
@@ -132,7 +409,7 @@ def check_github(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                             )
                         )
                     elif stale_days > 180:
-                        results.append(
+                        cat.add(
                             CheckResult(
                                 "stale_issues",
                                 Severity.INFO,
@@ -140,41 +417,20 @@ def check_github(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                             )
                         )
                     else:
-                        results.append(CheckResult("stale_issues", Severity.PASS, "No significantly stale issues"))
-                except Exception:
+                        cat.add(CheckResult("stale_issues", Severity.PASS, "No significantly stale issues"))
+                except (AttributeError, TypeError, ValueError):
                     pass
 
-    # --- Open pull requests ---
-    prs_data = _github_api(f"https://api.github.com/repos/{repo}/pulls?state=open&per_page=1")
-    if prs_data is not None and isinstance(prs_data, list):
-        # We only fetched 1 per page, but the Link header would tell us total
-        # Use the issues_count minus issues-only count as an estimate
-        # Or just report what we know
-        if len(prs_data) == 0:
-            results.append(CheckResult("open_prs", Severity.PASS, "No open pull requests"))
-        else:
-            # Fetch count more accurately
-            prs_all = _github_api(f"https://api.github.com/repos/{repo}/pulls?state=open&per_page=100")
-            if prs_all and isinstance(prs_all, list):
-                pr_count = len(prs_all)
-                if pr_count <= 5:
-                    results.append(CheckResult("open_prs", Severity.PASS, f"{pr_count} open pull request(s)"))
-                elif pr_count <= 15:
-                    results.append(
-                        CheckResult("open_prs", Severity.WARNING, f"{pr_count} open pull requests (review backlog)")
-                    )
-                else:
-                    results.append(
-                        CheckResult(
-                            "open_prs", Severity.WARNING, f"{pr_count} open pull requests (significant backlog)"
-                        )
-                    )
-
-    # --- Default branch ---
-    default_branch = repo_data.get("default_branch", "")
-    if default_branch in ("main", "master", "develop", "dev"):
-        results.append(CheckResult("default_branch", Severity.PASS, f"Default branch: {default_branch}"))
-    elif default_branch:
-        results.append(CheckResult("default_branch", Severity.INFO, f"Default branch: {default_branch} (non-standard)"))
 
-    return cat
+def _add_pr_results(cat: CategoryResult, pr_count: int | None) -> None:
+    """Add open pull request results."""
+    if pr_count is None:
+        return
+    if pr_count == 0:
+        cat.add(CheckResult("open_prs", Severity.PASS, "No open pull requests"))
+    elif pr_count <= 5:
+        cat.add(CheckResult("open_prs", Severity.PASS, f"{pr_count} open pull request(s)"))
+    elif pr_count <= 15:
+        cat.add(CheckResult("open_prs", Severity.WARNING, f"{pr_count} open pull requests (review backlog)"))
+    else:
+        cat.add(CheckResult("open_prs", Severity.WARNING, f"{pr_count} open pull requests (significant backlog)"))
@@ -1,10 +1,22 @@
 """Run code linting tools (black, isort, flake8)."""
 
+import functools
 import os
+import re
 import subprocess
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
 
 from . import CategoryResult, CheckResult, Severity
 
+# Opt-in: skip black/isort/flake8 when ruff is installed and passes cleanly. Off by default, since ruff's
+# default rule set enforces neither isort (I) nor pycodestyle (E/W beyond E4/E7/E9)
+RUFF_ONLY = os.environ.get("NBAUDIT_RUFF_ONLY", "") not in ("", "0")
+
+# Summary lines, so counts don't depend on per-file or per-issue output
+REFORMAT_RE = re.compile(r"(\d+) files? would be reformatted")
+RUFF_FOUND_RE = re.compile(r"Found (\d+) errors?")
+
 
 def _run_tool(cmd: list[str], cwd: str) -> tuple[int, str]:
     """Run a tool and return (returncode, output)."""
@@ -18,6 +30,55 @@ def _run_tool(cmd: list[str], cwd: str) -> tuple[int, str]:
         return -2, f"{cmd[0]} timed out"
 
 
+def _start_tools(cmds: dict[str, list[str]], cwd: str) -> dict[str, Future]:
+    """Start tools in the background, each on its own thread so its pipes drain and its timeout runs from its start."""
+    executor = ThreadPoolExecutor(max_workers=max(1, len(cmds)))
+    started = {name: executor.submit(_run_tool, cmd, cwd) for name, cmd in cmds.items()}
+    executor.shutdown(wait=False)
+    return started
+
+
+def _collect_tools(started: dict[str, Future]) -> dict[str, tuple[int, str]]:
+    """Wait for started tools and return {name: (returncode, output)}."""
+    return {name: future.result() for name, future in started.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _isort_api():
+    """Import isort on first use (it is slow to import, and --skip-lint never needs it), or None if not installed."""
+    try:
+        import isort
+        import isort.exceptions
+        import isort.files
+        import isort.settings
+    except ImportError:
+        return None
+    return isort
+
+
+def _run_isort(plugin_path: str, pkg_dir: str) -> tuple[int, str]:
+    """Run the isort check in-process, returning output shaped like `isort --check-only`."""
+    isort = _isort_api()
+    # Resolve settings from the plugin, as `isort` would when run from its root
+    config = isort.settings.Config(settings_path=plugin_path, quiet=True)
+    errors = []
+    for path in isort.files.find([os.path.join(plugin_path, pkg_dir)], config, [], []):
+        try:
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            if isort.code(source, config=config, file_path=Path(path)) != source:
+                errors.append(f"ERROR: {path} Imports are incorrectly sorted and/or formatted.")
+        except (OSError, UnicodeDecodeError, isort.exceptions.ISortError):
+            continue
+    return (1 if errors else 0), "\n".join(errors)
+
+
+def _reformat_count(output: str) -> int:
+    """Number of files a formatter would reformat, from its summary line."""
+    m = REFORMAT_RE.search(output)
+    return int(m.group(1)) if m else output.lower().count("would reformat")
+
+
 def _check_ruff_available() -> bool:
     """Check if ruff is available."""
     try:
@@ -30,68 +91,103 @@ def _check_ruff_available() -> bool:
 def check_linting(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Run linting checks (ruff or black+isort+flake8)."""
     cat = CategoryResult(name="Linting", icon="Q")
-    results = cat.results
 
     if not pkg_dir:
-        results.append(CheckResult("package", Severity.ERROR, "No package directory to lint"))
+        cat.add(CheckResult("package", Severity.ERROR, "No package directory to lint"))
         return cat
 
     pkg_path = os.path.join(plugin_path, pkg_dir)
     if not os.path.isdir(pkg_path):
-        results.append(CheckResult("package", Severity.ERROR, f"Package directory not found: {pkg_dir}"))
+        cat.add(CheckResult("package", Severity.ERROR, f"Package directory not found: {pkg_dir}"))
         return cat
 
     # Try ruff first (modern alternative)
-    if _check_ruff_available():
+    has_ruff = _check_ruff_available()
+    ruff_cmds = {}
+    if has_ruff:
+        ruff_cmds["ruff_check"] = ["ruff", "check", "--output-format=concise", pkg_dir + "/"]
+        ruff_cmds["ruff_format"] = ["ruff", "format", "--check", pkg_dir + "/"]
+    # black+isort+flake8 are the standard for our plugins
+    legacy_cmds = {"black": ["python", "-m", "black", "--check", pkg_dir + "/"]}
+    has_isort_api = _isort_api() is not None
+    if not has_isort_api:
+        legacy_cmds["isort"] = ["python", "-m", "isort", "--check-only", pkg_dir + "/"]
+    legacy_cmds["flake8"] = [
+        "python",
+        "-m",
+        "flake8",
+        pkg_dir + "/",
+        "--max-line-length=120",
+        "--ignore=E501,W503,E203",
+    ]
+
+    results = {}
+    legacy_skipped = False
+    if has_ruff and RUFF_ONLY:
+        # The plugin's ruff config is trusted to stand in for the legacy tools, which only run when it reports problems
+        results = _collect_tools(_start_tools(ruff_cmds, plugin_path))
+        legacy_skipped = all(rc == 0 for rc, _ in results.values())
+        ruff_cmds = {}
+    if not legacy_skipped:
+        started = _start_tools({**ruff_cmds, **legacy_cmds}, plugin_path)
+        # isort has a side-effect-free API, so check it here (skipping an interpreter start) while the others run
+        isort_result = _run_isort(plugin_path, pkg_dir) if has_isort_api else None
+        results.update(_collect_tools(started))
+        if isort_result is not None:
+            results["isort"] = isort_result
+
+    if has_ruff:
         # Ruff check (linting)
-        rc, output = _run_tool(["ruff", "check", pkg_dir + "/"], plugin_path)
+        rc, output = results["ruff_check"]
+        if rc == 2:
+            # Releases without --output-format=concise exit with a usage error; rerun with their default output
+            rc, output = _run_tool(["ruff", "check", pkg_dir + "/"], plugin_path)
         if rc == 0:
-            results.append(CheckResult("ruff_check", Severity.PASS, "ruff check passed"))
+            cat.add(CheckResult("ruff_check", Severity.PASS, "ruff check passed"))
         else:
-            error_lines = [line for line in output.split("\n") if line.strip()]
-            count = len(error_lines)
-            results.append(CheckResult("ruff_check", Severity.WARNING, f"ruff found {count} issue(s)"))
+            m = RUFF_FOUND_RE.search(output)
+            count = int(m.group(1)) if m else len([line for line in output.split("\n") if line.strip()])
+            cat.add(CheckResult("ruff_check", Severity.WARNING, f"ruff found {count} issue(s)"))
 
         # Ruff format check
-        rc, output = _run_tool(["ruff", "format", "--check", pkg_dir + "/"], plugin_path)
+        rc, output = results["ruff_format"]
         if rc == 0:
-            results.append(CheckResult("ruff_format", Severity.PASS, "ruff format check passed"))
+            cat.add(CheckResult("ruff_format", Severity.PASS, "ruff format check passed"))
         else:
-            reformat_count = output.count("would reformat")
-            results.append(
-                CheckResult("ruff_format", Severity.WARNING, f"ruff would reformat {reformat_count} file(s)")
-            )
+            reformat_count = _reformat_count(output)
+            cat.add(CheckResult("ruff_format", Severity.WARNING, f"ruff would reformat {reformat_count} file(s)"))
+
+    if legacy_skipped:
+        for name in ("black", "isort", "flake8"):
+            cat.add(CheckResult(name, Severity.INFO, f"{name} skipped (NBAUDIT_RUFF_ONLY is set and ruff passed)"))
+        return cat
 
-    # Always run black+isort+flake8 (they are the standard for our plugins)
     # Black
-    rc, output = _run_tool(["python", "-m", "black", "--check", pkg_dir + "/"], plugin_path)
+    rc, output = results["black"]
     if rc == 0:
-        results.append(CheckResult("black", Severity.PASS, "black formatting check passed"))
+        cat.add(CheckResult("black", Severity.PASS, "black formatting check passed"))
     elif rc == -1:
-        results.append(CheckResult("black", Severity.INFO, "black not installed (skipped)"))
+        cat.add(CheckResult("black", Severity.INFO, "black not installed (skipped)"))
     else:
-        reformat_count = output.count("would reformat")
-        results.append(CheckResult("black", Severity.WARNING, f"black would reformat {reformat_count} file(s)"))
+        reformat_count = _reformat_count(output)
+        cat.add(CheckResult("black", Severity.WARNING, f"black would reformat {reformat_count} file(s)"))
 
     # isort
-    rc, output = _run_tool(["python", "-m", "isort", "--check-only", pkg_dir + "/"], plugin_path)
+    rc, output = results["isort"]
     if rc == 0:
-        results.append(CheckResult("isort", Severity.PASS, "isort import check passed"))
+        cat.add(CheckResult("isort", Severity.PASS, "isort import check passed"))
     elif rc == -1:
-        results.append(CheckResult("isort", Severity.INFO, "isort not installed (skipped)"))
+        cat.add(CheckResult("isort", Severity.INFO, "isort not installed (skipped)"))
     else:
         error_count = output.count("ERROR")
-        results.append(CheckResult("isort", Severity.WARNING, f"isort found {error_count} import ordering issue(s)"))
+        cat.add(CheckResult("isort", Severity.WARNING, f"isort found {error_count} import ordering issue(s)"))
 
     # flake8
-    rc, output = _run_tool(
-        ["python", "-m", "flake8", pkg_dir + "/", "--max-line-length=120", "--ignore=E501,W503,E203"],
-        plugin_path,
-    )
+    rc, output = results["flake8"]
     if rc == 0:
-        results.append(CheckResult("flake8", Severity.PASS, "flake8 lint check passed"))
+        cat.add(CheckResult("flake8", Severity.PASS, "flake8 lint check passed"))
     elif rc == -1:
-        results.append(CheckResult("flake8", Severity.INFO, "flake8 not installed (skipped)"))
+        cat.add(CheckResult("flake8", Severity.INFO, "flake8 not installed (skipped)"))
     else:
         error_lines = [line for line in output.split("\n") if line.strip()]
         count = len(error_lines)
@@ -99,6 +195,6 @@ def check_linting(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         msg = f"flake8 found {count} issue(s)"
         if first_errors:
             msg += ": " + "; ".join(first_errors)
-        results.append(CheckResult("flake8", Severity.WARNING, msg))
+        cat.add(CheckResult("flake8", Severity.WARNING, msg))
 
     return cat
@@ -1,105 +1,218 @@
 """Check package build and validation."""
 
+import functools
+import gzip
+import http.client
 import json
 import os
+import re
+import socket
 import subprocess
 import tempfile
-import urllib.error
-import urllib.request
+import threading
+import time
+import urllib.parse
+
+try:
+    import tomllib
+except ImportError:
+    try:
+        import tomli as tomllib  # type: ignore[no-redef]
+    except ImportError:
+        tomllib = None
+
+from . import (
+    CACHE_DIR,
+    NO_CACHE,
+    OFFLINE,
+    REDIRECT_STATUSES,
+    CategoryResult,
+    CheckResult,
+    PluginContext,
+    Severity,
+    https_connection,
+)
+
+PYPI_HOST = "pypi.org"
+# The project JSON embeds the full long description, so ask for it compressed
+PYPI_HEADERS = {"Accept": "application/json", "Accept-Encoding": "gzip", "User-Agent": "netbox-plugin-audit"}
+
+# The fields the check uses from PyPI's JSON, cached per project for PYPI_CACHE_TTL seconds
+PYPI_CACHE_DIR = os.path.join(CACHE_DIR, "pypi")
+PYPI_CACHE_TTL = int(os.environ.get("NBAUDIT_PYPI_CACHE_TTL", "3600"))
+
+# Overall limit for building the sdist and wheel, dependency installs included
+BUILD_TIMEOUT = 120
+
+# One kept-alive HTTPS connection per thread, reused by every PyPI lookup
+_local = threading.local()
 
-from . import CategoryResult, CheckResult, Severity
 
+def check_packaging(plugin_path: str, ctx: PluginContext | None = None) -> CategoryResult:
+    """Build package and validate with twine.
 
-def check_packaging(plugin_path: str) -> CategoryResult:
-    """Build package and validate with twine."""
+    If ``ctx`` is given, its parsed pyproject.toml is used for the PyPI lookup instead of re-reading the file.
+    """
     cat = CategoryResult(name="Packaging", icon="B")
-    results = cat.results
 
     has_pyproject = os.path.isfile(os.path.join(plugin_path, "pyproject.toml"))
     has_setup = os.path.isfile(os.path.join(plugin_path, "setup.py"))
     if not has_pyproject and not has_setup:
-        results.append(CheckResult("pyproject", Severity.ERROR, "No pyproject.toml or setup.py found, cannot build"))
+        cat.add(CheckResult("pyproject", Severity.ERROR, "No pyproject.toml or setup.py found, cannot build"))
         return cat
     if not has_pyproject:
-        results.append(CheckResult("pyproject", Severity.INFO, "Using setup.py (consider migrating to pyproject.toml)"))
+        cat.add(CheckResult("pyproject", Severity.INFO, "Using setup.py (consider migrating to pyproject.toml)"))
+
+    # The PyPI lookup doesn't depend on the build, so run it while the build subprocess works
+    pypi_cat = CategoryResult(name=cat.name, icon=cat.icon)
+    pyproject = ctx.pyproject if ctx is not None else _read_pyproject(plugin_path)
+    pypi_thread = threading.Thread(target=_check_pypi, args=(pyproject, pypi_cat), daemon=True)
+    pypi_thread.start()
 
     # Build in a temp directory
-    with tempfile.TemporaryDirectory() as tmpdir:
+    with tempfile.TemporaryDirectory(prefix="nbaudit_build_") as tmpdir:
         try:
+            # Output is kept as bytes and only decoded on the failure paths that report it
             result = subprocess.run(
                 ["python", "-m", "build", "--outdir", tmpdir],
                 cwd=plugin_path,
                 capture_output=True,
-                text=True,
-                timeout=120,
+                timeout=BUILD_TIMEOUT,
             )
-            if result.returncode == 0:
-                # Check what was built
-                built_files = os.listdir(tmpdir)
-                has_whl = any(f.endswith(".whl") for f in built_files)
-                has_tar = any(f.endswith(".tar.gz") for f in built_files)
-                results.append(CheckResult("build", Severity.PASS, f"Build succeeded: {', '.join(built_files)}"))
+            error = None if result.returncode == 0 else (result.stdout + result.stderr).decode(errors="replace")
+            if error is None:
+                # Check what was built, classifying artifacts in the same pass
+                built_files = []
+                has_whl = has_tar = False
+                with os.scandir(tmpdir) as it:
+                    for entry in it:
+                        built_files.append(entry.name)
+                        if entry.name.endswith(".whl"):
+                            has_whl = True
+                        elif entry.name.endswith(".tar.gz"):
+                            has_tar = True
+                cat.add(CheckResult("build", Severity.PASS, f"Build succeeded: {', '.join(built_files)}"))
 
                 if has_whl:
-                    results.append(CheckResult("wheel", Severity.PASS, "Wheel (.whl) built"))
+                    cat.add(CheckResult("wheel", Severity.PASS, "Wheel (.whl) built"))
                 else:
-                    results.append(CheckResult("wheel", Severity.WARNING, "No wheel (.whl) built"))
+                    cat.add(CheckResult("wheel", Severity.WARNING, "No wheel (.whl) built"))
 
                 if has_tar:
-                    results.append(CheckResult("sdist", Severity.PASS, "Source dist (.tar.gz) built"))
+                    cat.add(CheckResult("sdist", Severity.PASS, "Source dist (.tar.gz) built"))
                 else:
-                    results.append(CheckResult("sdist", Severity.INFO, "No source dist (.tar.gz) built"))
+                    cat.add(CheckResult("sdist", Severity.INFO, "No source dist (.tar.gz) built"))
 
                 # Twine check
                 try:
                     twine_result = subprocess.run(
                         ["python", "-m", "twine", "check"] + [os.path.join(tmpdir, f) for f in built_files],
                         capture_output=True,
-                        text=True,
                         timeout=30,
                     )
                     if twine_result.returncode == 0:
-                        results.append(CheckResult("twine", Severity.PASS, "twine check passed"))
+                        cat.add(CheckResult("twine", Severity.PASS, "twine check passed"))
                     else:
-                        output = (twine_result.stdout + twine_result.stderr).strip()
-                        results.append(CheckResult("twine", Severity.WARNING, f"twine check failed: {output[:200]}"))
+                        output = (twine_result.stdout + twine_result.stderr).decode(errors="replace").strip()
+                        cat.add(CheckResult("twine", Severity.WARNING, f"twine check failed: {output[:200]}"))
                 except FileNotFoundError:
-                    results.append(CheckResult("twine", Severity.INFO, "twine not installed (skipped)"))
+                    cat.add(CheckResult("twine", Severity.INFO, "twine not installed (skipped)"))
             else:
-                error = (result.stdout + result.stderr).strip()
+                error = error.strip()
                 # Truncate long error messages
                 if len(error) > 300:
                     error = error[:300] + "..."
-                results.append(CheckResult("build", Severity.ERROR, f"Build failed: {error}"))
+                cat.add(CheckResult("build", Severity.ERROR, f"Build failed: {error}"))
         except FileNotFoundError:
-            results.append(CheckResult("build", Severity.INFO, "python -m build not available (skipped)"))
+            cat.add(CheckResult("build", Severity.INFO, "python -m build not available (skipped)"))
         except subprocess.TimeoutExpired:
-            results.append(CheckResult("build", Severity.WARNING, "Build timed out (120s)"))
+            cat.add(CheckResult("build", Severity.WARNING, f"Build timed out ({BUILD_TIMEOUT}s)"))
 
     # --- PyPI presence check ---
-    _check_pypi(plugin_path, results)
+    pypi_thread.join()
+    for result in pypi_cat.results:
+        cat.add(result)
 
     return cat
 
 
-def _check_pypi(plugin_path: str, results: list) -> None:
-    """Check if the package exists on PyPI and compare versions."""
+@functools.lru_cache(maxsize=None)
+def _pypi_reachable() -> bool:
+    """Probe pypi.org once per process with a short connect, so offline runs don't sit out the request timeout.
+
+    Behind an HTTPS proxy the proxy itself is probed, since pypi.org is only reachable through it.
+    """
+    conn = https_connection(PYPI_HOST, timeout=1)
     try:
-        import tomllib
-    except ImportError:
+        socket.create_connection((conn.host, conn.port), timeout=1).close()
+    except OSError:
+        return False
+    return True
+
+
+def _pypi_send(path: str) -> tuple[http.client.HTTPResponse, bytes]:
+    """GET a pypi.org path over the shared keep-alive connection, returning (response, raw body)."""
+    conn = getattr(_local, "conn", None)
+    if conn is not None:
         try:
-            import tomli as tomllib  # type: ignore[no-redef]
-        except ImportError:
-            return
+            conn.request("GET", path, headers=PYPI_HEADERS)
+            resp = conn.getresponse()
+            return resp, resp.read()
+        except (http.client.HTTPException, OSError):
+            # The server may have dropped the idle connection; retry below on a fresh one
+            conn.close()
+    conn = _local.conn = https_connection(PYPI_HOST, timeout=10)
+    conn.request("GET", path, headers=PYPI_HEADERS)
+    resp = conn.getresponse()
+    return resp, resp.read()
 
-    pyproject_path = os.path.join(plugin_path, "pyproject.toml")
-    if not os.path.isfile(pyproject_path):
-        return
 
+def _pypi_request(path: str) -> tuple[http.client.HTTPResponse, bytes]:
+    """GET a pypi.org path, returning (response, decompressed body)."""
+    resp, body = _pypi_send(path)
+    if resp.getheader("Content-Encoding") == "gzip":
+        body = gzip.decompress(body)
+    return resp, body
+
+
+def _read_pypi_cache(cache_path: str) -> dict | None:
+    """Return cached PyPI project info if it is younger than PYPI_CACHE_TTL (or at any age when offline)."""
+    try:
+        if not OFFLINE and time.time() - os.path.getmtime(cache_path) >= PYPI_CACHE_TTL:
+            return None
+        with open(cache_path, encoding="utf-8") as f:
+            info = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return info if isinstance(info, dict) else None
+
+
+def _write_pypi_cache(cache_path: str, info: dict) -> None:
+    """Atomically store PyPI project info."""
+    tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}"
+    try:
+        os.makedirs(PYPI_CACHE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(info, f)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
+
+def _read_pyproject(plugin_path: str) -> dict | None:
+    """Parse pyproject.toml, or None if it is missing or unreadable."""
+    if tomllib is None:
+        return None
     try:
-        with open(pyproject_path, "rb") as f:
-            data = tomllib.load(f)
-    except Exception:
+        with open(os.path.join(plugin_path, "pyproject.toml"), "rb") as f:
+            return tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError):
+        return None
+
+
+def _check_pypi(data: dict | None, cat: CategoryResult) -> None:
+    """Check if the package exists on PyPI and compare versions."""
+    if not data:
         return
 
     pkg_name = data.get("project", {}).get("name", "")
@@ -108,23 +221,40 @@ def _check_pypi(plugin_path: str, results: list) -> None:
 
     local_version = data.get("project", {}).get("version", "")
 
+    # Keyed by the normalized project name, which is also filesystem-safe
+    cache_path = os.path.join(PYPI_CACHE_DIR, re.sub(r"[^A-Za-z0-9]+", "-", pkg_name).lower() + ".json")
     try:
-        url = f"https://pypi.org/pypi/{pkg_name}/json"
-        req = urllib.request.Request(url, headers={"Accept": "application/json"})
-        with urllib.request.urlopen(req, timeout=10) as resp:
-            pypi_data = json.loads(resp.read().decode())
+        info = None if NO_CACHE else _read_pypi_cache(cache_path)
+        if info is None:
+            if OFFLINE or not _pypi_reachable():
+                cat.add(CheckResult("pypi_exists", Severity.INFO, "PyPI not reachable (offline), skipped"))
+                return
+            resp, body = _pypi_request(f"/pypi/{pkg_name}/json")
+            if resp.status in REDIRECT_STATUSES:
+                # Non-normalized names redirect to the canonical project URL
+                location = urllib.parse.urlsplit(resp.getheader("Location", ""))
+                if location.hostname in (None, PYPI_HOST):
+                    resp, body = _pypi_request(location.path)
+            if resp.status == 404:
+                cat.add(CheckResult("pypi_exists", Severity.INFO, f"{pkg_name} not found on PyPI (not yet published?)"))
+                return
+            if resp.status != 200:
+                cat.add(CheckResult("pypi_exists", Severity.INFO, f"Could not check PyPI: HTTP {resp.status}"))
+                return
+            pypi_info = json.loads(body).get("info", {})
+            info = {"version": pypi_info.get("version", ""), "project_urls": pypi_info.get("project_urls")}
+            if not NO_CACHE:
+                _write_pypi_cache(cache_path, info)
 
-        pypi_version = pypi_data.get("info", {}).get("version", "")
-        results.append(CheckResult("pypi_exists", Severity.PASS, f"{pkg_name} found on PyPI (latest: {pypi_version})"))
+        pypi_version = info.get("version", "")
+        cat.add(CheckResult("pypi_exists", Severity.PASS, f"{pkg_name} found on PyPI (latest: {pypi_version})"))
 
         # Compare versions
         if local_version and pypi_version:
             if local_version == pypi_version:
-                results.append(
-                    CheckResult("pypi_version", Severity.PASS, f"Local version matches PyPI ({local_version})")
-                )
+                cat.add(CheckResult("pypi_version", Severity.PASS, f"Local version matches PyPI ({local_version})"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "pypi_version",
                         Severity.INFO,
@@ -133,20 +263,13 @@ def _check_pypi(plugin_path: str, results: list) -> None:
                 )
 
         # Check for project URLs on PyPI
-        project_urls = pypi_data.get("info", {}).get("project_urls") or {}
+        project_urls = info.get("project_urls") or {}
         if project_urls:
-            results.append(
+            cat.add(
                 CheckResult("pypi_project_urls", Severity.PASS, f"PyPI project URLs: {', '.join(project_urls.keys())}")
             )
         else:
-            results.append(CheckResult("pypi_project_urls", Severity.WARNING, "No project URLs on PyPI listing"))
+            cat.add(CheckResult("pypi_project_urls", Severity.WARNING, "No project URLs on PyPI listing"))
 
-    except urllib.error.HTTPError as e:
-        if e.code == 404:
-            results.append(
-                CheckResult("pypi_exists", Severity.INFO, f"{pkg_name} not found on PyPI (not yet published?)")
-            )
-        else:
-            results.append(CheckResult("pypi_exists", Severity.INFO, f"Could not check PyPI: HTTP {e.code}"))
     except Exception as e:
-        results.append(CheckResult("pypi_exists", Severity.INFO, f"Could not check PyPI: {e}"))
+        cat.add(CheckResult("pypi_exists", Severity.INFO, f"Could not check PyPI: {e}"))
@@ -4,7 +4,10 @@ import ast
 import os
 import re
 
-from . import CategoryResult, CheckResult, Severity
+from . import WIDGET_CLASS_RE, CategoryResult, CheckResult, Severity, module_level_statements
+
+EMAIL_RE = re.compile(r"^[^@]+@[^@]+\.[^@]+$")
+BASE_URL_RE = re.compile(r"^[a-z0-9-]+$")
 
 
 def _extract_string_value(node):
@@ -14,23 +17,16 @@ def _extract_string_value(node):
     return None
 
 
-def _extract_assignments(tree):
-    """Extract top-level assignments from AST."""
-    assignments = {}
-    for node in ast.walk(tree):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    val = _extract_string_value(node.value)
-                    if val is not None:
-                        assignments[target.id] = val
-    return assignments
-
+def _scan_module(tree):
+    """Collect everything check_pluginconfig needs from a module in one pass.
 
-def _find_pluginconfig_class(tree):
-    """Find class that inherits from PluginConfig."""
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, ast.ClassDef):
+    Returns (PluginConfig subclass node, `config = X` name, string assignments, whether
+    __version__ is imported from a version module).
+    """
+    config_class = None
+    config_name = None
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef) and config_class is None:
             for base in node.bases:
                 base_name = None
                 if isinstance(base, ast.Name):
@@ -38,8 +34,29 @@ def _find_pluginconfig_class(tree):
                 elif isinstance(base, ast.Attribute):
                     base_name = base.attr
                 if base_name == "PluginConfig":
-                    return node
-    return None
+                    config_class = node
+                    break
+        elif isinstance(node, ast.Assign) and config_name is None:
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == "config" and isinstance(node.value, ast.Name):
+                    config_name = node.value.id
+                    break
+
+    # String assignments and the version import may be nested (e.g. in try/except), but never need
+    # a visit to function or class bodies
+    assignments = {}
+    has_version_import = False
+    for node in module_level_statements(tree.body):
+        if isinstance(node, ast.Assign):
+            val = _extract_string_value(node.value)
+            if val is not None:
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        assignments[target.id] = val
+        elif isinstance(node, ast.ImportFrom) and node.module == "version":
+            if any(alias.name == "__version__" for alias in node.names):
+                has_version_import = True
+    return config_class, config_name, assignments, has_version_import
 
 
 def _is_importlib_metadata_version(node):
@@ -77,53 +94,69 @@ def _get_class_attributes(class_node):
     return attrs
 
 
-def _find_config_assignment(tree):
-    """Find `config = ClassName` assignment."""
-    for node in ast.iter_child_nodes(tree):
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name) and target.id == "config":
-                    if isinstance(node.value, ast.Name):
-                        return node.value.id
-    return None
+def _has_widget_classes(widgets_path: str) -> bool:
+    """Check if widgets.py defines any *Widget subclasses."""
+    try:
+        with open(widgets_path) as f:
+            source = f.read()
+        if not WIDGET_CLASS_RE.search(source):
+            return False
+        # Confirm with the AST to rule out matches inside strings
+        for node in ast.iter_child_nodes(ast.parse(source)):
+            if isinstance(node, ast.ClassDef):
+                for base in node.bases:
+                    bname = None
+                    if isinstance(base, ast.Name):
+                        bname = base.id
+                    elif isinstance(base, ast.Attribute):
+                        bname = base.attr
+                    if bname and "Widget" in bname:
+                        return True
+    except (OSError, SyntaxError, ValueError):
+        pass
+    return False
 
 
 def check_pluginconfig(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Validate PluginConfig class attributes."""
     cat = CategoryResult(name="PluginConfig", icon="C")
-    results = cat.results
 
     if not pkg_dir:
-        results.append(CheckResult("package", Severity.ERROR, "No package directory to check"))
+        cat.add(CheckResult("package", Severity.ERROR, "No package directory to check"))
         return cat
 
     init_path = os.path.join(plugin_path, pkg_dir, "__init__.py")
     if not os.path.isfile(init_path):
-        results.append(CheckResult("init_py", Severity.ERROR, "__init__.py not found"))
+        cat.add(CheckResult("init_py", Severity.ERROR, "__init__.py not found"))
         return cat
 
     try:
-        with open(init_path) as f:
+        # Parsed from bytes so the compiler decodes it directly (honouring any coding declaration)
+        with open(init_path, "rb") as f:
             source = f.read()
+        # The AST finds the class; a source that never mentions PluginConfig can't have one, so skip the parse
+        if b"PluginConfig" not in source:
+            cat.add(CheckResult("pluginconfig_class", Severity.ERROR, "No PluginConfig subclass found"))
+            return cat
         tree = ast.parse(source)
-    except SyntaxError as e:
-        results.append(CheckResult("parse", Severity.ERROR, f"Syntax error in __init__.py: {e}"))
+    except (SyntaxError, ValueError) as e:
+        cat.add(CheckResult("parse", Severity.ERROR, f"Syntax error in __init__.py: {e}"))
         return cat
 
+    config_class, config_name, top_assignments, has_version_import = _scan_module(tree)
+
     # Find PluginConfig subclass
-    config_class = _find_pluginconfig_class(tree)
     if not config_class:
-        results.append(CheckResult("pluginconfig_class", Severity.ERROR, "No PluginConfig subclass found"))
+        cat.add(CheckResult("pluginconfig_class", Severity.ERROR, "No PluginConfig subclass found"))
         return cat
-    results.append(CheckResult("pluginconfig_class", Severity.PASS, f"PluginConfig subclass: {config_class.name}"))
+    cat.add(CheckResult("pluginconfig_class", Severity.PASS, f"PluginConfig subclass: {config_class.name}"))
 
     # Check config assignment
-    config_name = _find_config_assignment(tree)
     if config_name:
         if config_name == config_class.name:
-            results.append(CheckResult("config_assignment", Severity.PASS, f"config = {config_name}"))
+            cat.add(CheckResult("config_assignment", Severity.PASS, f"config = {config_name}"))
         else:
-            results.append(
+            cat.add(
                 CheckResult(
                     "config_assignment",
                     Severity.WARNING,
@@ -131,11 +164,10 @@ def check_pluginconfig(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                 )
             )
     else:
-        results.append(CheckResult("config_assignment", Severity.ERROR, "No `config = ClassName` assignment found"))
+        cat.add(CheckResult("config_assignment", Severity.ERROR, "No `config = ClassName` assignment found"))
 
     # Get class attributes
     attrs = _get_class_attributes(config_class)
-    top_assignments = _extract_assignments(tree)
 
     # Required attributes (ERROR if missing)
     required = ["name", "verbose_name", "description", "version", "base_url", "min_version"]
@@ -143,64 +175,60 @@ def check_pluginconfig(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         if attr in attrs:
             val = attrs[attr]
             if val == "__dynamic_version__":
-                results.append(CheckResult(attr, Severity.PASS, f"{attr} set (via importlib.metadata)"))
+                cat.add(CheckResult(attr, Severity.PASS, f"{attr} set (via importlib.metadata)"))
             elif val.startswith("__ref__"):
-                results.append(CheckResult(attr, Severity.PASS, f"{attr} set (references {val[7:]})"))
+                cat.add(CheckResult(attr, Severity.PASS, f"{attr} set (references {val[7:]})"))
             else:
                 display = val[:60] + "..." if len(val) > 60 else val
-                results.append(CheckResult(attr, Severity.PASS, f'{attr} = "{display}"'))
+                cat.add(CheckResult(attr, Severity.PASS, f'{attr} = "{display}"'))
         else:
-            results.append(CheckResult(attr, Severity.ERROR, f"{attr} not set"))
+            cat.add(CheckResult(attr, Severity.ERROR, f"{attr} not set"))
 
     # Recommended attributes (WARNING if missing — may be in pyproject.toml instead)
     for attr in ["author", "author_email"]:
         if attr in attrs:
             val = attrs[attr]
             if val.startswith("__ref__"):
-                results.append(CheckResult(attr, Severity.PASS, f"{attr} set (references {val[7:]})"))
+                cat.add(CheckResult(attr, Severity.PASS, f"{attr} set (references {val[7:]})"))
             else:
                 display = val[:60] + "..." if len(val) > 60 else val
-                results.append(CheckResult(attr, Severity.PASS, f'{attr} = "{display}"'))
+                cat.add(CheckResult(attr, Severity.PASS, f'{attr} = "{display}"'))
         else:
-            results.append(CheckResult(attr, Severity.WARNING, f"{attr} not set in PluginConfig"))
+            cat.add(CheckResult(attr, Severity.WARNING, f"{attr} not set in PluginConfig"))
 
     # Recommended attributes
     if "max_version" in attrs:
-        results.append(CheckResult("max_version", Severity.PASS, f'max_version = "{attrs["max_version"]}"'))
+        cat.add(CheckResult("max_version", Severity.PASS, f'max_version = "{attrs["max_version"]}"'))
     else:
-        results.append(CheckResult("max_version", Severity.WARNING, "max_version not set"))
+        cat.add(CheckResult("max_version", Severity.WARNING, "max_version not set"))
 
     if "default_settings" in attrs:
-        results.append(CheckResult("default_settings", Severity.PASS, "default_settings defined"))
+        cat.add(CheckResult("default_settings", Severity.PASS, "default_settings defined"))
     else:
-        results.append(CheckResult("default_settings", Severity.INFO, "default_settings not defined"))
+        cat.add(CheckResult("default_settings", Severity.INFO, "default_settings not defined"))
 
     # Validate name matches directory
     if "name" in attrs and not attrs["name"].startswith("__ref__"):
         if attrs["name"] == pkg_dir:
-            results.append(CheckResult("name_match", Severity.PASS, "name matches package directory"))
+            cat.add(CheckResult("name_match", Severity.PASS, "name matches package directory"))
         else:
-            results.append(
-                CheckResult("name_match", Severity.WARNING, f'name "{attrs["name"]}" != directory "{pkg_dir}"')
-            )
+            cat.add(CheckResult("name_match", Severity.WARNING, f'name "{attrs["name"]}" != directory "{pkg_dir}"'))
 
     # Validate author_email format
     if "author_email" in attrs and not attrs["author_email"].startswith("__ref__"):
         email = attrs["author_email"]
-        if re.match(r"^[^@]+@[^@]+\.[^@]+$", email):
-            results.append(CheckResult("email_format", Severity.PASS, f"Valid email: {email}"))
+        if EMAIL_RE.match(email):
+            cat.add(CheckResult("email_format", Severity.PASS, f"Valid email: {email}"))
         else:
-            results.append(CheckResult("email_format", Severity.WARNING, f"Invalid email format: {email}"))
+            cat.add(CheckResult("email_format", Severity.WARNING, f"Invalid email format: {email}"))
 
     # Validate base_url is URL-safe
     if "base_url" in attrs and not attrs["base_url"].startswith("__ref__"):
         base_url = attrs["base_url"]
-        if re.match(r"^[a-z0-9-]+$", base_url):
-            results.append(CheckResult("base_url_format", Severity.PASS, f"URL-safe base_url: {base_url}"))
+        if BASE_URL_RE.match(base_url):
+            cat.add(CheckResult("base_url_format", Severity.PASS, f"URL-safe base_url: {base_url}"))
         else:
-            results.append(
-                CheckResult("base_url_format", Severity.WARNING, f"base_url may not be URL-safe: {base_url}")
-            )
+            cat.add(CheckResult("base_url_format", Severity.WARNING, f"base_url may not be URL-safe: {base_url}"))
 
     # Validate min_version
     if "min_version" in attrs and not attrs["min_version"].startswith("__ref__"):
@@ -208,9 +236,9 @@ def check_pluginconfig(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         try:
             major = int(min_ver.split(".")[0])
             if major >= 4:
-                results.append(CheckResult("min_version_value", Severity.PASS, f"min_version {min_ver} >= 4.0.0"))
+                cat.add(CheckResult("min_version_value", Severity.PASS, f"min_version {min_ver} >= 4.0.0"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "min_version_value", Severity.WARNING, f"min_version {min_ver} < 4.0.0 (consider 4.0.0+)"
                     )
@@ -220,72 +248,44 @@ def check_pluginconfig(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
 
     # Check ready() method for widget import (only if widgets.py exists with widget classes)
     widgets_path = os.path.join(plugin_path, pkg_dir, "widgets.py")
-    if os.path.isfile(widgets_path):
-        # Quick check: does widgets.py contain DashboardWidget subclasses?
-        has_widget_classes = False
-        try:
-            with open(widgets_path) as f:
-                widgets_tree = ast.parse(f.read())
-            for wnode in ast.iter_child_nodes(widgets_tree):
-                if isinstance(wnode, ast.ClassDef):
-                    for base in wnode.bases:
-                        bname = None
-                        if isinstance(base, ast.Name):
-                            bname = base.id
-                        elif isinstance(base, ast.Attribute):
-                            bname = base.attr
-                        if bname and "Widget" in bname:
-                            has_widget_classes = True
-                            break
-                if has_widget_classes:
-                    break
-        except Exception:
-            pass
-
-        if has_widget_classes:
-            # Check if ready() imports widgets
-            ready_imports_widgets = False
-            for node in config_class.body:
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "ready":
-                    for child in ast.walk(node):
-                        if isinstance(child, ast.ImportFrom):
-                            # `from .widgets import ...` or `from . import widgets`
-                            if child.module and "widgets" in child.module:
-                                ready_imports_widgets = True
-                            elif child.module is None:
-                                for alias in child.names:
-                                    if alias.name == "widgets":
-                                        ready_imports_widgets = True
-                        elif isinstance(child, ast.Import):
+    # Quick check: does widgets.py contain DashboardWidget subclasses?
+    if os.path.isfile(widgets_path) and _has_widget_classes(widgets_path):
+        # Check if ready() imports widgets
+        ready_imports_widgets = False
+        for node in config_class.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == "ready":
+                for child in ast.walk(node):
+                    if isinstance(child, ast.ImportFrom):
+                        # `from .widgets import ...` or `from . import widgets`
+                        if child.module and "widgets" in child.module:
+                            ready_imports_widgets = True
+                        elif child.module is None:
                             for alias in child.names:
-                                if "widgets" in alias.name:
+                                if alias.name == "widgets":
                                     ready_imports_widgets = True
-            if ready_imports_widgets:
-                results.append(CheckResult("ready_widgets", Severity.PASS, "ready() imports widgets module"))
-            else:
-                results.append(
-                    CheckResult(
-                        "ready_widgets",
-                        Severity.WARNING,
-                        "widgets.py has widget classes but ready() doesn't import widgets (widgets won't register)",
-                    )
+                    elif isinstance(child, ast.Import):
+                        for alias in child.names:
+                            if "widgets" in alias.name:
+                                ready_imports_widgets = True
+        if ready_imports_widgets:
+            cat.add(CheckResult("ready_widgets", Severity.PASS, "ready() imports widgets module"))
+        else:
+            cat.add(
+                CheckResult(
+                    "ready_widgets",
+                    Severity.WARNING,
+                    "widgets.py has widget classes but ready() doesn't import widgets (widgets won't register)",
                 )
+            )
 
     # Check __version__ or importlib.metadata at module level
-    has_version_import = False
-    for node in ast.walk(tree):
-        if isinstance(node, ast.ImportFrom) and node.module == "version":
-            for alias in node.names:
-                if alias.name == "__version__":
-                    has_version_import = True
-
     if "__version__" in top_assignments:
-        results.append(CheckResult("__version__", Severity.PASS, f'__version__ = "{top_assignments["__version__"]}"'))
+        cat.add(CheckResult("__version__", Severity.PASS, f'__version__ = "{top_assignments["__version__"]}"'))
     elif has_version_import:
-        results.append(CheckResult("__version__", Severity.PASS, "__version__ imported from .version module"))
+        cat.add(CheckResult("__version__", Severity.PASS, "__version__ imported from .version module"))
     elif "version" in attrs and attrs["version"] == "__dynamic_version__":
-        results.append(CheckResult("__version__", Severity.PASS, "Version via importlib.metadata (modern pattern)"))
+        cat.add(CheckResult("__version__", Severity.PASS, "Version via importlib.metadata (modern pattern)"))
     else:
-        results.append(CheckResult("__version__", Severity.WARNING, "__version__ not found at module level"))
+        cat.add(CheckResult("__version__", Severity.WARNING, "__version__ not found at module level"))
 
     return cat
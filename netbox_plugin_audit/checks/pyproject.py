@@ -7,138 +7,153 @@ try:
 except ImportError:
     import tomli as tomllib  # type: ignore[no-redef]
 
-from . import CategoryResult, CheckResult, Severity
-
-
-def check_pyproject(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
-    """Validate pyproject.toml structure and content."""
+from . import CategoryResult, CheckResult, PluginContext, Severity
+
+# [project] fields and the severity reported when each is missing (required, then recommended)
+PROJECT_FIELDS = (
+    ("name", Severity.ERROR),
+    ("version", Severity.ERROR),
+    ("description", Severity.ERROR),
+    ("readme", Severity.ERROR),
+    ("requires-python", Severity.ERROR),
+    ("authors", Severity.ERROR),
+    ("license", Severity.WARNING),
+    ("classifiers", Severity.WARNING),
+    ("keywords", Severity.WARNING),
+    ("dependencies", Severity.WARNING),
+)
+
+# Lint tools looked for in the dev dependencies (ruff stands in for the other three)
+DEV_TOOLS = ("ruff", "black", "flake8", "isort")
+
+# Expected [project.urls] entries and the common aliases accepted for each
+PROJECT_URLS = (
+    ("Homepage", ("Homepage", "Home", "Home-page")),
+    ("Repository", ("Repository", "Source", "Source Code", "Code", "GitHub")),
+    ("Issues", ("Issues", "Bug Tracker", "Tracker", "Bug Reports")),
+    ("Documentation", ("Documentation", "Docs", "Documentation URL")),
+    ("Changelog", ("Changelog", "Changes", "Release Notes", "History", "What's New")),
+)
+
+
+def check_pyproject(plugin_path: str, pkg_dir: str | None, ctx: PluginContext | None = None) -> CategoryResult:
+    """Validate pyproject.toml structure and content.
+
+    If ``ctx`` holds the parsed pyproject.toml it is used instead of re-reading the file.
+    """
     cat = CategoryResult(name="pyproject.toml", icon="P")
-    results = cat.results
 
     toml_path = os.path.join(plugin_path, "pyproject.toml")
     if not os.path.isfile(toml_path):
         setup_path = os.path.join(plugin_path, "setup.py")
         if os.path.isfile(setup_path):
-            results.append(
+            cat.add(
                 CheckResult(
                     "exists", Severity.WARNING, "pyproject.toml not found (setup.py exists — consider migrating)"
                 )
             )
         else:
-            results.append(CheckResult("exists", Severity.ERROR, "pyproject.toml not found"))
+            cat.add(CheckResult("exists", Severity.ERROR, "pyproject.toml not found"))
         return cat
 
-    try:
-        with open(toml_path, "rb") as f:
-            data = tomllib.load(f)
-    except Exception as e:
-        results.append(CheckResult("parse", Severity.ERROR, f"Failed to parse pyproject.toml: {e}"))
-        return cat
+    if ctx is not None and ctx.pyproject is not None:
+        data = ctx.pyproject
+    else:
+        try:
+            with open(toml_path, "rb") as f:
+                data = tomllib.load(f)
+        except Exception as e:
+            cat.add(CheckResult("parse", Severity.ERROR, f"Failed to parse pyproject.toml: {e}"))
+            return cat
 
     # Build system
     bs = data.get("build-system", {})
     if bs:
         requires = bs.get("requires", [])
         if any("setuptools" in r for r in requires):
-            results.append(CheckResult("build_system", Severity.PASS, "setuptools build system configured"))
+            cat.add(CheckResult("build_system", Severity.PASS, "setuptools build system configured"))
         else:
-            results.append(CheckResult("build_system", Severity.WARNING, "Build system doesn't use setuptools"))
+            cat.add(CheckResult("build_system", Severity.WARNING, "Build system doesn't use setuptools"))
     else:
-        results.append(CheckResult("build_system", Severity.ERROR, "[build-system] section missing"))
+        cat.add(CheckResult("build_system", Severity.ERROR, "[build-system] section missing"))
 
     # Project metadata
     project = data.get("project", {})
     if not project:
-        results.append(CheckResult("project", Severity.ERROR, "[project] section missing"))
+        cat.add(CheckResult("project", Severity.ERROR, "[project] section missing"))
         return cat
 
-    # Required fields
-    required_fields = ["name", "version", "description", "readme", "requires-python", "authors"]
-    for field_name in required_fields:
+    # Required and recommended fields
+    for field_name, missing_severity in PROJECT_FIELDS:
         if field_name in project:
-            results.append(CheckResult(f"project_{field_name}", Severity.PASS, f"project.{field_name} set"))
+            cat.add(CheckResult(f"project_{field_name}", Severity.PASS, f"project.{field_name} set"))
         else:
-            results.append(CheckResult(f"project_{field_name}", Severity.ERROR, f"project.{field_name} missing"))
-
-    # Optional but recommended
-    for field_name in ["license", "classifiers", "keywords", "dependencies"]:
-        if field_name in project:
-            results.append(CheckResult(f"project_{field_name}", Severity.PASS, f"project.{field_name} set"))
-        else:
-            results.append(CheckResult(f"project_{field_name}", Severity.WARNING, f"project.{field_name} missing"))
+            cat.add(CheckResult(f"project_{field_name}", missing_severity, f"project.{field_name} missing"))
 
     # License check
     license_val = project.get("license", {})
     if isinstance(license_val, dict) and "Apache" in license_val.get("text", ""):
-        results.append(CheckResult("license_type", Severity.PASS, "License is Apache-2.0"))
+        cat.add(CheckResult("license_type", Severity.PASS, "License is Apache-2.0"))
     elif isinstance(license_val, str) and "Apache" in license_val:
-        results.append(CheckResult("license_type", Severity.PASS, "License is Apache-2.0"))
+        cat.add(CheckResult("license_type", Severity.PASS, "License is Apache-2.0"))
     elif license_val:
-        results.append(CheckResult("license_type", Severity.INFO, f"License: {license_val}"))
+        cat.add(CheckResult("license_type", Severity.INFO, f"License: {license_val}"))
 
     # requires-python check
     req_python = project.get("requires-python", "")
     if "3.10" in req_python or "3.11" in req_python or "3.12" in req_python:
-        results.append(CheckResult("python_version", Severity.PASS, f"requires-python: {req_python}"))
+        cat.add(CheckResult("python_version", Severity.PASS, f"requires-python: {req_python}"))
     elif req_python:
-        results.append(
-            CheckResult("python_version", Severity.WARNING, f"requires-python: {req_python} (expected >=3.10)")
-        )
+        cat.add(CheckResult("python_version", Severity.WARNING, f"requires-python: {req_python} (expected >=3.10)"))
 
     # Classifiers
     classifiers = project.get("classifiers", [])
-    has_django = any("Django" in c for c in classifiers)
-    has_py3 = any("Python :: 3" in c for c in classifiers)
+    has_django = has_py3 = False
+    for c in classifiers:
+        has_django = has_django or "Django" in c
+        has_py3 = has_py3 or "Python :: 3" in c
+        if has_django and has_py3:
+            break
     if has_django:
-        results.append(CheckResult("classifier_django", Severity.PASS, "Framework :: Django classifier present"))
+        cat.add(CheckResult("classifier_django", Severity.PASS, "Framework :: Django classifier present"))
     else:
-        results.append(CheckResult("classifier_django", Severity.WARNING, "Missing Framework :: Django classifier"))
+        cat.add(CheckResult("classifier_django", Severity.WARNING, "Missing Framework :: Django classifier"))
     if has_py3:
-        results.append(CheckResult("classifier_python", Severity.PASS, "Python 3 classifiers present"))
+        cat.add(CheckResult("classifier_python", Severity.PASS, "Python 3 classifiers present"))
     else:
-        results.append(CheckResult("classifier_python", Severity.WARNING, "Missing Python 3 classifiers"))
+        cat.add(CheckResult("classifier_python", Severity.WARNING, "Missing Python 3 classifiers"))
 
     # Project URLs (accept common aliases)
     urls = project.get("urls", data.get("project", {}).get("urls", {}))
-    url_checks = {
-        "Homepage": ["Homepage", "Home", "Home-page"],
-        "Repository": ["Repository", "Source", "Source Code", "Code", "GitHub"],
-        "Issues": ["Issues", "Bug Tracker", "Tracker", "Bug Reports"],
-        "Documentation": ["Documentation", "Docs", "Documentation URL"],
-        "Changelog": ["Changelog", "Changes", "Release Notes", "History", "What's New"],
-    }
-    for url_name, aliases in url_checks.items():
-        found = None
-        for alias in aliases:
-            if alias in urls:
-                found = alias
-                break
+    for url_name, aliases in PROJECT_URLS:
+        found = next((alias for alias in aliases if alias in urls), None)
         if found:
             label = f"{url_name} URL set" if found == url_name else f"{url_name} URL set (as '{found}')"
-            results.append(CheckResult(f"url_{url_name.lower()}", Severity.PASS, label))
+            cat.add(CheckResult(f"url_{url_name.lower()}", Severity.PASS, label))
         else:
-            results.append(CheckResult(f"url_{url_name.lower()}", Severity.WARNING, f"{url_name} URL missing"))
+            cat.add(CheckResult(f"url_{url_name.lower()}", Severity.WARNING, f"{url_name} URL missing"))
 
     # Dev dependencies
     opt_deps = project.get("optional-dependencies", data.get("project", {}).get("optional-dependencies", {}))
     dev_deps = opt_deps.get("dev", [])
-    has_ruff_dep = any("ruff" in d for d in dev_deps) if dev_deps else False
 
     if dev_deps:
         dev_str = ", ".join(dev_deps)
-        results.append(CheckResult("dev_deps", Severity.PASS, f"Dev dependencies: {dev_str}"))
-        if has_ruff_dep:
-            results.append(CheckResult("dev_ruff", Severity.PASS, "ruff in dev dependencies (modern alternative)"))
+        cat.add(CheckResult("dev_deps", Severity.PASS, f"Dev dependencies: {dev_str}"))
+        # Which lint tools appear in the dev dependencies, found in one pass over them
+        dev_tools = {tool for d in dev_deps for tool in DEV_TOOLS if tool in d}
+        if "ruff" in dev_tools:
+            cat.add(CheckResult("dev_ruff", Severity.PASS, "ruff in dev dependencies (modern alternative)"))
         else:
             for tool_name in ["black", "flake8", "isort"]:
-                if any(tool_name in d for d in dev_deps):
-                    results.append(CheckResult(f"dev_{tool_name}", Severity.PASS, f"{tool_name} in dev dependencies"))
+                if tool_name in dev_tools:
+                    cat.add(CheckResult(f"dev_{tool_name}", Severity.PASS, f"{tool_name} in dev dependencies"))
                 else:
-                    results.append(
+                    cat.add(
                         CheckResult(f"dev_{tool_name}", Severity.WARNING, f"{tool_name} missing from dev dependencies")
                     )
     else:
-        results.append(CheckResult("dev_deps", Severity.WARNING, "No [project.optional-dependencies] dev section"))
+        cat.add(CheckResult("dev_deps", Severity.WARNING, "No [project.optional-dependencies] dev section"))
 
     # Tool configuration
     tool = data.get("tool", {})
@@ -149,56 +164,52 @@ def check_pyproject(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     if isinstance(packages_val, dict):
         pkg_find = packages_val.get("find", {})
         if pkg_find:
-            results.append(CheckResult("setuptools_find", Severity.PASS, "setuptools packages.find configured"))
+            cat.add(CheckResult("setuptools_find", Severity.PASS, "setuptools packages.find configured"))
         else:
-            results.append(CheckResult("setuptools_find", Severity.WARNING, "setuptools packages.find not configured"))
+            cat.add(CheckResult("setuptools_find", Severity.WARNING, "setuptools packages.find not configured"))
     elif isinstance(packages_val, list) and packages_val:
-        results.append(CheckResult("setuptools_find", Severity.PASS, f"setuptools packages configured: {packages_val}"))
+        cat.add(CheckResult("setuptools_find", Severity.PASS, f"setuptools packages configured: {packages_val}"))
     else:
-        results.append(CheckResult("setuptools_find", Severity.WARNING, "setuptools packages not configured"))
+        cat.add(CheckResult("setuptools_find", Severity.WARNING, "setuptools packages not configured"))
 
     pkg_data = tool.get("setuptools", {}).get("package-data", {})
     if pkg_data:
-        results.append(CheckResult("package_data", Severity.PASS, "package-data configured for templates"))
+        cat.add(CheckResult("package_data", Severity.PASS, "package-data configured for templates"))
     else:
-        results.append(CheckResult("package_data", Severity.WARNING, "package-data not configured"))
+        cat.add(CheckResult("package_data", Severity.WARNING, "package-data not configured"))
 
     # Ruff config (modern alternative to black+isort+flake8)
     ruff_cfg = tool.get("ruff", {})
     if ruff_cfg:
         ruff_line_len = ruff_cfg.get("line-length")
-        results.append(
-            CheckResult("ruff_config", Severity.PASS, f"[tool.ruff] configured (line-length={ruff_line_len})")
-        )
+        cat.add(CheckResult("ruff_config", Severity.PASS, f"[tool.ruff] configured (line-length={ruff_line_len})"))
         # Check ruff lint settings
         ruff_lint = ruff_cfg.get("lint", {})
         if ruff_lint:
             ruff_select = ruff_lint.get("select", [])
-            results.append(
+            cat.add(
                 CheckResult("ruff_lint", Severity.PASS, f"[tool.ruff.lint] configured ({len(ruff_select)} rule sets)")
             )
         # Check ruff isort section
         ruff_isort = ruff_cfg.get("lint", {}).get("isort", ruff_cfg.get("isort", {}))
         if ruff_isort:
-            results.append(CheckResult("ruff_isort", Severity.PASS, "[tool.ruff.lint.isort] configured"))
+            cat.add(CheckResult("ruff_isort", Severity.PASS, "[tool.ruff.lint.isort] configured"))
     else:
         # Fall back to checking black + isort individually
         black_cfg = tool.get("black", {})
         if black_cfg:
             line_len = black_cfg.get("line-length")
-            results.append(
-                CheckResult("black_config", Severity.PASS, f"[tool.black] configured (line-length={line_len})")
-            )
+            cat.add(CheckResult("black_config", Severity.PASS, f"[tool.black] configured (line-length={line_len})"))
         else:
-            results.append(CheckResult("black_config", Severity.WARNING, "[tool.black] section missing"))
+            cat.add(CheckResult("black_config", Severity.WARNING, "[tool.black] section missing"))
 
         isort_cfg = tool.get("isort", {})
         if isort_cfg:
             profile = isort_cfg.get("profile", "")
             if profile == "black":
-                results.append(CheckResult("isort_config", Severity.PASS, '[tool.isort] profile = "black"'))
+                cat.add(CheckResult("isort_config", Severity.PASS, '[tool.isort] profile = "black"'))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "isort_config", Severity.WARNING, f'[tool.isort] profile = "{profile}" (expected "black")'
                     )
@@ -208,11 +219,9 @@ def check_pyproject(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
             isort_len = isort_cfg.get("line_length")
             black_len = black_cfg.get("line-length")
             if isort_len and black_len and isort_len == black_len:
-                results.append(
-                    CheckResult("line_length_match", Severity.PASS, f"isort/black line-length match ({black_len})")
-                )
+                cat.add(CheckResult("line_length_match", Severity.PASS, f"isort/black line-length match ({black_len})"))
             elif isort_len and black_len:
-                results.append(
+                cat.add(
                     CheckResult(
                         "line_length_match",
                         Severity.WARNING,
@@ -220,6 +229,6 @@ def check_pyproject(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                     )
                 )
         else:
-            results.append(CheckResult("isort_config", Severity.WARNING, "[tool.isort] section missing"))
+            cat.add(CheckResult("isort_config", Severity.WARNING, "[tool.isort] section missing"))
 
     return cat
@@ -2,114 +2,206 @@
 
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import ahocorasick_rs
+except ImportError:
+    ahocorasick_rs = None
 
 from . import CategoryResult, CheckResult, Severity
 
-# Patterns that suggest hardcoded secrets
+# Opening quote of a secret value, unless the value is an obvious placeholder (not a real secret)
+SECRET_VALUE_OPEN = rb"""['"](?!changeme|replace|your_|example|xxx|placeholder|TODO|FIXME|default|test)"""
+# Patterns that suggest hardcoded secrets (sources are scanned as raw bytes, skipping the decode)
 SECRET_PATTERNS = [
-    (r"""(?:password|passwd|pwd)\s*=\s*['"][^'"]{3,}['"]""", "Hardcoded password"),
-    (r"""(?:secret_key|api_key|apikey|token)\s*=\s*['"][^'"]{8,}['"]""", "Hardcoded secret/API key"),
-    (r"""(?:SECRET_KEY)\s*=\s*['"][^'"]+['"]""", "Django SECRET_KEY in code"),
-    (r"""(?:aws_access_key|aws_secret)\s*=\s*['"][^'"]+['"]""", "Hardcoded AWS credentials"),
+    (
+        re.compile(rb"(?:password|passwd|pwd)\s*=\s*" + SECRET_VALUE_OPEN + rb"""[^'"]{3,}['"]""", re.IGNORECASE),
+        "Hardcoded password",
+    ),
+    (
+        re.compile(
+            rb"(?:secret_key|api_key|apikey|token)\s*=\s*" + SECRET_VALUE_OPEN + rb"""[^'"]{8,}['"]""", re.IGNORECASE
+        ),
+        "Hardcoded secret/API key",
+    ),
+    (
+        re.compile(rb"(?:SECRET_KEY)\s*=\s*" + SECRET_VALUE_OPEN + rb"""[^'"]+['"]""", re.IGNORECASE),
+        "Django SECRET_KEY in code",
+    ),
+    (
+        re.compile(rb"(?:aws_access_key|aws_secret)\s*=\s*" + SECRET_VALUE_OPEN + rb"""[^'"]+['"]""", re.IGNORECASE),
+        "Hardcoded AWS credentials",
+    ),
 ]
+# All of the above as one alternation, so files without any candidate are ruled out in a single scan
+SECRET_ANY_RE = re.compile(b"|".join(b"(?:%s)" % pattern.pattern for pattern, _desc in SECRET_PATTERNS), re.IGNORECASE)
+# Every secret pattern needs one of these keywords (case-insensitively). With ahocorasick-rs installed,
+# one automaton pass over the lowercased source rules out most files before any regex runs.
+SECRET_KEYWORDS = [b"password", b"passwd", b"pwd", b"secret_key", b"api_key", b"apikey", b"token", b"aws_"]
+SECRET_AC = (
+    ahocorasick_rs.BytesAhoCorasick(SECRET_KEYWORDS)
+    if getattr(ahocorasick_rs, "BytesAhoCorasick", None) is not None
+    else None
+)
+
+VERIFY_FALSE_RE = re.compile(rb"verify\s*=\s*False")
+# Nearby references that make verify=False configurable
+VERIFY_SETTING_RE = re.compile(rb"settings|config|PLUGIN|get_plugin_config", re.IGNORECASE)
+REQUESTS_CALL_RE = re.compile(rb"requests\.(get|post|put|delete|patch)\(")
+PAREN_RE = re.compile(rb"[()]")
+
+# Permission mixins/decorators, or NetBox generic views (which include permissions by default)
+VIEW_PERMISSION_RE = re.compile(
+    rb"PermissionRequiredMixin|LoginRequiredMixin|ObjectPermissionRequiredMixin|permission_required"
+    rb"|ObjectView|ObjectListView|ObjectEditView|ObjectDeleteView|ObjectChildrenView|BulkEditView"
+)
+# Every VIEW_PERMISSION_RE alternative contains one of these, so files without any can skip the regex
+VIEW_PERMISSION_HINTS = (b"Mixin", b"Object", b"permission_required", b"BulkEditView")
 
 # Files/dirs to skip during security scanning
 SKIP_DIRS = {"migrations", "__pycache__", ".git", "node_modules", ".tox", ".eggs"}
 SKIP_FILES = {"__pycache__", ".pyc"}
+# Packages with at most this many .py files get the secret prefilter run once over all sources joined together
+SMALL_PACKAGE_FILES = 32
+
+
+def _read_source(fpath: str) -> bytes | None:
+    """Read a source file's raw bytes, returning None if it can't be read."""
+    try:
+        with open(fpath, "rb") as fp:
+            return fp.read()
+    except OSError:
+        return None
 
 
 def _scan_python_files(pkg_path: str):
     """Yield (filepath, content) for all .py files in package."""
+    paths = []
     for root, dirs, files in os.walk(pkg_path):
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
-        for f in files:
-            if f.endswith(".py"):
-                fpath = os.path.join(root, f)
-                try:
-                    with open(fpath) as fp:
-                        yield fpath, fp.read()
-                except Exception:
-                    continue
+        paths.extend(os.path.join(root, f) for f in files if f.endswith(".py"))
+    if not paths:
+        return
+    # Reads release the GIL, so overlap them (this matters on network filesystems and cold caches)
+    with ThreadPoolExecutor(max_workers=min(16, len(paths))) as executor:
+        for fpath, content in zip(paths, executor.map(_read_source, paths)):
+            if content is not None:
+                yield fpath, content
+
+
+def _may_contain_secret(content: bytes) -> bool:
+    """Cheap prefilter: could any of SECRET_PATTERNS match this source?"""
+    if SECRET_AC is not None and not SECRET_AC.find_matches_as_indexes(content.lower()):
+        return False
+    return SECRET_ANY_RE.search(content) is not None
+
+
+def _call_arguments(content: bytes, pos: int) -> bytes:
+    """Return the argument text of a call whose opening parenthesis ends just before pos.
+
+    Nested parentheses are balanced; an unterminated call runs to the end of the content.
+    """
+    depth = 1
+    for paren in PAREN_RE.finditer(content, pos):
+        depth += 1 if paren.group() == b"(" else -1
+        if depth == 0:
+            return content[pos : paren.start()]
+    return content[pos:]
+
+
+def _surrounding_lines(content: bytes, pos: int, before: int, after: int) -> bytes:
+    """Return the line containing pos with up to `before` lines above and `after` lines below it."""
+    start = content.rfind(b"\n", 0, pos)
+    for _ in range(before):
+        if start <= 0:
+            start = -1
+            break
+        start = content.rfind(b"\n", 0, start)
+    end = content.find(b"\n", pos)
+    for _ in range(after):
+        if end == -1:
+            break
+        end = content.find(b"\n", end + 1)
+    return content[start + 1 : end if end != -1 else len(content)]
 
 
 def check_security(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Check for security issues and best practices."""
     cat = CategoryResult(name="Security", icon="S")
-    results = cat.results
 
     if not pkg_dir:
-        results.append(CheckResult("package", Severity.ERROR, "No package directory to check"))
+        cat.add(CheckResult("package", Severity.ERROR, "No package directory to check"))
         return cat
 
     pkg_path = os.path.join(plugin_path, pkg_dir)
+    # Read every .py file once; the scans below all work from this list
+    py_files = [(os.path.relpath(fpath, plugin_path), content) for fpath, content in _scan_python_files(pkg_path)]
 
     # --- Scan for hardcoded secrets ---
     secret_findings = []
-    for fpath, content in _scan_python_files(pkg_path):
-        rel_path = os.path.relpath(fpath, plugin_path)
+    # Small packages (the common case has no secrets at all) are ruled out by one prefilter pass over
+    # every source joined together; a hit there just falls through to the per-file scan below
+    secret_candidates = py_files
+    if len(py_files) <= SMALL_PACKAGE_FILES and not _may_contain_secret(b"\n".join(c for _p, c in py_files)):
+        secret_candidates = []
+    for rel_path, content in secret_candidates:
+        if not _may_contain_secret(content):
+            continue
         for pattern, desc in SECRET_PATTERNS:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
-                # Filter out common false positives (empty strings, placeholders)
-                real_matches = [
-                    m
-                    for m in matches
-                    if not re.search(
-                        r"""['"](?:changeme|replace|your_|example|xxx|placeholder|TODO|FIXME|default|test)""",
-                        m,
-                        re.IGNORECASE,
-                    )
-                ]
-                if real_matches:
-                    secret_findings.append(f"{rel_path}: {desc}")
+            # Placeholder values are excluded by the pattern itself, so the first match is a finding
+            if pattern.search(content):
+                secret_findings.append(f"{rel_path}: {desc}")
 
     if not secret_findings:
-        results.append(CheckResult("no_secrets", Severity.PASS, "No hardcoded secrets detected"))
+        cat.add(CheckResult("no_secrets", Severity.PASS, "No hardcoded secrets detected"))
     else:
         for finding in secret_findings[:5]:
-            results.append(CheckResult("hardcoded_secret", Severity.WARNING, finding))
+            cat.add(CheckResult("hardcoded_secret", Severity.WARNING, finding))
 
     # --- Check for verify=False in requests ---
     verify_false_files = []
-    for fpath, content in _scan_python_files(pkg_path):
-        rel_path = os.path.relpath(fpath, plugin_path)
-        if re.search(r"verify\s*=\s*False", content):
+    for rel_path, content in py_files:
+        # Plain substring tests rule out most files before the regex runs
+        if b"verify" in content and VERIFY_FALSE_RE.search(content):
             # Check if it's configurable (uses a settings variable)
-            lines = content.split("\n")
-            for i, line in enumerate(lines, 1):
-                if re.search(r"verify\s*=\s*False", line):
-                    # Check if nearby lines have settings/config reference
-                    context = "\n".join(lines[max(0, i - 5) : i + 5])
-                    if not re.search(r"settings|config|PLUGIN|get_plugin_config", context, re.IGNORECASE):
-                        verify_false_files.append(f"{rel_path}:{i}")
+            last_line = 0
+            for match in VERIFY_FALSE_RE.finditer(content):
+                line_num = content.count(b"\n", 0, match.start()) + 1
+                # Only single-line occurrences count, once per line
+                if b"\n" in match.group() or line_num == last_line:
+                    continue
+                last_line = line_num
+                # Check if nearby lines have settings/config reference
+                if not VERIFY_SETTING_RE.search(_surrounding_lines(content, match.start(), 4, 5)):
+                    verify_false_files.append(f"{rel_path}:{line_num}")
 
     if not verify_false_files:
-        results.append(CheckResult("ssl_verify", Severity.PASS, "No non-configurable verify=False found"))
+        cat.add(CheckResult("ssl_verify", Severity.PASS, "No non-configurable verify=False found"))
     else:
         for loc in verify_false_files[:3]:
-            results.append(CheckResult("ssl_verify", Severity.WARNING, f"verify=False not configurable: {loc}"))
+            cat.add(CheckResult("ssl_verify", Severity.WARNING, f"verify=False not configurable: {loc}"))
 
     # --- Check requests usage has timeout ---
     missing_timeout = []
-    for fpath, content in _scan_python_files(pkg_path):
-        rel_path = os.path.relpath(fpath, plugin_path)
+    for rel_path, content in py_files:
+        if b"requests." not in content:
+            continue
         # Find requests.get/post/put/delete/patch calls
-        for match in re.finditer(r"requests\.(get|post|put|delete|patch)\(", content):
-            # Get the full call (rough heuristic - find matching paren)
+        for match in REQUESTS_CALL_RE.finditer(content):
+            # Look for the timeout parameter in the full call, up to its matching paren
             start = match.start()
-            # Look at a window of ~500 chars for the timeout parameter
-            window = content[start : start + 500]
-            if "timeout" not in window.split(")")[0]:
-                line_num = content[:start].count("\n") + 1
+            if b"timeout" not in _call_arguments(content, match.end()):
+                line_num = content.count(b"\n", 0, start) + 1
                 missing_timeout.append(f"{rel_path}:{line_num}")
 
     if not missing_timeout:
-        results.append(CheckResult("request_timeout", Severity.PASS, "All requests calls include timeout"))
+        cat.add(CheckResult("request_timeout", Severity.PASS, "All requests calls include timeout"))
     else:
         for loc in missing_timeout[:3]:
-            results.append(CheckResult("request_timeout", Severity.WARNING, f"requests call missing timeout: {loc}"))
+            cat.add(CheckResult("request_timeout", Severity.WARNING, f"requests call missing timeout: {loc}"))
         if len(missing_timeout) > 3:
-            results.append(
+            cat.add(
                 CheckResult(
                     "request_timeout",
                     Severity.WARNING,
@@ -132,28 +224,19 @@ def check_security(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         has_permission_check = False
         for vf in view_files:
             try:
-                with open(vf) as f:
+                with open(vf, "rb") as f:
                     view_content = f.read()
-                if re.search(
-                    r"PermissionRequiredMixin|LoginRequiredMixin|ObjectPermissionRequiredMixin|permission_required",
-                    view_content,
-                ):
-                    has_permission_check = True
-                    break
-                # NetBox generic views include permissions by default
-                if re.search(
-                    r"ObjectView|ObjectListView|ObjectEditView|ObjectDeleteView|ObjectChildrenView|BulkEditView",
-                    view_content,
-                ):
+                hinted = any(hint in view_content for hint in VIEW_PERMISSION_HINTS)
+                if hinted and VIEW_PERMISSION_RE.search(view_content):
                     has_permission_check = True
                     break
             except Exception:
                 continue
 
         if has_permission_check:
-            results.append(CheckResult("view_permissions", Severity.PASS, "Views use permission checks"))
+            cat.add(CheckResult("view_permissions", Severity.PASS, "Views use permission checks"))
         else:
-            results.append(CheckResult("view_permissions", Severity.WARNING, "Views may lack permission checks"))
+            cat.add(CheckResult("view_permissions", Severity.WARNING, "Views may lack permission checks"))
 
     # --- Check for .env or secrets files committed ---
     dangerous_files = [".env", ".env.local", "credentials.json", "secrets.yml", "secrets.yaml"]
@@ -163,10 +246,10 @@ def check_security(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
             found_dangerous.append(df)
 
     if not found_dangerous:
-        results.append(CheckResult("no_env_files", Severity.PASS, "No .env or credential files in repo"))
+        cat.add(CheckResult("no_env_files", Severity.PASS, "No .env or credential files in repo"))
     else:
         for df in found_dangerous:
-            results.append(CheckResult("env_file", Severity.WARNING, f"Sensitive file in repo: {df}"))
+            cat.add(CheckResult("env_file", Severity.WARNING, f"Sensitive file in repo: {df}"))
 
     # --- Check .gitignore covers common sensitive files ---
     gitignore_path = os.path.join(plugin_path, ".gitignore")
@@ -174,7 +257,7 @@ def check_security(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         with open(gitignore_path) as f:
             gitignore = f.read()
         if ".env" in gitignore:
-            results.append(CheckResult("gitignore_env", Severity.PASS, ".env in .gitignore"))
+            cat.add(CheckResult("gitignore_env", Severity.PASS, ".env in .gitignore"))
         else:
-            results.append(CheckResult("gitignore_env", Severity.INFO, ".env not in .gitignore"))
+            cat.add(CheckResult("gitignore_env", Severity.INFO, ".env not in .gitignore"))
     return cat
@@ -2,106 +2,88 @@
 
 import os
 
-from . import CategoryResult, CheckResult, Severity
+from . import CHANGELOG_VARIANTS, CategoryResult, CheckResult, Severity, list_entries
+
+# Top-level files: (name, severity when missing, message when missing)
+REQUIRED_FILES = [
+    ("pyproject.toml", Severity.ERROR, "pyproject.toml not found"),
+    ("README.md", Severity.ERROR, "README.md not found"),
+    (".gitignore", Severity.WARNING, ".gitignore not found"),
+]
+RECOMMENDED_FILES = [
+    ("CONTRIBUTING.md", Severity.INFO, "CONTRIBUTING.md not found (recommended)"),
+    ("COMPATIBILITY.md", Severity.INFO, "COMPATIBILITY.md not found (recommended for version tracking)"),
+    (".editorconfig", Severity.INFO, ".editorconfig not found (recommended for consistent formatting)"),
+    (".pre-commit-config.yaml", Severity.INFO, ".pre-commit-config.yaml not found (recommended)"),
+]
+LICENSE_VARIANTS = ["LICENSE", "LICENSE.txt", "LICENSE.md", "LICENCE", "LICENCE.txt", "LICENCE.md"]
+
+
+def _add_file_results(cat: CategoryResult, table: list, files: set[str]) -> None:
+    """Report each file in a (name, severity, missing message) table as present or missing."""
+    for fname, sev, msg in table:
+        if fname in files:
+            cat.add(CheckResult(fname, Severity.PASS, f"{fname} exists"))
+        else:
+            cat.add(CheckResult(fname, sev, msg))
 
 
 def check_structure(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Check that required files and directories exist."""
     cat = CategoryResult(name="Structure", icon="F")
-    results = cat.results
+    # One directory listing answers every top-level existence check below
+    files, dirs = list_entries(plugin_path)
 
     # Required files (exact match)
-    for fname, sev in [
-        ("pyproject.toml", Severity.ERROR),
-        ("README.md", Severity.ERROR),
-        (".gitignore", Severity.WARNING),
-    ]:
-        if os.path.isfile(os.path.join(plugin_path, fname)):
-            results.append(CheckResult(fname, Severity.PASS, f"{fname} exists"))
-        else:
-            results.append(CheckResult(fname, sev, f"{fname} not found"))
+    _add_file_results(cat, REQUIRED_FILES, files)
 
     # LICENSE - check common variants
-    license_variants = ["LICENSE", "LICENSE.txt", "LICENSE.md", "LICENCE", "LICENCE.txt", "LICENCE.md"]
-    found_license = None
-    for variant in license_variants:
-        if os.path.isfile(os.path.join(plugin_path, variant)):
-            found_license = variant
-            break
+    found_license = next((variant for variant in LICENSE_VARIANTS if variant in files), None)
     if found_license:
-        results.append(CheckResult("LICENSE", Severity.PASS, f"{found_license} exists"))
+        cat.add(CheckResult("LICENSE", Severity.PASS, f"{found_license} exists"))
     else:
-        results.append(CheckResult("LICENSE", Severity.WARNING, "No LICENSE file found"))
+        cat.add(CheckResult("LICENSE", Severity.WARNING, "No LICENSE file found"))
 
     # CHANGELOG - check common variants
-    changelog_variants = [
-        "CHANGELOG.md",
-        "CHANGELOG.rst",
-        "CHANGELOG.txt",
-        "CHANGELOG",
-        "CHANGES.md",
-        "CHANGES.rst",
-        "CHANGES.txt",
-        "HISTORY.md",
-        "HISTORY.rst",
-    ]
-    found_changelog = None
-    for variant in changelog_variants:
-        if os.path.isfile(os.path.join(plugin_path, variant)):
-            found_changelog = variant
-            break
+    found_changelog = next((variant for variant in CHANGELOG_VARIANTS if variant in files), None)
     if found_changelog:
-        results.append(CheckResult("CHANGELOG", Severity.PASS, f"{found_changelog} exists"))
+        cat.add(CheckResult("CHANGELOG", Severity.PASS, f"{found_changelog} exists"))
     else:
-        results.append(CheckResult("CHANGELOG", Severity.WARNING, "No CHANGELOG file found"))
+        cat.add(CheckResult("CHANGELOG", Severity.WARNING, "No CHANGELOG file found"))
 
     # Recommended files
-    for fname, sev, msg in [
-        ("CONTRIBUTING.md", Severity.INFO, "CONTRIBUTING.md not found (recommended)"),
-        ("COMPATIBILITY.md", Severity.INFO, "COMPATIBILITY.md not found (recommended for version tracking)"),
-        (".editorconfig", Severity.INFO, ".editorconfig not found (recommended for consistent formatting)"),
-        (".pre-commit-config.yaml", Severity.INFO, ".pre-commit-config.yaml not found (recommended)"),
-    ]:
-        if os.path.isfile(os.path.join(plugin_path, fname)):
-            results.append(CheckResult(fname, Severity.PASS, f"{fname} exists"))
-        else:
-            results.append(CheckResult(fname, sev, msg))
+    _add_file_results(cat, RECOMMENDED_FILES, files)
 
     # Docs directory
-    docs_dir = os.path.join(plugin_path, "docs")
-    if os.path.isdir(docs_dir):
-        results.append(CheckResult("docs_dir", Severity.PASS, "docs/ directory exists"))
-        mkdocs_path = os.path.join(plugin_path, "mkdocs.yml")
-        if os.path.isfile(mkdocs_path):
-            results.append(CheckResult("mkdocs", Severity.PASS, "mkdocs.yml exists"))
+    if "docs" in dirs:
+        cat.add(CheckResult("docs_dir", Severity.PASS, "docs/ directory exists"))
+        if "mkdocs.yml" in files:
+            cat.add(CheckResult("mkdocs", Severity.PASS, "mkdocs.yml exists"))
     else:
-        results.append(
-            CheckResult("docs_dir", Severity.INFO, "docs/ directory not found (recommended for extended docs)")
-        )
+        cat.add(CheckResult("docs_dir", Severity.INFO, "docs/ directory not found (recommended for extended docs)"))
 
     # Workflows directory
     wf_dir = os.path.join(plugin_path, ".github", "workflows")
-    if os.path.isdir(wf_dir):
-        results.append(CheckResult("workflows", Severity.PASS, ".github/workflows/ exists"))
+    if ".github" in dirs and os.path.isdir(wf_dir):
+        cat.add(CheckResult("workflows", Severity.PASS, ".github/workflows/ exists"))
     else:
-        results.append(CheckResult("workflows", Severity.WARNING, ".github/workflows/ not found"))
+        cat.add(CheckResult("workflows", Severity.WARNING, ".github/workflows/ not found"))
 
     # Plugin package directory
     if pkg_dir:
-        results.append(CheckResult("package_dir", Severity.PASS, f"Plugin package found: {pkg_dir}"))
+        cat.add(CheckResult("package_dir", Severity.PASS, f"Plugin package found: {pkg_dir}"))
 
-        init_path = os.path.join(plugin_path, pkg_dir, "__init__.py")
-        if os.path.isfile(init_path):
-            results.append(CheckResult("init_py", Severity.PASS, "__init__.py exists"))
+        pkg_files, pkg_dirs = list_entries(os.path.join(plugin_path, pkg_dir))
+        if "__init__.py" in pkg_files:
+            cat.add(CheckResult("init_py", Severity.PASS, "__init__.py exists"))
         else:
-            results.append(CheckResult("init_py", Severity.ERROR, "__init__.py not found in package"))
+            cat.add(CheckResult("init_py", Severity.ERROR, "__init__.py not found in package"))
 
-        tmpl_dir = os.path.join(plugin_path, pkg_dir, "templates")
-        if os.path.isdir(tmpl_dir):
-            results.append(CheckResult("templates", Severity.PASS, "templates/ directory exists"))
+        if "templates" in pkg_dirs:
+            cat.add(CheckResult("templates", Severity.PASS, "templates/ directory exists"))
         else:
-            results.append(CheckResult("templates", Severity.INFO, "templates/ directory not found"))
+            cat.add(CheckResult("templates", Severity.INFO, "templates/ directory not found"))
     else:
-        results.append(CheckResult("package_dir", Severity.ERROR, "No netbox_* package directory found"))
+        cat.add(CheckResult("package_dir", Severity.ERROR, "No netbox_* package directory found"))
 
     return cat
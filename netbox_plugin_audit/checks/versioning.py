@@ -1,18 +1,44 @@
 """Check version synchronization across files."""
 
 import ast
+import functools
 import os
 import re
 
-try:
-    import tomllib
-except ImportError:
-    import tomli as tomllib  # type: ignore[no-redef]
+from . import CategoryResult, CheckResult, PluginContext, Severity, find_changelog, module_level_statements
 
-from . import CategoryResult, CheckResult, Severity
+# A plain top-level `__version__ = "x.y.z"`; only other layouts need the AST
+VERSION_RE = re.compile(rb"^__version__\s*=\s*['\"]([^'\"]+)['\"]", re.MULTILINE)
+# The first `# x.y.z` / `## [x.y.z]` heading is taken as the latest changelog version
+CHANGELOG_VERSION_RE = re.compile(rb"##?\s*\[?(\d+\.\d+\.\d+)\]?")
+# A plain x.y.z version string
+SEMVER_RE = re.compile(r"^\d+\.\d+\.\d+$")
 
 
-def _get_init_version(plugin_path: str, pkg_dir: str) -> str | tuple[str, str] | None:
+@functools.lru_cache(maxsize=256)
+def _parse_cached(path: str, mtime_ns: int) -> ast.Module:
+    """Parse a Python file; the mtime is part of the cache key so an edited file is parsed again."""
+    with open(path, "rb", buffering=0) as f:
+        return ast.parse(f.read())
+
+
+def parse_python_file(path: str) -> ast.Module:
+    """Parse a Python file, reusing the tree from an earlier call in this process if it is unchanged."""
+    return _parse_cached(os.path.abspath(path), os.stat(path).st_mtime_ns)
+
+
+def _find_version_assignment(tree: ast.AST) -> str | None:
+    """Find a module-level `__version__ = <constant>` assignment (also inside if/try blocks)."""
+    for node in module_level_statements(tree.body):
+        if isinstance(node, ast.Assign):
+            for target in node.targets:
+                if isinstance(target, ast.Name) and target.id == "__version__":
+                    if isinstance(node.value, ast.Constant):
+                        return str(node.value.value)
+    return None
+
+
+def get_init_version(plugin_path: str, pkg_dir: str) -> str | tuple[str, str] | None:
     """Extract __version__ from __init__.py or version.py.
 
     Returns:
@@ -24,29 +50,34 @@ def _get_init_version(plugin_path: str, pkg_dir: str) -> str | tuple[str, str] |
     if not os.path.isfile(init_path):
         return None
     try:
-        with open(init_path) as f:
+        with open(init_path, "rb", buffering=0) as f:
             source = f.read()
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "__version__":
-                        if isinstance(node.value, ast.Constant):
-                            return str(node.value.value)
-
-        # Check for `from .version import __version__` pattern
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ImportFrom) and node.module == "version":
-                for alias in node.names:
-                    if alias.name == "__version__":
-                        # Read from version.py
-                        ver = _get_version_from_file(plugin_path, pkg_dir, "version.py")
-                        if ver:
-                            return ver
+        m = VERSION_RE.search(source)
+        if m:
+            return m.group(1).decode(errors="replace")
+
+        # Neither an assignment nor a `from .version import __version__` is possible without the name
+        if b"__version__" in source:
+            # One walk over the module-level statements (function and class bodies can't set the module's
+            # __version__) looks for both; an assignment wins over `from .version import __version__`
+            imports_version = False
+            for node in module_level_statements(parse_python_file(init_path).body):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name) and target.id == "__version__":
+                            if isinstance(node.value, ast.Constant):
+                                return str(node.value.value)
+                elif isinstance(node, ast.ImportFrom) and node.module == "version":
+                    imports_version = imports_version or any(alias.name == "__version__" for alias in node.names)
+            if imports_version:
+                # Read from version.py
+                ver = _get_version_from_file(plugin_path, pkg_dir, "version.py")
+                if ver:
+                    return ver
 
         # Check for importlib.metadata.version() usage (modern pattern)
-        if "importlib.metadata" in source or "importlib import metadata" in source:
-            if "metadata.version(" in source:
+        if b"importlib.metadata" in source or b"importlib import metadata" in source:
+            if b"metadata.version(" in source:
                 return ("dynamic", "importlib.metadata")
         return None
     except Exception:
@@ -59,16 +90,12 @@ def _get_version_from_file(plugin_path: str, pkg_dir: str, filename: str) -> str
     if not os.path.isfile(ver_path):
         return None
     try:
-        with open(ver_path) as f:
+        with open(ver_path, "rb", buffering=0) as f:
             source = f.read()
-        tree = ast.parse(source)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name) and target.id == "__version__":
-                        if isinstance(node.value, ast.Constant):
-                            return str(node.value.value)
-        return None
+        m = VERSION_RE.search(source)
+        if m:
+            return m.group(1).decode(errors="replace")
+        return _find_version_assignment(parse_python_file(ver_path))
     except Exception:
         return None
 
@@ -76,65 +103,88 @@ def _get_version_from_file(plugin_path: str, pkg_dir: str, filename: str) -> str
 def _get_pyproject_version(plugin_path: str) -> str | None:
     """Extract version from pyproject.toml."""
     toml_path = os.path.join(plugin_path, "pyproject.toml")
-    if not os.path.isfile(toml_path):
+    try:
+        mtime_ns = os.stat(toml_path).st_mtime_ns
+    except OSError:
+        return None
+    return _read_pyproject_version(os.path.abspath(toml_path), mtime_ns)
+
+
+@functools.lru_cache(maxsize=64)
+def _read_pyproject_version(toml_path: str, mtime_ns: int) -> str | None:
+    """Read the [project] version from a pyproject.toml; cached per path and mtime like _parse_cached."""
+    try:
+        with open(toml_path, "rb", buffering=0) as f:
+            raw = f.read()
+    except OSError:
         return None
+    # tomllib is imported only here, since most runs take the version from the shared parsed pyproject.toml
+    try:
+        import tomllib
+    except ImportError:
+        try:
+            import tomli as tomllib  # type: ignore[no-redef]
+        except ImportError:
+            return None
     try:
-        with open(toml_path, "rb") as f:
-            data = tomllib.load(f)
-        return data.get("project", {}).get("version")
+        return tomllib.loads(raw.decode()).get("project", {}).get("version")
     except Exception:
         return None
 
 
-def _get_changelog_version(plugin_path: str) -> str | None:
-    """Extract latest version from changelog file."""
-    changelog_variants = [
-        "CHANGELOG.md",
-        "CHANGELOG.rst",
-        "CHANGELOG.txt",
-        "CHANGELOG",
-        "CHANGES.md",
-        "CHANGES.rst",
-        "CHANGES.txt",
-        "HISTORY.md",
-        "HISTORY.rst",
-    ]
-    cl_path = None
-    for variant in changelog_variants:
-        p = os.path.join(plugin_path, variant)
-        if os.path.isfile(p):
-            cl_path = p
-            break
+def _get_changelog_version(plugin_path: str, content: bytes | None = None) -> str | None:
+    """Extract latest version from changelog file (or its already-read contents)."""
+    if content is not None:
+        match = CHANGELOG_VERSION_RE.search(content)
+        return match.group(1).decode() if match else None
+
+    cl_path = find_changelog(plugin_path)
     if not cl_path:
         return None
+    # Stream it: the latest version heading is near the top, so long changelogs needn't be read in full
     try:
-        with open(cl_path) as f:
-            content = f.read()
-        match = re.search(r"##?\s*\[?(\d+\.\d+\.\d+)\]?", content)
-        return match.group(1) if match else None
-    except Exception:
-        return None
+        with open(cl_path, "rb") as f:
+            for line in f:
+                match = CHANGELOG_VERSION_RE.search(line)
+                if match:
+                    return match.group(1).decode()
+    except OSError:
+        pass
+    return None
+
+
+def _add_missing_pyproject_version(cat: CategoryResult, plugin_path: str) -> None:
+    """Report a missing pyproject.toml version (only informational when setup.py carries it)."""
+    if os.path.isfile(os.path.join(plugin_path, "setup.py")):
+        cat.add(CheckResult("pyproject_match", Severity.INFO, "Version in setup.py (consider pyproject.toml)"))
+    else:
+        cat.add(CheckResult("pyproject_match", Severity.ERROR, "No version in pyproject.toml"))
 
 
-def check_versioning(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
-    """Check version synchronization across files."""
+def check_versioning(plugin_path: str, pkg_dir: str | None, ctx: PluginContext | None = None) -> CategoryResult:
+    """Check version synchronization across files.
+
+    If ``ctx`` is given, its parsed pyproject.toml and changelog contents are used instead of re-reading them.
+    """
     cat = CategoryResult(name="Versioning", icon="V")
-    results = cat.results
 
     if not pkg_dir:
-        results.append(CheckResult("package", Severity.ERROR, "No package directory"))
+        cat.add(CheckResult("package", Severity.ERROR, "No package directory"))
         return cat
 
-    init_ver_raw = _get_init_version(plugin_path, pkg_dir)
-    pyproj_ver = _get_pyproject_version(plugin_path)
-    cl_ver = _get_changelog_version(plugin_path)
+    init_ver_raw = get_init_version(plugin_path, pkg_dir)
+    if ctx is not None and ctx.pyproject is not None:
+        pyproj_ver = ctx.pyproject.get("project", {}).get("version")
+    else:
+        pyproj_ver = _get_pyproject_version(plugin_path)
+    cl_ver = _get_changelog_version(plugin_path, ctx.changelog if ctx is not None else None)
 
     # Handle dynamic version (importlib.metadata)
     is_dynamic = isinstance(init_ver_raw, tuple) and init_ver_raw[0] == "dynamic"
     init_ver = None if is_dynamic else init_ver_raw
 
     if is_dynamic:
-        results.append(
+        cat.add(
             CheckResult(
                 "semver",
                 Severity.PASS,
@@ -143,33 +193,31 @@ def check_versioning(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
         )
         # For dynamic version, pyproject.toml is the source of truth
         if pyproj_ver:
-            if re.match(r"^\d+\.\d+\.\d+$", pyproj_ver):
-                results.append(CheckResult("pyproject_match", Severity.PASS, f"pyproject.toml version: {pyproj_ver}"))
+            if SEMVER_RE.match(pyproj_ver):
+                cat.add(CheckResult("pyproject_match", Severity.PASS, f"pyproject.toml version: {pyproj_ver}"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "pyproject_match", Severity.WARNING, f"pyproject.toml version may not be semver: {pyproj_ver}"
                     )
                 )
         else:
-            results.append(CheckResult("pyproject_match", Severity.ERROR, "No version in pyproject.toml"))
+            cat.add(CheckResult("pyproject_match", Severity.ERROR, "No version in pyproject.toml"))
         # Use pyproject version for changelog comparison
         init_ver = pyproj_ver
     elif init_ver:
         # Check __version__ is valid semver
-        if re.match(r"^\d+\.\d+\.\d+$", init_ver):
-            results.append(CheckResult("semver", Severity.PASS, f"__version__ is valid semver: {init_ver}"))
+        if SEMVER_RE.match(init_ver):
+            cat.add(CheckResult("semver", Severity.PASS, f"__version__ is valid semver: {init_ver}"))
         else:
-            results.append(CheckResult("semver", Severity.WARNING, f"__version__ may not be semver: {init_ver}"))
+            cat.add(CheckResult("semver", Severity.WARNING, f"__version__ may not be semver: {init_ver}"))
 
         # Check pyproject.toml matches __init__.py
         if pyproj_ver:
             if init_ver == pyproj_ver:
-                results.append(
-                    CheckResult("pyproject_match", Severity.PASS, f"pyproject.toml version matches ({pyproj_ver})")
-                )
+                cat.add(CheckResult("pyproject_match", Severity.PASS, f"pyproject.toml version matches ({pyproj_ver})"))
             else:
-                results.append(
+                cat.add(
                     CheckResult(
                         "pyproject_match",
                         Severity.ERROR,
@@ -177,32 +225,18 @@ def check_versioning(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                     )
                 )
         else:
-            has_setup = os.path.isfile(os.path.join(plugin_path, "setup.py"))
-            if has_setup:
-                results.append(
-                    CheckResult("pyproject_match", Severity.INFO, "Version in setup.py (consider pyproject.toml)")
-                )
-            else:
-                results.append(CheckResult("pyproject_match", Severity.ERROR, "No version in pyproject.toml"))
+            _add_missing_pyproject_version(cat, plugin_path)
     else:
-        results.append(CheckResult("semver", Severity.ERROR, "__version__ not found in __init__.py"))
+        cat.add(CheckResult("semver", Severity.ERROR, "__version__ not found in __init__.py"))
         if not pyproj_ver:
-            has_setup = os.path.isfile(os.path.join(plugin_path, "setup.py"))
-            if has_setup:
-                results.append(
-                    CheckResult("pyproject_match", Severity.INFO, "Version in setup.py (consider pyproject.toml)")
-                )
-            else:
-                results.append(CheckResult("pyproject_match", Severity.ERROR, "No version in pyproject.toml"))
+            _add_missing_pyproject_version(cat, plugin_path)
 
     # Check CHANGELOG matches (warning only)
     if init_ver and cl_ver:
         if init_ver == cl_ver:
-            results.append(
-                CheckResult("changelog_match", Severity.PASS, f"CHANGELOG latest version matches ({cl_ver})")
-            )
+            cat.add(CheckResult("changelog_match", Severity.PASS, f"CHANGELOG latest version matches ({cl_ver})"))
         else:
-            results.append(
+            cat.add(
                 CheckResult(
                     "changelog_match",
                     Severity.WARNING,
@@ -210,6 +244,6 @@ def check_versioning(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                 )
             )
     elif not cl_ver:
-        results.append(CheckResult("changelog_match", Severity.INFO, "No version found in changelog"))
+        cat.add(CheckResult("changelog_match", Severity.INFO, "No version found in changelog"))
 
     return cat
@@ -9,36 +9,72 @@ from . import CategoryResult, CheckResult, Severity
 CI_KEYWORDS = ["ci", "lint", "test", "check", "qa", "validate"]
 # Keywords that suggest a release/publish workflow
 RELEASE_KEYWORDS = ["release", "publish", "deploy", "pypi", "pub"]
+# Python 3.1x versions mentioned in a CI workflow (the test matrix)
+PYTHON_VERSION_RE = re.compile(r"['\"]?(3\.1[0-9])['\"]?")
+# Fallbacks when no workflow filename matches: content that marks a CI/lint or a release workflow
+CI_CONTENT_RE = re.compile(r"super-linter|super_linter|ruff|flake8|black|isort|pre-commit|pylint", re.IGNORECASE)
+RELEASE_CONTENT_RE = re.compile(r"pypi|gh-action-pypi-publish|twine upload", re.IGNORECASE)
+# Lint/build tools looked for in the CI workflow, collected in a single pass
+CI_TOOLS_RE = re.compile(r"ruff|super[-_]linter|pre-commit|black|isort|flake8|build|twine")
 
 
 def _read_yaml_simple(path: str) -> str:
     """Read YAML file as text (no yaml parser needed for simple checks)."""
-    with open(path) as f:
-        return f.read()
+    # Unbuffered: the whole file is read in one go, so a BufferedReader would only add a copy
+    with open(path, "rb", buffering=0) as f:
+        return f.read().decode("utf-8", "replace")
 
 
-def _find_workflow(wf_dir: str, keywords: list[str]) -> str | None:
-    """Find a workflow file matching any of the given keywords."""
-    for wf_file in sorted(os.listdir(wf_dir)):
-        if not wf_file.endswith((".yml", ".yaml")):
+def _read_workflow(path: str, contents: dict[str, str]) -> str:
+    """Read a workflow file, reusing the text if this check has already read it."""
+    if path not in contents:
+        contents[path] = _read_yaml_simple(path)
+    return contents[path]
+
+
+def _list_workflows(wf_dir: str) -> list[os.DirEntry]:
+    """List the workflow files in wf_dir, sorted by name, in a single directory scan."""
+    with os.scandir(wf_dir) as it:
+        entries = [entry for entry in it if entry.name.endswith((".yml", ".yaml")) and entry.is_file()]
+    return sorted(entries, key=lambda entry: entry.name)
+
+
+def _has_tag_trigger(content: str) -> bool:
+    """Whether a line has `tags` followed by `v*`, or by `[` and then a `v` (a push trigger on version tags).
+
+    Plain string searches keep this linear; a backtracking regex for the same rule goes cubic on
+    long lines with many `tags[` and no `v`.
+    """
+    for line in content.split("\n"):
+        start = line.find("tags")
+        if start == -1:
             continue
-        name_lower = wf_file.lower()
+        # The first `tags` on the line leaves the longest tail, so it matches whenever any later one would
+        rest = line[start + 4 :]
+        bracket = rest.find("[")
+        if "v*" in rest or (bracket != -1 and "v" in rest[bracket + 1 :]):
+            return True
+    return False
+
+
+def _find_workflow(wf_files: list[os.DirEntry], keywords: list[str]) -> str | None:
+    """Find a workflow file matching any of the given keywords."""
+    for entry in wf_files:
+        name_lower = entry.name.lower()
         for kw in keywords:
             if kw in name_lower:
-                return os.path.join(wf_dir, wf_file)
+                return entry.path
     return None
 
 
-def _find_workflow_by_content(wf_dir: str, content_patterns: list[str]) -> str | None:
-    """Find a workflow file whose content matches any of the given patterns."""
-    for wf_file in sorted(os.listdir(wf_dir)):
-        if not wf_file.endswith((".yml", ".yaml")):
-            continue
-        path = os.path.join(wf_dir, wf_file)
+def _find_workflow_by_content(
+    wf_files: list[os.DirEntry], content_re: re.Pattern, contents: dict[str, str]
+) -> str | None:
+    """Find the first workflow file whose content matches content_re (file texts are kept in contents)."""
+    for entry in wf_files:
         try:
-            content = _read_yaml_simple(path).lower()
-            if any(pat in content for pat in content_patterns):
-                return path
+            if content_re.search(_read_workflow(entry.path, contents)):
+                return entry.path
         except Exception:
             continue
     return None
@@ -47,47 +83,47 @@ def _find_workflow_by_content(wf_dir: str, content_patterns: list[str]) -> str |
 def check_workflows(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
     """Validate GitHub Actions CI and release workflows."""
     cat = CategoryResult(name="Workflows", icon="W")
-    results = cat.results
 
     wf_dir = os.path.join(plugin_path, ".github", "workflows")
     if not os.path.isdir(wf_dir):
-        results.append(CheckResult("workflows_dir", Severity.WARNING, ".github/workflows/ not found"))
+        cat.add(CheckResult("workflows_dir", Severity.WARNING, ".github/workflows/ not found"))
         return cat
 
+    wf_files = _list_workflows(wf_dir)
+    # Workflow texts read so far, so a file scanned by content isn't read again below
+    contents: dict[str, str] = {}
+
     # CI workflow — find by filename first, then by content
-    ci_path = _find_workflow(wf_dir, CI_KEYWORDS)
+    ci_path = _find_workflow(wf_files, CI_KEYWORDS)
     if not ci_path:
-        ci_path = _find_workflow_by_content(
-            wf_dir, ["super-linter", "super_linter", "ruff", "flake8", "black", "isort", "pre-commit", "pylint"]
-        )
+        ci_path = _find_workflow_by_content(wf_files, CI_CONTENT_RE, contents)
 
     if ci_path:
-        ci_content = _read_yaml_simple(ci_path)
-        results.append(CheckResult("ci_exists", Severity.PASS, f"CI workflow found: {os.path.basename(ci_path)}"))
+        ci_content = _read_workflow(ci_path, contents)
+        ci_tools = set(CI_TOOLS_RE.findall(ci_content))
+        cat.add(CheckResult("ci_exists", Severity.PASS, f"CI workflow found: {os.path.basename(ci_path)}"))
 
         # Check for lint tools (ruff, super-linter, or black+isort+flake8)
-        if "ruff" in ci_content:
-            results.append(CheckResult("ci_ruff", Severity.PASS, "ruff in CI workflow (modern linter)"))
-        elif "super-linter" in ci_content or "super_linter" in ci_content:
-            results.append(CheckResult("ci_superlinter", Severity.PASS, "super-linter in CI workflow (multi-linter)"))
-        elif "pre-commit" in ci_content:
-            results.append(CheckResult("ci_precommit", Severity.PASS, "pre-commit in CI workflow"))
+        if "ruff" in ci_tools:
+            cat.add(CheckResult("ci_ruff", Severity.PASS, "ruff in CI workflow (modern linter)"))
+        elif "super-linter" in ci_tools or "super_linter" in ci_tools:
+            cat.add(CheckResult("ci_superlinter", Severity.PASS, "super-linter in CI workflow (multi-linter)"))
+        elif "pre-commit" in ci_tools:
+            cat.add(CheckResult("ci_precommit", Severity.PASS, "pre-commit in CI workflow"))
         else:
             for tool_name in ["black", "isort", "flake8"]:
-                if tool_name in ci_content:
-                    results.append(CheckResult(f"ci_{tool_name}", Severity.PASS, f"{tool_name} in CI workflow"))
+                if tool_name in ci_tools:
+                    cat.add(CheckResult(f"ci_{tool_name}", Severity.PASS, f"{tool_name} in CI workflow"))
                 else:
-                    results.append(
-                        CheckResult(f"ci_{tool_name}", Severity.WARNING, f"{tool_name} not found in CI workflow")
-                    )
+                    cat.add(CheckResult(f"ci_{tool_name}", Severity.WARNING, f"{tool_name} not found in CI workflow"))
 
         # Check Python version matrix
-        py_versions = re.findall(r"['\"]?(3\.1[0-9])['\"]?", ci_content)
+        py_versions = PYTHON_VERSION_RE.findall(ci_content)
         unique_versions = sorted(set(py_versions))
         if len(unique_versions) >= 2:
-            results.append(CheckResult("ci_python_matrix", Severity.PASS, f"Tests Python {', '.join(unique_versions)}"))
+            cat.add(CheckResult("ci_python_matrix", Severity.PASS, f"Tests Python {', '.join(unique_versions)}"))
         elif len(unique_versions) == 1:
-            results.append(
+            cat.add(
                 CheckResult(
                     "ci_python_matrix",
                     Severity.WARNING,
@@ -95,38 +131,36 @@ def check_workflows(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
                 )
             )
         else:
-            results.append(CheckResult("ci_python_matrix", Severity.INFO, "No Python version matrix detected"))
+            cat.add(CheckResult("ci_python_matrix", Severity.INFO, "No Python version matrix detected"))
 
         # Check for package build
-        if "build" in ci_content and "twine" in ci_content:
-            results.append(CheckResult("ci_package", Severity.PASS, "Package build check in CI"))
+        if "build" in ci_tools and "twine" in ci_tools:
+            cat.add(CheckResult("ci_package", Severity.PASS, "Package build check in CI"))
         else:
-            results.append(CheckResult("ci_package", Severity.INFO, "No package build check in CI"))
+            cat.add(CheckResult("ci_package", Severity.INFO, "No package build check in CI"))
     else:
-        results.append(CheckResult("ci_exists", Severity.WARNING, "No CI/lint workflow found"))
+        cat.add(CheckResult("ci_exists", Severity.WARNING, "No CI/lint workflow found"))
 
     # Release workflow — find by filename first, then by content
-    rel_path = _find_workflow(wf_dir, RELEASE_KEYWORDS)
+    rel_path = _find_workflow(wf_files, RELEASE_KEYWORDS)
     if not rel_path:
-        rel_path = _find_workflow_by_content(wf_dir, ["pypi", "gh-action-pypi-publish", "twine upload"])
+        rel_path = _find_workflow_by_content(wf_files, RELEASE_CONTENT_RE, contents)
 
     if rel_path:
-        rel_content = _read_yaml_simple(rel_path)
-        results.append(
-            CheckResult("release_exists", Severity.PASS, f"Release workflow found: {os.path.basename(rel_path)}")
-        )
+        rel_content = _read_workflow(rel_path, contents)
+        cat.add(CheckResult("release_exists", Severity.PASS, f"Release workflow found: {os.path.basename(rel_path)}"))
 
         # Check tag trigger
-        if re.search(r"tags.*v\*|tags.*\[.*v", rel_content):
-            results.append(CheckResult("release_trigger", Severity.PASS, "Release triggers on tag push"))
+        if _has_tag_trigger(rel_content):
+            cat.add(CheckResult("release_trigger", Severity.PASS, "Release triggers on tag push"))
         else:
-            results.append(CheckResult("release_trigger", Severity.WARNING, "Release may not trigger on tag push"))
+            cat.add(CheckResult("release_trigger", Severity.WARNING, "Release may not trigger on tag push"))
 
         # Check PyPI publish
         if "pypi" in rel_content.lower() or "gh-action-pypi-publish" in rel_content:
-            results.append(CheckResult("release_pypi", Severity.PASS, "PyPI publish configured"))
+            cat.add(CheckResult("release_pypi", Severity.PASS, "PyPI publish configured"))
         else:
-            results.append(CheckResult("release_pypi", Severity.INFO, "No PyPI publish step detected"))
+            cat.add(CheckResult("release_pypi", Severity.INFO, "No PyPI publish step detected"))
 
         # Check GitHub Release
         if (
@@ -134,10 +168,10 @@ def check_workflows(plugin_path: str, pkg_dir: str | None) -> CategoryResult:
             or "action-gh-release" in rel_content
             or "create.*release" in rel_content.lower()
         ):
-            results.append(CheckResult("release_github", Severity.PASS, "GitHub Release creation configured"))
+            cat.add(CheckResult("release_github", Severity.PASS, "GitHub Release creation configured"))
         else:
-            results.append(CheckResult("release_github", Severity.INFO, "No GitHub Release creation detected"))
+            cat.add(CheckResult("release_github", Severity.INFO, "No GitHub Release creation detected"))
     else:
-        results.append(CheckResult("release_exists", Severity.WARNING, "No release workflow found"))
+        cat.add(CheckResult("release_exists", Severity.WARNING, "No release workflow found"))
 
     return cat
@@ -1,6 +1,7 @@
 """CLI entrypoint for NetBox Plugin Audit."""
 
 import argparse
+import os
 import sys
 
 from . import __version__
@@ -35,6 +36,12 @@ def main():
         action="store_true",
         help="Skip package build test",
     )
+    parser.add_argument(
+        "--color",
+        choices=["auto", "always", "never"],
+        default="auto",
+        help="Colorize terminal output (default: auto, only when stdout is a TTY and NO_COLOR is unset)",
+    )
     parser.add_argument(
         "--version",
         action="version",
@@ -54,7 +61,11 @@ def main():
     elif args.format == "markdown":
         print(format_markdown(result))
     else:
-        print(format_terminal(result))
+        if args.color == "auto":
+            color = sys.stdout.isatty() and not os.environ.get("NO_COLOR")
+        else:
+            color = args.color == "always"
+        print(format_terminal(result, color=color))
 
     # Exit code
     summary = result["summary"]
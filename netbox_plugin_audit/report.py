@@ -2,6 +2,11 @@
 
 import json
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .checks import Severity
 
 # Terminal colors
@@ -13,11 +18,31 @@ RED = "\033[31m"
 CYAN = "\033[36m"
 DIM = "\033[2m"
 
+SEVERITY_LABELS = {
+    Severity.PASS: "PASS",
+    Severity.INFO: "INFO",
+    Severity.WARNING: "WARN",
+    Severity.ERROR: "FAIL",
+}
+SEVERITY_COLORS = {
+    Severity.PASS: GREEN,
+    Severity.INFO: CYAN,
+    Severity.WARNING: YELLOW,
+    Severity.ERROR: RED,
+}
 SEVERITY_SYMBOLS = {
-    Severity.PASS: f"{GREEN}PASS{RESET}",
-    Severity.INFO: f"{CYAN}INFO{RESET}",
-    Severity.WARNING: f"{YELLOW}WARN{RESET}",
-    Severity.ERROR: f"{RED}FAIL{RESET}",
+    severity: f"{SEVERITY_COLORS[severity]}{label}{RESET}" for severity, label in SEVERITY_LABELS.items()
+}
+# Indented symbol column that starts each check line in the terminal report (with and without colors)
+SEVERITY_PREFIXES = {severity: f"    {symbol}  " for severity, symbol in SEVERITY_SYMBOLS.items()}
+PLAIN_SEVERITY_PREFIXES = {severity: f"    {label}  " for severity, label in SEVERITY_LABELS.items()}
+
+# List-item prefix that starts each check line in the Markdown report
+SEVERITY_MARKDOWN_PREFIXES = {
+    Severity.PASS: "- ✅ ",
+    Severity.INFO: "- ℹ️ ",
+    Severity.WARNING: "- ⚠️ ",
+    Severity.ERROR: "- ❌ ",
 }
 
 CATEGORY_ICONS = {
@@ -36,8 +61,14 @@ CATEGORY_ICONS = {
 }
 
 
-def format_terminal(result: dict) -> str:
-    """Format audit result for terminal output with colors."""
+def format_terminal(result: dict, color: bool = True) -> str:
+    """Format audit result for terminal output, with ANSI colors unless color is False."""
+    if color:
+        bold, reset, red, yellow, green, cyan = BOLD, RESET, RED, YELLOW, GREEN, CYAN
+        prefixes = SEVERITY_PREFIXES
+    else:
+        bold = reset = red = yellow = green = cyan = ""
+        prefixes = PLAIN_SEVERITY_PREFIXES
     lines = []
 
     name = result["plugin_name"]
@@ -45,14 +76,14 @@ def format_terminal(result: dict) -> str:
 
     # Header
     lines.append("")
-    lines.append(f"{BOLD}{'═' * 58}{RESET}")
-    lines.append(f"{BOLD}  NetBox Plugin Audit Report{RESET}")
-    lines.append(f"{BOLD}  Plugin: {name} (v{version}){RESET}")
-    lines.append(f"{BOLD}{'═' * 58}{RESET}")
+    lines.append(f"{bold}{'═' * 58}{reset}")
+    lines.append(f"{bold}  NetBox Plugin Audit Report{reset}")
+    lines.append(f"{bold}  Plugin: {name} (v{version}){reset}")
+    lines.append(f"{bold}{'═' * 58}{reset}")
     lines.append("")
 
     if result.get("error"):
-        lines.append(f"  {RED}ERROR: {result['error']}{RESET}")
+        lines.append(f"  {red}ERROR: {result['error']}{reset}")
         lines.append("")
         return "\n".join(lines)
 
@@ -62,18 +93,16 @@ def format_terminal(result: dict) -> str:
         score = f"{cat.passed}/{cat.total}"
 
         if cat.errors > 0:
-            score_color = RED
+            score_color = red
         elif cat.warnings > 0:
-            score_color = YELLOW
+            score_color = yellow
         else:
-            score_color = GREEN
+            score_color = green
 
         header = f"{icon} {cat.name}"
-        lines.append(f"  {BOLD}{header:<45}{RESET} {score_color}{score}{RESET}")
+        lines.append(f"  {bold}{header:<45}{reset} {score_color}{score}{reset}")
 
-        for check in cat.results:
-            symbol = SEVERITY_SYMBOLS[check.severity]
-            lines.append(f"    {symbol}  {check.message}")
+        lines.extend(prefixes[check.severity] + check.message for check in cat.results)
 
         lines.append("")
 
@@ -84,18 +113,18 @@ def format_terminal(result: dict) -> str:
     pct = round(passed / total * 100) if total > 0 else 0
 
     if pct >= 90:
-        pct_color = GREEN
+        pct_color = green
     elif pct >= 70:
-        pct_color = YELLOW
+        pct_color = yellow
     else:
-        pct_color = RED
+        pct_color = red
 
-    lines.append(f"  {BOLD}{'─' * 58}{RESET}")
-    lines.append(f"  {BOLD}Summary:{RESET} {pct_color}{passed}/{total} checks passed ({pct}%){RESET}")
+    lines.append(f"  {bold}{'─' * 58}{reset}")
+    lines.append(f"  {bold}Summary:{reset} {pct_color}{passed}/{total} checks passed ({pct}%){reset}")
     lines.append(
-        f"    {RED}Errors: {summary['errors']}{RESET}"
-        f" | {YELLOW}Warnings: {summary['warnings']}{RESET}"
-        f" | {CYAN}Info: {summary['infos']}{RESET}"
+        f"    {red}Errors: {summary['errors']}{reset}"
+        f" | {yellow}Warnings: {summary['warnings']}{reset}"
+        f" | {cyan}Info: {summary['infos']}{reset}"
     )
     lines.append("")
 
@@ -114,24 +143,23 @@ def format_json(result: dict) -> str:
     if result.get("error"):
         output["error"] = result["error"]
 
-    for cat in result.get("categories", []):
-        cat_data = {
+    output["categories"] = [
+        {
             "name": cat.name,
             "passed": cat.passed,
             "total": cat.total,
-            "checks": [],
+            "checks": [
+                {"name": check.name, "severity": check.severity.label, "message": check.message}
+                for check in cat.results
+            ],
         }
-        for check in cat.results:
-            cat_data["checks"].append(
-                {
-                    "name": check.name,
-                    "severity": check.severity.value,
-                    "message": check.message,
-                }
-            )
-        output["categories"].append(cat_data)
+        for cat in result.get("categories", [])
+    ]
 
-    return json.dumps(output, indent=2)
+    # orjson serializes several times faster when installed; both leave non-ASCII text unescaped
+    if orjson is not None:
+        return orjson.dumps(output, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(output, indent=2, ensure_ascii=False)
 
 
 def format_markdown(result: dict) -> str:
@@ -159,19 +187,10 @@ def format_markdown(result: dict) -> str:
     lines.append(f"Errors: {summary['errors']} | Warnings: {summary['warnings']} | Info: {summary['infos']}")
     lines.append("")
 
-    severity_md = {
-        Severity.PASS: "✅",
-        Severity.INFO: "ℹ️",
-        Severity.WARNING: "⚠️",
-        Severity.ERROR: "❌",
-    }
-
     for cat in result["categories"]:
         lines.append(f"## {cat.name} ({cat.passed}/{cat.total})")
         lines.append("")
-        for check in cat.results:
-            icon = severity_md[check.severity]
-            lines.append(f"- {icon} {check.message}")
+        lines.extend(SEVERITY_MARKDOWN_PREFIXES[check.severity] + check.message for check in cat.results)
         lines.append("")
 
     return "\n".join(lines)
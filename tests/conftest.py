@@ -0,0 +1,63 @@
+"""Shared fixtures: a minimal NetBox plugin written to a temporary directory."""
+
+import textwrap
+
+import pytest
+
+INIT_PY = """\
+from netbox.plugins import PluginConfig
+
+__version__ = "1.2.3"
+
+
+class DemoConfig(PluginConfig):
+    name = "netbox_demo"
+    verbose_name = "Demo"
+    description = "Demo plugin"
+    version = __version__
+    base_url = "demo"
+    min_version = "4.0.0"
+    max_version = "4.2.99"
+
+
+config = DemoConfig
+"""
+
+PYPROJECT_TOML = """\
+[build-system]
+requires = ["setuptools>=61.0"]
+build-backend = "setuptools.build_meta"
+
+[project]
+name = "netbox-demo"
+version = "1.2.3"
+"""
+
+
+def write(root, relpath: str, content: str):
+    """Write a file under root (creating parent directories) and return its path."""
+    path = root / relpath
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(textwrap.dedent(content))
+    return path
+
+
+@pytest.fixture
+def plugin(tmp_path):
+    """A plugin tree with a PluginConfig in netbox_demo/__init__.py and a matching pyproject.toml."""
+    root = tmp_path / "netbox-demo"
+    write(root, "netbox_demo/__init__.py", INIT_PY)
+    write(root, "pyproject.toml", PYPROJECT_TOML)
+    write(root, "CHANGELOG.md", "# Changelog\n\n## [1.2.3] - 2026-01-01\n\n### Added\n- First release\n")
+    return root
+
+
+@pytest.fixture
+def result_cache(tmp_path, monkeypatch):
+    """Point the results cache at an empty temporary directory and enable it."""
+    from netbox_plugin_audit import auditor
+
+    cache_dir = tmp_path / "results-cache"
+    monkeypatch.setattr(auditor, "RESULT_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(auditor, "NO_CACHE", False)
+    return cache_dir
@@ -0,0 +1,35 @@
+"""GitHub remote resolution."""
+
+import subprocess
+
+from conftest import write
+
+from netbox_plugin_audit.checks import github
+
+
+def _git(plugin, *args):
+    subprocess.run(["git", "-C", str(plugin), *args], check=True, capture_output=True)
+
+
+def test_origin_read_from_config(plugin):
+    _git(plugin, "init", "-q")
+    _git(plugin, "remote", "add", "origin", "https://github.com/example/netbox-demo.git")
+    github._github_repo_for.cache_clear()
+    assert github.get_github_repo(str(plugin)) == "example/netbox-demo"
+
+
+def test_insteadof_rewrite_is_applied(plugin):
+    _git(plugin, "init", "-q")
+    _git(plugin, "remote", "add", "origin", "https://github.com/old-owner/netbox-demo.git")
+    _git(plugin, "config", "url.https://github.com/new-owner/.insteadOf", "https://github.com/old-owner/")
+    github._github_repo_for.cache_clear()
+    assert github._origin_url_from_config(str(plugin)) is None
+    assert github.get_github_repo(str(plugin)) == "new-owner/netbox-demo"
+
+
+def test_include_file_is_applied(plugin, tmp_path):
+    _git(plugin, "init", "-q")
+    remote = write(tmp_path, "remote.gitconfig", '[remote "origin"]\n\turl = git@github.com:example/included.git\n')
+    _git(plugin, "config", "include.path", str(remote))
+    github._github_repo_for.cache_clear()
+    assert github.get_github_repo(str(plugin)) == "example/included"
@@ -0,0 +1,31 @@
+"""ruff handling in the linting check."""
+
+import os
+import stat
+
+from netbox_plugin_audit.checks import Severity
+from netbox_plugin_audit.checks.linting import check_linting
+
+# Stands in for a ruff release that predates --output-format=concise
+OLD_RUFF = """\
+#!/bin/sh
+for arg in "$@"; do
+    case "$arg" in
+        --output-format=*) echo "error: invalid value 'concise' for '--output-format'" >&2; exit 2 ;;
+    esac
+done
+exit 0
+"""
+
+
+def test_old_ruff_without_concise_output(plugin, tmp_path, monkeypatch):
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    ruff = bin_dir / "ruff"
+    ruff.write_text(OLD_RUFF)
+    ruff.chmod(ruff.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    cat = check_linting(str(plugin), "netbox_demo")
+    result = next(r for r in cat.results if r.name == "ruff_check")
+    assert result.severity == Severity.PASS
@@ -0,0 +1,69 @@
+"""PluginConfig class detection."""
+
+from conftest import write
+
+from netbox_plugin_audit.checks import Severity
+from netbox_plugin_audit.checks.pluginconfig import check_pluginconfig
+
+
+def _result(cat, name):
+    return next(r for r in cat.results if r.name == name)
+
+
+def test_plain_subclass(plugin):
+    cat = check_pluginconfig(str(plugin), "netbox_demo")
+    result = _result(cat, "pluginconfig_class")
+    assert result.severity == Severity.PASS
+    assert result.message == "PluginConfig subclass: DemoConfig"
+    assert _result(cat, "config_assignment").severity == Severity.PASS
+
+
+def test_subclass_with_call_in_bases(plugin):
+    write(
+        plugin,
+        "netbox_demo/__init__.py",
+        """\
+        from netbox.plugins import PluginConfig
+
+
+        def mixin():
+            return object
+
+
+        class FakeConfig(mixin(), PluginConfig):
+            name = "netbox_demo"
+
+
+        config = FakeConfig
+        """,
+    )
+    result = _result(check_pluginconfig(str(plugin), "netbox_demo"), "pluginconfig_class")
+    assert result.severity == Severity.PASS
+    assert result.message == "PluginConfig subclass: FakeConfig"
+
+
+def test_no_subclass(plugin):
+    write(plugin, "netbox_demo/__init__.py", '__version__ = "1.2.3"\n')
+    cat = check_pluginconfig(str(plugin), "netbox_demo")
+    assert _result(cat, "pluginconfig_class").severity == Severity.ERROR
+
+
+def test_import_without_subclass(plugin):
+    write(plugin, "netbox_demo/__init__.py", "from netbox.plugins import PluginConfig\n")
+    cat = check_pluginconfig(str(plugin), "netbox_demo")
+    assert _result(cat, "pluginconfig_class").severity == Severity.ERROR
+
+
+def test_syntax_error_is_reported(plugin):
+    write(
+        plugin, "netbox_demo/__init__.py", "from netbox.plugins import PluginConfig\n\nclass DemoConfig(PluginConfig\n"
+    )
+    cat = check_pluginconfig(str(plugin), "netbox_demo")
+    result = _result(cat, "parse")
+    assert result.severity == Severity.ERROR
+    assert result.message.startswith("Syntax error in __init__.py")
+
+
+def test_missing_package(plugin):
+    cat = check_pluginconfig(str(plugin), None)
+    assert _result(cat, "package").severity == Severity.ERROR
@@ -0,0 +1,110 @@
+"""Invalidation of the on-disk results cache."""
+
+import os
+import time
+
+from conftest import write
+
+from netbox_plugin_audit import auditor
+from netbox_plugin_audit.checks import CategoryResult, CheckResult, Severity
+
+
+def _touch_later(path):
+    """Bump a file's mtime so the change is visible regardless of timestamp granularity."""
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_fingerprint_is_stable(plugin):
+    assert auditor._plugin_fingerprint(str(plugin)) == auditor._plugin_fingerprint(str(plugin))
+
+
+def test_fingerprint_changes_on_edit(plugin):
+    before = auditor._plugin_fingerprint(str(plugin))
+    init_py = plugin / "netbox_demo" / "__init__.py"
+    init_py.write_text(init_py.read_text().replace("1.2.3", "1.2.4"))
+    _touch_later(init_py)
+    assert auditor._plugin_fingerprint(str(plugin)) != before
+
+
+def test_fingerprint_changes_on_new_file(plugin):
+    before = auditor._plugin_fingerprint(str(plugin))
+    write(plugin, "netbox_demo/urls.py", "urlpatterns = []\n")
+    assert auditor._plugin_fingerprint(str(plugin)) != before
+
+
+def test_fingerprint_ignores_skipped_dirs(plugin):
+    before = auditor._plugin_fingerprint(str(plugin))
+    for skipped in (".git", "__pycache__", ".venv", "venv", "node_modules", ".tox", "build", "netbox_demo.egg-info"):
+        write(plugin, f"{skipped}/file.py", "x = 1\n")
+    write(plugin, "netbox_demo/__pycache__/file.cpython-311.pyc", "")
+    assert auditor._plugin_fingerprint(str(plugin)) == before
+
+
+def test_fingerprint_covers_nested_skip_names(plugin):
+    before = auditor._plugin_fingerprint(str(plugin))
+    write(plugin, "netbox_demo/build/helpers.py", 'password = "hunter22real"\n')
+    assert auditor._plugin_fingerprint(str(plugin)) != before
+
+
+def test_fingerprint_changes_on_empty_dir(plugin):
+    before = auditor._plugin_fingerprint(str(plugin))
+    (plugin / "netbox_demo" / "templates").mkdir()
+    after = auditor._plugin_fingerprint(str(plugin))
+    assert after != before
+    (plugin / "docs").mkdir()
+    assert auditor._plugin_fingerprint(str(plugin)) != after
+
+
+def test_cached_results_roundtrip(result_cache):
+    cat = CategoryResult(name="Structure", icon="S", results=[CheckResult("readme", Severity.PASS, "README.md")])
+    auditor._write_cached_results("abc", {"check_structure": cat})
+    cached = auditor._read_cached_results("abc")
+    assert list(cached) == ["check_structure"]
+    assert cached["check_structure"].results == cat.results
+    assert cached["check_structure"].passed == 1
+    assert auditor._read_cached_results("other") == {}
+
+
+def test_cached_results_expire(result_cache, monkeypatch):
+    cat = CategoryResult(name="Structure", icon="S", results=[CheckResult("readme", Severity.PASS, "README.md")])
+    auditor._write_cached_results("abc", {"check_structure": cat})
+    stale = time.time() - auditor.CACHE_TTL - 60
+    os.utime(result_cache / "abc.json", (stale, stale))
+    assert auditor._read_cached_results("abc") == {}
+
+
+def test_audit_picks_up_edits(plugin, result_cache):
+    def versioning_messages():
+        report = auditor.audit_plugin(str(plugin), skip_lint=True, skip_build=True)
+        return report["version"], [r.message for c in report["categories"] if c.name == "Versioning" for r in c.results]
+
+    version, messages = versioning_messages()
+    assert version == "1.2.3"
+    assert any(name.endswith(".json") for name in os.listdir(result_cache))
+    assert versioning_messages() == (version, messages)
+
+    init_py = plugin / "netbox_demo" / "__init__.py"
+    init_py.write_text(init_py.read_text().replace("1.2.3", "1.3.0"))
+    _touch_later(init_py)
+    version, edited = versioning_messages()
+    assert version == "1.3.0"
+    assert edited != messages
+
+
+def test_prune_cache_drops_stale_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(auditor, "CACHE_DIR", str(tmp_path))
+    stale = time.time() - max(auditor.API_CACHE_TTLS.values()) - 60
+    for name in ("github", "pypi", "results"):
+        write(tmp_path, f"{name}/fresh.json", "{}")
+        old = write(tmp_path, f"{name}/old.json", "{}")
+        os.utime(old, (stale, stale))
+    auditor._prune_cache(time.time())
+    for name in ("github", "pypi", "results"):
+        assert os.listdir(tmp_path / name) == ["fresh.json"]
+
+
+def test_remote_fingerprint_ignores_checkout_dir():
+    url = "https://github.com/example/netbox-demo"
+    assert auditor._remote_fingerprint(url, "a" * 40) == auditor._remote_fingerprint(url, "a" * 40)
+    assert auditor._remote_fingerprint(url, "a" * 40) != auditor._remote_fingerprint(url, "b" * 40)
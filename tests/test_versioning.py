@@ -0,0 +1,73 @@
+"""Plugin version detection."""
+
+from conftest import write
+
+from netbox_plugin_audit.auditor import _get_plugin_version
+from netbox_plugin_audit.checks.versioning import _get_pyproject_version, check_versioning, get_init_version
+
+
+def test_plain_version_assignment(plugin):
+    assert get_init_version(str(plugin), "netbox_demo") == "1.2.3"
+    assert _get_plugin_version(str(plugin), "netbox_demo") == "1.2.3"
+
+
+def test_parenthesized_multiline_import(plugin):
+    write(plugin, "netbox_demo/version.py", '__version__ = "2.0.1"\n')
+    write(
+        plugin,
+        "netbox_demo/__init__.py",
+        """\
+        from netbox.plugins import PluginConfig
+
+        from .version import (
+            __version__,
+        )
+        """,
+    )
+    assert get_init_version(str(plugin), "netbox_demo") == "2.0.1"
+    assert _get_plugin_version(str(plugin), "netbox_demo") == "2.0.1"
+
+
+def test_version_assigned_inside_try(plugin):
+    write(
+        plugin,
+        "netbox_demo/__init__.py",
+        """\
+        try:
+            __version__ = "3.1.0"
+        except Exception:
+            __version__ = "0.0.0"
+        """,
+    )
+    assert get_init_version(str(plugin), "netbox_demo") == "3.1.0"
+
+
+def test_dynamic_version_falls_back_to_pyproject(plugin):
+    write(
+        plugin,
+        "netbox_demo/__init__.py",
+        """\
+        from importlib import metadata
+
+        __version__ = metadata.version("netbox-demo")
+        """,
+    )
+    assert get_init_version(str(plugin), "netbox_demo") == ("dynamic", "importlib.metadata")
+    assert _get_plugin_version(str(plugin), "netbox_demo") == "1.2.3"
+
+
+def test_no_version(plugin):
+    write(plugin, "netbox_demo/__init__.py", "from netbox.plugins import PluginConfig\n")
+    assert get_init_version(str(plugin), "netbox_demo") is None
+    assert _get_plugin_version(str(plugin), "netbox_demo") is None
+
+
+def test_invalid_pyproject_has_no_version(plugin):
+    write(plugin, "pyproject.toml", '[project]\nname = "netbox-demo"\nversion = "1.2.3"\nversion = "1.2.4"\n')
+    assert _get_pyproject_version(str(plugin)) is None
+
+
+def test_versions_in_sync(plugin):
+    cat = check_versioning(str(plugin), "netbox_demo")
+    assert cat.errors == 0
+    assert cat.warnings == 0